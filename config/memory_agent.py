@@ -8,11 +8,16 @@ import asyncio
 import json
 import logging
 import httpx
-import re
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 from dataclasses import dataclass
-import hashlib
+import sys
+from pathlib import Path
+
+# Add repository root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.app.services.conversation_memory import TurnAnalyzer, memory_id
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -32,10 +37,18 @@ class MemoryEntry:
 class MemoryAgent:
     """Monitors conversations and maintains active memory"""
     
-    def __init__(self):
+    def __init__(self, batch_size: int = 20, write_concurrency: int = 4, dedup_window: int = 10000):
         self.cognee_api_base = "http://localhost:8001"  # Memory DB
         self.agent_api_base = "http://localhost:8000"   # Document DB
         
+        # Batched writes: queued entries by content-hash id, ids already stored
+        self.batch_size = batch_size
+        self.write_concurrency = write_concurrency
+        self.dedup_window = dedup_window
+        self._pending: Dict[str, MemoryEntry] = {}
+        self._stored_ids: OrderedDict = OrderedDict()
+        self._client: Optional[httpx.AsyncClient] = None
+        
         # Patterns for extracting important information
         self.decision_patterns = [
             r'(decided|agreed|concluded) (that|to)',
@@ -58,171 +71,162 @@ class MemoryAgent:
             r'(contract value|total amount|payment)',
             r'(legal terms|governing law|jurisdiction)',
         ]
+        
+        # All patterns compiled once; importance, summary, tags and pointers from one analysis per turn
+        self.analyzer = TurnAnalyzer({
+            "decision": self.decision_patterns,
+            "document": self.document_patterns,
+            "business": self.business_patterns,
+        })
     
     def calculate_importance(self, text: str) -> float:
         """Calculate importance score for text"""
-        importance = 0.0
-        text_lower = text.lower()
-        
-        # Decision indicators
-        for pattern in self.decision_patterns:
-            if re.search(pattern, text_lower):
-                importance += 0.3
-        
-        # Document references
-        for pattern in self.document_patterns:
-            if re.search(pattern, text_lower):
-                importance += 0.2
-        
-        # Business terms
-        for pattern in self.business_patterns:
-            if re.search(pattern, text_lower):
-                importance += 0.1
-        
-        # Length factor (longer discussions often more important)
-        length_factor = min(len(text) / 500, 0.2)
-        importance += length_factor
-        
-        return min(importance, 1.0)
+        return self.analyzer.analyze(text).importance
     
     def extract_document_pointers(self, text: str) -> List[str]:
         """Extract references to documents in main database"""
-        pointers = []
-        
-        # Look for document IDs
-        doc_id_pattern = r'document.{0,10}(id|ID).{0,10}([a-f0-9\-]{8,})'
-        matches = re.finditer(doc_id_pattern, text, re.IGNORECASE)
-        for match in matches:
-            pointers.append(match.group(2))
-        
-        # Look for filenames
-        filename_pattern = r'([\w\-_]+\.(pdf|docx|doc|txt|contract))'
-        matches = re.finditer(filename_pattern, text, re.IGNORECASE)
-        for match in matches:
-            pointers.append(f"filename:{match.group(1)}")
-        
-        return pointers
+        return self.analyzer.pointers(text)
     
     def extract_tags(self, text: str) -> List[str]:
         """Extract relevant tags from text"""
-        tags = []
-        text_lower = text.lower()
-        
-        # Entity types
-        if any(word in text_lower for word in ['contract', 'agreement']):
-            tags.append('contract')
-        if any(word in text_lower for word in ['client', 'customer']):
-            tags.append('client')
-        if any(word in text_lower for word in ['vendor', 'supplier']):
-            tags.append('vendor')
-        if any(word in text_lower for word in ['payment', 'financial', 'money', '$']):
-            tags.append('financial')
-        if any(word in text_lower for word in ['legal', 'law', 'jurisdiction']):
-            tags.append('legal')
-        if any(word in text_lower for word in ['decision', 'approved', 'rejected']):
-            tags.append('decision')
-        
-        return tags
+        return self.analyzer.tags(text)
     
     def create_summary(self, text: str) -> str:
         """Create concise summary of key points"""
-        # Simple extractive summary for key sentences
-        sentences = text.split('.')
-        key_sentences = []
-        
-        for sentence in sentences[:10]:  # Limit to first 10 sentences
-            sentence = sentence.strip()
-            if len(sentence) < 10:
-                continue
-                
-            # Score sentence importance
-            score = 0
-            sentence_lower = sentence.lower()
-            
-            # Decision indicators
-            for pattern in self.decision_patterns:
-                if re.search(pattern, sentence_lower):
-                    score += 2
-            
-            # Document/business terms
-            for pattern in self.document_patterns + self.business_patterns:
-                if re.search(pattern, sentence_lower):
-                    score += 1
-            
-            if score > 0:
-                key_sentences.append((sentence, score))
+        return self.analyzer.analyze(text).summary
+    
+    def build_entry(self, conversation: str, context: str = "") -> Optional[MemoryEntry]:
+        """Analyze one turn for every entry field; None if not important enough"""
+        analysis = self.analyzer.analyze(conversation)
         
-        # Sort by score and take top 3
-        key_sentences.sort(key=lambda x: x[1], reverse=True)
-        summary_sentences = [sent[0] for sent in key_sentences[:3]]
+        # Skip if not important enough
+        if analysis.importance < 0.1:
+            return None
         
-        return '. '.join(summary_sentences) + '.' if summary_sentences else text[:200] + '...'
+        return MemoryEntry(
+            id=memory_id(conversation, context),
+            summary=analysis.summary,
+            importance=analysis.importance,
+            timestamp=datetime.now().isoformat(),
+            context=context,
+            document_pointers=analysis.document_pointers,
+            tags=analysis.tags
+        )
     
     async def process_conversation(self, conversation: str, context: str = "") -> Optional[MemoryEntry]:
         """Process conversation and extract memory-worthy information"""
         try:
-            # Calculate importance
-            importance = self.calculate_importance(conversation)
-            
-            # Skip if not important enough
-            if importance < 0.1:
-                return None
-            
-            # Extract components
-            summary = self.create_summary(conversation)
-            pointers = self.extract_document_pointers(conversation)
-            tags = self.extract_tags(conversation)
-            
-            # Create unique ID
-            entry_id = hashlib.md5(f"{conversation[:100]}{datetime.now().isoformat()}".encode()).hexdigest()
-            
-            memory_entry = MemoryEntry(
-                id=entry_id,
-                summary=summary,
-                importance=importance,
-                timestamp=datetime.now().isoformat(),
-                context=context,
-                document_pointers=pointers,
-                tags=tags
-            )
-            
-            logger.info(f"Created memory entry: importance={importance:.2f}, tags={tags}")
+            memory_entry = self.build_entry(conversation, context)
+            if memory_entry:
+                logger.info(f"Created memory entry: importance={memory_entry.importance:.2f}, tags={memory_entry.tags}")
             return memory_entry
             
         except Exception as e:
             logger.error(f"Error processing conversation: {e}")
             return None
     
+    async def process_turns(self, turns: Iterable[Union[str, Tuple[str, str]]],
+                            flush: bool = True) -> Dict[str, int]:
+        """
+        Batch pipeline: analyze a stream of turns (text or (text, context)),
+        queue the memory-worthy ones and write them in batches
+        """
+        stats = {"turns": 0, "queued": 0, "skipped": 0, "duplicates": 0, "stored": 0}
+        for turn in turns:
+            text, context = (turn, "") if isinstance(turn, str) else turn
+            stats["turns"] += 1
+            try:
+                entry = self.build_entry(text, context)
+            except Exception as e:
+                logger.error(f"Error processing conversation: {e}")
+                entry = None
+            if entry is None:
+                stats["skipped"] += 1
+            elif not self.enqueue(entry):
+                stats["duplicates"] += 1
+            else:
+                stats["queued"] += 1
+                if len(self._pending) >= self.batch_size:
+                    stats["stored"] += await self.flush()
+        if flush:
+            stats["stored"] += await self.flush()
+        return stats
+    
+    def enqueue(self, entry: MemoryEntry) -> bool:
+        """Queue an entry for the next batch; False if its content is already stored or queued"""
+        if entry.id in self._stored_ids or entry.id in self._pending:
+            return False
+        self._pending[entry.id] = entry
+        return True
+    
+    async def flush(self) -> int:
+        """Write queued entries over the shared client; failed ones stay queued"""
+        if not self._pending:
+            return 0
+        batch = list(self._pending.values())
+        semaphore = asyncio.Semaphore(self.write_concurrency)
+        
+        async def write(entry: MemoryEntry) -> bool:
+            async with semaphore:
+                return await self.store_memory(entry)
+        
+        results = await asyncio.gather(*(write(entry) for entry in batch))
+        stored = 0
+        for entry, ok in zip(batch, results):
+            if ok:
+                del self._pending[entry.id]
+                stored += 1
+        logger.info(f"Flushed {stored}/{len(batch)} memory entries")
+        return stored
+    
+    def _remember_stored(self, entry_id: str) -> None:
+        self._stored_ids[entry_id] = None
+        self._stored_ids.move_to_end(entry_id)
+        while len(self._stored_ids) > self.dedup_window:
+            self._stored_ids.popitem(last=False)
+    
+    async def _http(self) -> httpx.AsyncClient:
+        """Client shared by all writes and searches (connection reuse)"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(timeout=30.0)
+        return self._client
+    
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
     async def store_memory(self, entry: MemoryEntry) -> bool:
         """Store memory entry in Cognee database"""
         try:
-            async with httpx.AsyncClient() as client:
-                payload = {
-                    "id": entry.id,
-                    "content": entry.summary,
-                    "metadata": {
-                        "importance": entry.importance,
-                        "timestamp": entry.timestamp,
-                        "context": entry.context,
-                        "document_pointers": entry.document_pointers,
-                        "tags": entry.tags,
-                        "type": "memory_entry"
-                    }
+            client = await self._http()
+            payload = {
+                "id": entry.id,
+                "content": entry.summary,
+                "metadata": {
+                    "importance": entry.importance,
+                    "timestamp": entry.timestamp,
+                    "context": entry.context,
+                    "document_pointers": entry.document_pointers,
+                    "tags": entry.tags,
+                    "type": "memory_entry"
                 }
-                
-                # Store in Cognee memory database
-                response = await client.post(
-                    f"{self.cognee_api_base}/store",
-                    json=payload,
-                    timeout=30.0
-                )
-                
-                if response.status_code == 200:
-                    logger.info(f"Memory entry stored successfully: {entry.id}")
-                    return True
-                else:
-                    logger.warning(f"Failed to store memory entry: {response.status_code}")
-                    return False
+            }
+            
+            # Store in Cognee memory database
+            response = await client.post(
+                f"{self.cognee_api_base}/store",
+                json=payload,
+                timeout=30.0
+            )
+            
+            if response.status_code == 200:
+                self._remember_stored(entry.id)
+                logger.info(f"Memory entry stored successfully: {entry.id}")
+                return True
+            else:
+                logger.warning(f"Failed to store memory entry: {response.status_code}")
+                return False
                     
         except Exception as e:
             logger.error(f"Error storing memory: {e}")
@@ -235,6 +239,13 @@ class MemoryAgent:
             memory_entry = await self.process_conversation(conversation_text)
             
             if memory_entry:
+                # Same content already stored (content-hash id): don't write it again
+                if memory_entry.id in self._stored_ids:
+                    return {
+                        "status": "duplicate",
+                        "memory_id": memory_entry.id
+                    }
+                
                 # Store in memory database
                 success = await self.store_memory(memory_entry)
                 
@@ -262,18 +273,18 @@ class MemoryAgent:
     async def search_memory(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
         """Search memory database for relevant entries"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.cognee_api_base}/search",
-                    json={"query": query, "limit": limit, "type": "memory_entry"},
-                    timeout=30.0
-                )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    return data.get("results", [])
-                else:
-                    return []
+            client = await self._http()
+            response = await client.post(
+                f"{self.cognee_api_base}/search",
+                json={"query": query, "limit": limit, "type": "memory_entry"},
+                timeout=30.0
+            )
+            
+            if response.status_code == 200:
+                data = response.json()
+                return data.get("results", [])
+            else:
+                return []
                     
         except Exception as e:
             logger.error(f"Error searching memory: {e}")
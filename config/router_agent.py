@@ -9,11 +9,15 @@ import json
 import sys
 import logging
 import httpx
-import re
 from typing import Any, Dict, List, Optional, Tuple
 from enum import Enum
+from pathlib import Path
 import traceback
 
+# Add repository root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.app.services.intent_classifier import IntentClassifier, IntentResult
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -67,6 +71,9 @@ class RouterAgent:
             ]
         }
         
+        # Intent patterns compiled once; default to BUSINESS
+        self.intent_classifier = IntentClassifier(self.intent_patterns, default=QueryType.BUSINESS)
+        
         self.tools = {
             "route_query": {
                 "name": "route_query", 
@@ -84,22 +91,15 @@ class RouterAgent:
     
     def analyze_intent(self, query: str) -> QueryType:
         """Analyze user query to determine intent"""
-        query_lower = query.lower()
-        
-        # Score each intent type
-        scores = {intent_type: 0 for intent_type in QueryType}
-        
-        for intent_type, patterns in self.intent_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, query_lower):
-                    scores[intent_type] += 1
-        
-        # Return highest scoring intent, default to BUSINESS
-        max_score = max(scores.values())
-        if max_score == 0:
-            return QueryType.BUSINESS  # Default for unclear queries
-            
-        return max(scores, key=scores.get)
+        return self.classify_intent(query).intent
+    
+    def classify_intent(self, query: str) -> IntentResult:
+        """Intent with confidence and per-intent scores (BUSINESS, confidence 0, when unclear)"""
+        return self.intent_classifier.classify(query)
+    
+    def classify_intents(self, queries: List[str]) -> List[IntentResult]:
+        """Batch intent classification"""
+        return self.intent_classifier.classify_batch(queries)
     
     async def route_conversational(self, query: str) -> Dict[str, Any]:
         """Route to Goose Memory Database (Cognee)"""
@@ -253,8 +253,9 @@ class RouterAgent:
         """Main routing function"""
         try:
             # Analyze query intent
-            intent = self.analyze_intent(query)
-            logger.info(f"Query intent detected: {intent.value}")
+            analysis = self.classify_intent(query)
+            intent = analysis.intent
+            logger.info(f"Query intent detected: {intent.value} (confidence {analysis.confidence:.0%})")
             
             # Route to appropriate backend
             if intent == QueryType.CONVERSATIONAL:
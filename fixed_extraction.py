@@ -4,10 +4,13 @@ Solves the problem of grabbing wrong numbers and missing important ones
 """
 import json
 import logging
+import os
 import re
 from typing import Dict, Any, List, Tuple
 import google.generativeai as genai
 
+from src.app.services.amount_context import amount_contexts
+
 logger = logging.getLogger(__name__)
 
 class ContextAwareExtractor:
@@ -16,14 +19,23 @@ class ContextAwareExtractor:
     Not just pattern matching
     """
     
-    def __init__(self):
+    def __init__(self, fused: bool = None):
         self.model = genai.GenerativeModel('gemini-1.5-pro')  # Better for long context
+        # Fused mode answers the "understand" questions inside the extract call
+        if fused is None:
+            fused = os.getenv("EXTRACTION_MODE", "multi").lower() == "fused"
+        self.fused = fused
         
     def extract_with_context(self, content: str, filename: str) -> Dict[str, Any]:
         """
         Main extraction method that focuses on MEANING not just patterns
         """
         
+        if self.fused:
+            # Steps 1 and 2 in a single call
+            extraction = self.extract_meaningful_data(content, {}, fused=True)
+            return self.validate_extraction(extraction, content)
+        
         # Step 1: First understand what kind of document this is
         doc_understanding = self.understand_document(content, filename)
         
@@ -66,15 +78,30 @@ class ContextAwareExtractor:
             logger.error(f"Failed to understand document: {e}")
             return {}
     
-    def extract_meaningful_data(self, content: str, understanding: Dict) -> Dict:
+    def extract_meaningful_data(self, content: str, understanding: Dict, fused: bool = False) -> Dict:
         """
         Extract data with focus on MEANING and CONTEXT
+        
+        With fused=True there is no prior understanding call: the model also
+        reports the transaction type and subject in the same JSON.
         """
         
-        # Build a context-aware prompt
-        prompt = f"""
+        if fused:
+            preamble = """
+        You are extracting data from a real estate document. First decide what TYPE of
+        transaction it is (sale, lease, loan, etc.), what is being transacted and what
+        the MAIN DEAL VALUE is, then extract the details below."""
+            understanding_fields = """
+            "transaction_type": null,  // sale, lease, loan, etc.
+            "transaction_subject": null,  // property, business, etc."""
+        else:
+            preamble = f"""
         You are extracting data from a {understanding.get('transaction_type', 'real estate')} document.
-        The main transaction value should be around {understanding.get('main_deal_value', 'unknown')}.
+        The main transaction value should be around {understanding.get('main_deal_value', 'unknown')}."""
+            understanding_fields = ""
+        
+        # Build a context-aware prompt
+        prompt = f"""{preamble}
         
         CRITICAL RULES:
         1. For EVERY dollar amount, you MUST identify what it's for:
@@ -104,7 +131,7 @@ class ContextAwareExtractor:
         {content[:8000]}
         
         Extract and return JSON:
-        {{
+        {{{understanding_fields}
             "main_transaction": {{
                 "total_value": null,  // The MAIN deal value
                 "value_description": null,  // What this value represents
@@ -236,24 +263,21 @@ class ContextAwareExtractor:
                 except:
                     continue
         
-        # If not found with patterns, look for the largest sensible value
-        all_amounts = re.findall(r'\$?([\d,]+(?:\.\d{2})?)', content)
+        # If not found with patterns, look for the largest sensible value;
+        # each amount is judged by the context at its own offset
         valid_amounts = []
         
-        for amount_str in all_amounts:
-            try:
-                value = float(amount_str.replace(',', ''))
-                # Exclude common non-deal amounts
-                if 100000 < value < 100000000:  # Between $100k and $100M
-                    # Check context around this amount
-                    index = content.find(amount_str)
-                    context = content[max(0, index-100):min(len(content), index+100)].lower()
-                    
-                    # Skip if it's insurance, liability, etc.
-                    if not any(skip in context for skip in ['insurance', 'liability', 'coverage', 'limit', 'bond']):
-                        valid_amounts.append(value)
-            except:
-                continue
+        for ctx in amount_contexts(content, width=100):
+            value = ctx.span.value
+            # Exclude common non-deal amounts
+            if value and 100000 < value < 100000000:  # Between $100k and $100M
+                if ctx.category == 'purchase_price':
+                    return value
+                # Skip if it's insurance, liability, etc.
+                if ctx.category in ('insurance', 'deposit'):
+                    continue
+                if not any(skip in ctx.sentence.lower() for skip in ['insurance', 'liability', 'coverage', 'limit', 'bond']):
+                    valid_amounts.append(value)
         
         if valid_amounts:
             # Return the largest amount that's not insurance
@@ -7,6 +7,12 @@ import hashlib
 from typing import Dict, Tuple, Optional
 from pathlib import Path
 
+
+def schema_hash(schema: dict) -> str:
+    """Short content hash of a merged schema (stored with extractions for provenance)"""
+    return hashlib.md5(json.dumps(schema, sort_keys=True).encode()).hexdigest()[:8]
+
+
 class SchemaLoader:
     """Enhanced schema loader with caching and validation"""
     
@@ -117,7 +123,7 @@ class SchemaLoader:
             "specialist": str(spec_path) if has_spec else None,
             "additions": str(adds_path) if has_adds else None,
             "few_shot": str(fse_path) if fse_path.is_file() else None,
-            "schema_hash": hashlib.md5(json.dumps(merged, sort_keys=True).encode()).hexdigest()[:8]
+            "schema_hash": schema_hash(merged)
         }
         
         result = (merged, few_shot_text, meta)
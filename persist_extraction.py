@@ -6,8 +6,11 @@ import asyncio
 import asyncpg
 import json
 import logging
+import re
 from typing import Dict, Any, Optional
 
+from src.app.services.date_engine import get_date_engine, normalize_anchor
+
 logger = logging.getLogger(__name__)
 
 async def persist_extraction(db_pool: asyncpg.Pool, doc_id: str, extraction_json: dict, mark_superseded: bool = True) -> None:
@@ -33,9 +36,53 @@ async def persist_extraction(db_pool: asyncpg.Pool, doc_id: str, extraction_json
             logger.error(f"Failed to persist extraction for document {doc_id}: {e}")
             raise
 
-def build_db_extraction_payload(ai_result: dict, filename: str) -> dict:
+def _date_anchors(ai_result: dict, content: Optional[str]) -> dict:
+    """
+    Anchor dates (effective date, closing, ...) from the document text and
+    from labeled dates in the AI result
+    """
+    engine = get_date_engine()
+    anchors = engine.extract(content).anchors if content else {}
+    dates = ai_result.get('dates') or (ai_result.get('extracted_fields') or {}).get('dates') or []
+    for item in dates:
+        if not isinstance(item, dict):
+            continue
+        label = item.get('label') or item.get('type') or item.get('description')
+        value = item.get('date') or item.get('value') or item.get('text')
+        parsed = engine.normalize(str(value)) if label and value else None
+        if parsed:
+            anchors.setdefault(normalize_anchor(str(label)), parsed)
+    return anchors
+
+
+def normalize_obligation_dates(obligations: list, anchors: dict) -> list:
     """
-    Convert two-lane AI analysis result to database-compatible format
+    Give obligations an ISO due_date where the model wrote a free-form date
+    or a relative deadline ("within 10 business days after the Effective
+    Date"); apply_extraction ignores anything not formatted YYYY-MM-DD
+    """
+    engine = get_date_engine()
+    for ob in obligations:
+        if not isinstance(ob, dict):
+            continue
+        raw = ob.get('due_date')
+        if isinstance(raw, str) and re.fullmatch(r'\d{4}-\d{2}-\d{2}', raw.strip()):
+            continue
+        for text in (raw, ob.get('trigger_event'), ob.get('description')):
+            due = engine.due_date(str(text), anchors) if text else None
+            if due:
+                if raw and raw != due:
+                    ob['due_date_text'] = raw
+                ob['due_date'] = due
+                break
+    return obligations
+
+
+def build_db_extraction_payload(ai_result: dict, filename: str, content: Optional[str] = None) -> dict:
+    """
+    Convert two-lane AI analysis result to database-compatible format.
+    With the document `content`, relative deadlines are resolved against
+    the anchor dates it defines.
     """
     # Handle both old regex format and new AI format
     extracted_fields = {}
@@ -79,6 +126,9 @@ def build_db_extraction_payload(ai_result: dict, filename: str) -> dict:
                         "evidence": []
                     })
     
+    anchors = _date_anchors(ai_result, content)
+    obligations = normalize_obligation_dates(obligations, anchors)
+    
     return {
         "extracted_fields": extracted_fields,
         "obligations": obligations
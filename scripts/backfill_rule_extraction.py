@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Backfill rule-extracted financial terms and parties for stored documents
+"""
+import sys, time, argparse
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pandas as pd
+from sqlalchemy import bindparam, create_engine, text
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+
+from src.app.config import settings
+from src.app.services.rule_backfill import RULES_VERSION, backfill_records
+
+ANALYSIS_TYPE = "rule_backfill"
+
+# Keyset pagination: documents after `after`, skipping ones already backfilled
+# with the current rules unless --force
+SELECT_CHUNK = """
+    SELECT d.id::text AS document_id, d.content
+    FROM documents.documents d
+    WHERE d.id > CAST(:after AS uuid)
+      AND (:force OR NOT EXISTS (
+            SELECT 1 FROM analysis.document_analysis da
+            WHERE da.document_id = d.id
+              AND da.analysis_type = :analysis_type
+              AND da.extracted_metadata->>'rules_version' = :rules_version))
+    ORDER BY d.id
+    LIMIT :limit
+"""
+
+DELETE_PREVIOUS = text("""
+    DELETE FROM analysis.document_analysis
+    WHERE analysis_type = :analysis_type AND document_id = ANY(:ids)
+""").bindparams(bindparam("ids", type_=ARRAY(UUID(as_uuid=False))))
+
+INSERT_ANALYSIS = text("""
+    INSERT INTO analysis.document_analysis
+        (id, document_id, task_id, analysis_type, extracted_metadata, confidence_score,
+         requires_human_review, processing_start_time, processing_end_time,
+         agents_used, successful_agents, total_agents, contract_value, parties, key_dates)
+    VALUES
+        (gen_random_uuid(), CAST(:document_id AS uuid), :task_id, :analysis_type,
+         CAST(:extracted_metadata AS jsonb), :confidence_score, false, now(), now(),
+         '[]'::jsonb, 0, 0, :contract_value, CAST(:parties AS jsonb), '[]'::jsonb)
+""")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vectorized rule extraction backfill")
+    parser.add_argument("--chunk-size", type=int, default=2000, help="Documents per chunk")
+    parser.add_argument("--limit", type=int, help="Stop after this many documents")
+    parser.add_argument("--force", action="store_true",
+                        help="Re-extract documents already backfilled with the current rules")
+    parser.add_argument("--dry-run", action="store_true", help="Extract without writing")
+    args = parser.parse_args()
+
+    engine = create_engine(settings.database_url, pool_pre_ping=True)
+    after, done, started = "00000000-0000-0000-0000-000000000000", 0, time.perf_counter()
+
+    while args.limit is None or done < args.limit:
+        size = args.chunk_size if args.limit is None else min(args.chunk_size, args.limit - done)
+        with engine.connect() as conn:
+            docs = pd.read_sql_query(text(SELECT_CHUNK), conn, params={
+                "after": after, "force": args.force, "analysis_type": ANALYSIS_TYPE,
+                "rules_version": RULES_VERSION, "limit": size,
+            })
+        if docs.empty:
+            break
+
+        chunk_started = time.perf_counter()
+        records = backfill_records(docs)
+        for record in records:
+            record.update(task_id=f"{ANALYSIS_TYPE}:{RULES_VERSION}", analysis_type=ANALYSIS_TYPE)
+
+        if not args.dry_run:
+            # One transaction per chunk: replace earlier backfill rows, then bulk insert
+            with engine.begin() as conn:
+                conn.execute(DELETE_PREVIOUS, {"analysis_type": ANALYSIS_TYPE,
+                                               "ids": docs["document_id"].tolist()})
+                conn.execute(INSERT_ANALYSIS, records)
+
+        after = docs["document_id"].iloc[-1]
+        done += len(docs)
+        with_terms = sum('"financial_terms": []' not in r["extracted_metadata"] for r in records)
+        print(f"{done} documents ({len(docs)} in {time.perf_counter() - chunk_started:.1f}s, "
+              f"{with_terms} with financial terms){' [dry run]' if args.dry_run else ''}")
+
+    print(f"✅ Rule backfill {RULES_VERSION}: {done} documents in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
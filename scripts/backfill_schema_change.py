@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Re-extract only the properties affected by a schema change for stored extractions
+"""
+import os, sys, json, asyncio, argparse
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from improved_loader import SchemaLoader
+from src.app.services.extractor_handoff import build_prompt_bundle, normalize_slug
+from src.app.services.schema_backfill import (
+    JsonExtractionStore, SchemaSnapshotStore, plan_backfill, run_backfill
+)
+
+def main():
+    parser = argparse.ArgumentParser(description="Selective re-extraction after a schema change")
+    parser.add_argument("slug", help="Document type slug or label")
+    parser.add_argument("--records", default="logs", help="Directory of stored extraction_*.json files")
+    parser.add_argument("--snapshots", default="logs/schema_snapshots", help="Schema snapshot directory")
+    parser.add_argument("--old-schema", action="append", default=[],
+                        help="Register an old merged schema file as a snapshot (e.g. from git show)")
+    parser.add_argument("--concurrency", "-c", type=int, default=4)
+    parser.add_argument("--checkpoint", help="Checkpoint file (default: <records>/.backfill_<slug>.jsonl)")
+    parser.add_argument("--dry-run", action="store_true", help="Print the plan without calling the LLM")
+    args = parser.parse_args()
+
+    slug = normalize_slug(args.slug)
+    schema, _, _ = SchemaLoader().load_for_doc_type(slug)
+
+    snapshots = SchemaSnapshotStore(args.snapshots)
+    snapshots.save(slug, schema)
+    for old_path in args.old_schema:
+        with open(old_path, "r", encoding="utf-8") as f:
+            print(f"Registered old schema {snapshots.save(slug, json.load(f))} from {old_path}")
+
+    store = JsonExtractionStore(args.records)
+    plan = plan_backfill(slug, schema, store, snapshots)
+    summary = plan.summary()
+    print(json.dumps(summary, indent=2))
+    for old_hash, diff in plan.diffs.items():
+        print(f"  {old_hash} → {plan.target_hash}: +{diff['added']} ~{diff['changed']} -{diff['removed']}")
+
+    if args.dry_run or not plan.items:
+        return
+
+    from src.app.agents.json_extract_gemini import extract_json
+
+    def extract(record, properties):
+        source = record["meta"]["source_file"]
+        with open(source, "r", encoding="utf-8", errors="ignore") as f:
+            text = f.read().strip()
+        prompt, meta = build_prompt_bundle(slug, document_text=text, properties=properties)
+        prompt = f"{prompt}\n\n# DOCUMENT CONTENT (verbatim, may be noisy)\n{text}"
+        return extract_json(prompt, meta["schema"])
+
+    checkpoint = args.checkpoint or os.path.join(args.records, f".backfill_{slug}.jsonl")
+    stats = asyncio.run(run_backfill(plan, store, extract, args.concurrency, checkpoint))
+    print(f"✅ Backfill {slug}: {stats['updated']} updated, {stats['skipped']} already done, "
+          f"{stats['failed']} failed ({summary['properties_requested']} of "
+          f"{summary['properties_full_rerun']} properties re-extracted)")
+    if stats["failed"]:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -9,10 +9,16 @@ import sys
 import json
 import argparse
 import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime
 
+from slug_manifest import SlugManifest, tool_fingerprint
+
+MANIFEST_NAME = ".validation_manifest.json"
+
 class DocumentTypeValidator:
     """Validates document type configurations"""
     
@@ -266,8 +272,31 @@ class DocumentTypeValidator:
         
         return results
     
-    def run_validation(self, doc_types: Optional[List[str]] = None, verbose: bool = False) -> Dict:
-        """Run validation on all or specified document types"""
+    def _validate_many(self, doc_dirs: List[Path], jobs: int) -> List[Dict]:
+        """Validate directories sequentially or across a process pool"""
+        worker = partial(_validate_worker, str(self.base_path))
+        if jobs == 1 or len(doc_dirs) < 2:
+            return [worker(str(d)) for d in doc_dirs]
+        
+        workers = jobs or os.cpu_count() or 1
+        chunksize = max(1, len(doc_dirs) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(worker, [str(d) for d in doc_dirs], chunksize=chunksize))
+    
+    def run_validation(
+        self,
+        doc_types: Optional[List[str]] = None,
+        verbose: bool = False,
+        jobs: int = 1,
+        incremental: bool = False,
+        manifest_path: Optional[Path] = None
+    ) -> Dict:
+        """
+        Run validation on all or specified document types
+        
+        jobs: worker processes (1 = sequential, 0 = one per CPU)
+        incremental: reuse cached results for directories whose files are unchanged
+        """
         start_time = time.time()
         
         # Get list of directories to validate
@@ -281,17 +310,43 @@ class DocumentTypeValidator:
                 d for d in self.document_types_dir.iterdir()
                 if d.is_dir() and not d.name.startswith('.')
             ]
+        dirs_to_validate.sort()
         
         self.results['stats']['total'] = len(dirs_to_validate)
         
         print(f"Validating {len(dirs_to_validate)} document types...")
         print("=" * 60)
         
-        for doc_dir in sorted(dirs_to_validate):
+        manifest = None
+        if incremental:
+            tool_files = [Path(__file__)]
+            if self.master_schema_path.exists():
+                tool_files.append(self.master_schema_path)
+            manifest = SlugManifest(
+                manifest_path or self.document_types_dir / MANIFEST_NAME,
+                self.document_types_dir,
+                tool_fingerprint(*tool_files)
+            ).load()
+        
+        results = {}
+        todo = []
+        for doc_dir in dirs_to_validate:
+            cached = manifest.lookup(doc_dir.name) if manifest else None
+            if cached is not None:
+                results[doc_dir.name] = cached
+            else:
+                todo.append(doc_dir)
+        
+        for result in self._validate_many(todo, jobs):
+            results[result['directory']] = result
+            if manifest:
+                manifest.update(result['directory'], result)
+        
+        for doc_dir in dirs_to_validate:
             if verbose:
                 print(f"Validating: {doc_dir.name}...", end=" ")
             
-            result = self.validate_document_type(doc_dir)
+            result = results[doc_dir.name]
             
             if result['overall_status'] == 'failed':
                 self.results['failed'].append(result)
@@ -309,6 +364,11 @@ class DocumentTypeValidator:
                 if verbose:
                     print("✅ PASSED")
         
+        if manifest:
+            # Only prune on full runs so --types does not drop other cached slugs
+            manifest.save(None if doc_types else [d.name for d in dirs_to_validate])
+            print(f"Incremental: {manifest.misses} re-validated, {manifest.hits} unchanged")
+        
         self.results['stats']['duration'] = time.time() - start_time
         
         return self.results
@@ -366,6 +426,10 @@ class DocumentTypeValidator:
         
         print(f"Detailed report saved to: {output_file}")
 
+def _validate_worker(base_path: str, doc_dir: str) -> Dict:
+    """Validate one document type directory (safe to run in a worker process)"""
+    return DocumentTypeValidator(Path(base_path)).validate_document_type(Path(doc_dir))
+
 def main():
     """Main CLI entry point"""
     parser = argparse.ArgumentParser(
@@ -396,6 +460,25 @@ def main():
         help='Stop on first failure'
     )
     
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=1,
+        help='Worker processes (default: 1, 0 = one per CPU)'
+    )
+    
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Only re-validate document types whose files changed since the last run'
+    )
+    
+    parser.add_argument(
+        '--manifest',
+        type=str,
+        help=f'Manifest path for --incremental (default: <document_types>/{MANIFEST_NAME})'
+    )
+    
     args = parser.parse_args()
     
     # Get base path
@@ -407,7 +490,10 @@ def main():
     # Run validation
     results = validator.run_validation(
         doc_types=args.types,
-        verbose=args.verbose
+        verbose=args.verbose,
+        jobs=args.jobs,
+        incremental=args.incremental,
+        manifest_path=Path(args.manifest) if args.manifest else None
     )
     
     # Save report if requested
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark fused (single-call) against multi-call extraction on text documents
+"""
+import sys, json, time, argparse
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fixed_extraction import ContextAwareExtractor
+
+
+class CountingModel:
+    """Wraps a GenerativeModel to count calls and prompt size"""
+
+    def __init__(self, model):
+        self.model = model
+        self.calls = 0
+        self.prompt_chars = 0
+
+    def generate_content(self, prompt, *args, **kwargs):
+        self.calls += 1
+        self.prompt_chars += len(prompt)
+        return self.model.generate_content(prompt, *args, **kwargs)
+
+
+def run_mode(text: str, filename: str, fused: bool) -> dict:
+    extractor = ContextAwareExtractor(fused=fused)
+    counter = extractor.model = CountingModel(extractor.model)
+    started = time.perf_counter()
+    result = extractor.extract_with_context(text, filename)
+    return {
+        "seconds": round(time.perf_counter() - started, 2),
+        "llm_calls": counter.calls,
+        "prompt_tokens_est": counter.prompt_chars // 4,
+        "main_value": (result.get("main_transaction") or {}).get("total_value"),
+        "parties": sorted(
+            (p.get("full_legal_name") or "").strip()
+            for p in result.get("parties", []) if p.get("full_legal_name")
+        ),
+        "confidence": result.get("confidence_score"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare fused and multi-call extraction")
+    parser.add_argument("files", nargs="+", help="Text files to extract")
+    parser.add_argument("--out", help="Write per-document results as JSON lines")
+    args = parser.parse_args()
+
+    rows = []
+    for path in args.files:
+        text = Path(path).read_text(encoding="utf-8", errors="ignore")
+        multi = run_mode(text, Path(path).name, fused=False)
+        fused = run_mode(text, Path(path).name, fused=True)
+        row = {
+            "file": path,
+            "multi": multi,
+            "fused": fused,
+            "same_main_value": multi["main_value"] == fused["main_value"],
+            "same_parties": multi["parties"] == fused["parties"],
+        }
+        rows.append(row)
+        print(f"{Path(path).name}: multi {multi['seconds']}s/{multi['llm_calls']} calls, "
+              f"fused {fused['seconds']}s/{fused['llm_calls']} calls, "
+              f"value {'=' if row['same_main_value'] else '!='}, "
+              f"parties {'=' if row['same_parties'] else '!='}")
+
+    if rows:
+        total = {
+            mode: {
+                "seconds": round(sum(r[mode]["seconds"] for r in rows), 2),
+                "llm_calls": sum(r[mode]["llm_calls"] for r in rows),
+                "prompt_tokens_est": sum(r[mode]["prompt_tokens_est"] for r in rows),
+            }
+            for mode in ("multi", "fused")
+        }
+        agreement = {
+            "main_value": sum(r["same_main_value"] for r in rows) / len(rows),
+            "parties": sum(r["same_parties"] for r in rows) / len(rows),
+        }
+        print(json.dumps({"documents": len(rows), "totals": total, "agreement": agreement}, indent=2))
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps(row, default=str) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.app.services.extractor_handoff import build_prompt_bundle
 from src.app.agents.json_extract_gemini import extract_json
+from src.app.services.schema_backfill import SchemaSnapshotStore
 
 def main():
     if len(sys.argv) < 3:
@@ -26,7 +27,7 @@ def main():
         text = f.read().strip()
 
     print(f"Building prompt bundle for: {slug_or_label}")
-    prompt, meta = build_prompt_bundle(slug_or_label)
+    prompt, meta = build_prompt_bundle(slug_or_label, document_text=text)
     
     # Append the document content
     prompt = f"{prompt}\n\n# DOCUMENT CONTENT (verbatim, may be noisy)\n{text}"
@@ -40,6 +41,8 @@ def main():
     
     # Save results
     os.makedirs("logs", exist_ok=True)
+    # Keep the schema version so later schema edits can be backfilled selectively
+    SchemaSnapshotStore().save(meta["slug"], meta["schema"])
     timestamp = Path(path).stem
     out_path = f"logs/extraction_{meta['slug']}_{timestamp}.json"
     
@@ -48,9 +51,11 @@ def main():
             "meta": {
                 "slug": meta["slug"],
                 "schema_sha256": meta["schema_sha256"],
+                "schema_hash": meta["schema_hash"],
                 "source_file": path,
                 "properties_count": meta["schema_properties_count"],
-                "has_few_shot": meta["has_few_shot"]
+                "has_few_shot": meta["has_few_shot"],
+                "few_shot_selected": meta["few_shot_selected"]
             },
             "data": obj
         }, f, ensure_ascii=False, indent=2)
@@ -2,12 +2,23 @@
 """
 Linter for document type schemas with registry generation
 """
+import os
 import json
 import sys
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 import hashlib
 
+from slug_manifest import SlugManifest, tool_fingerprint
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.app.services import routing_table
+
+MANIFEST_NAME = ".lint_manifest.json"
+
 class SchemaLinter:
     def __init__(self, doc_types_dir: str = "config/prompts/document_types"):
         self.doc_types_dir = Path(doc_types_dir)
@@ -174,24 +185,76 @@ class SchemaLinter:
                 "has_additions": has_additions,
                 "has_few_shot": fse_path.exists(),
                 "hash": self.generate_hash(merged),
-                "properties_count": len(merged.get("properties", {}))
+                "properties_count": len(merged.get("properties", {})),
+                "routes": routing_table.compile_route(
+                    schema if has_specialist else None,
+                    additions if has_additions else None
+                )
             }
             return True
             
         return False
     
-    def run(self) -> Tuple[List[str], Dict]:
-        """Run linter on all document types"""
+    def _lint_many(self, slugs: List[str], jobs: int) -> List[Tuple[str, Dict]]:
+        """Lint slugs sequentially or across a process pool"""
+        worker = partial(_lint_slug_worker, str(self.doc_types_dir))
+        if jobs == 1 or len(slugs) < 2:
+            return [worker(slug) for slug in slugs]
+        
+        workers = jobs or os.cpu_count() or 1
+        chunksize = max(1, len(slugs) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(worker, slugs, chunksize=chunksize))
+    
+    def run(
+        self,
+        jobs: int = 1,
+        incremental: bool = False,
+        manifest_path: Optional[str] = None
+    ) -> Tuple[List[str], Dict]:
+        """
+        Run linter on all document types
+        
+        jobs: worker processes (1 = sequential, 0 = one per CPU)
+        incremental: reuse cached results for slugs whose files are unchanged;
+                     the full registry and issue list are still produced
+        """
         slugs = sorted([
             d.name for d in self.doc_types_dir.iterdir()
             if d.is_dir() and not d.name.startswith(".")
         ])
         
         print(f"Linting {len(slugs)} document types...")
-        valid_count = 0
         
+        manifest = None
+        if incremental:
+            manifest = SlugManifest(
+                Path(manifest_path) if manifest_path else self.doc_types_dir / MANIFEST_NAME,
+                self.doc_types_dir,
+                tool_fingerprint(Path(__file__), Path(routing_table.__file__))
+            ).load()
+        
+        results = {}
+        todo = []
         for slug in slugs:
-            if self.lint_slug(slug):
+            cached = manifest.lookup(slug) if manifest else None
+            if cached is not None:
+                results[slug] = cached
+            else:
+                todo.append(slug)
+        
+        for slug, result in self._lint_many(todo, jobs):
+            results[slug] = result
+            if manifest:
+                manifest.update(slug, result)
+        
+        valid_count = 0
+        for slug in slugs:
+            result = results[slug]
+            self.issues.extend(result["issues"])
+            if result["registry"]:
+                self.registry[slug] = result["registry"]
+            if result["ok"]:
                 valid_count += 1
                 print(f"  ✓ {slug}")
             else:
@@ -199,6 +262,10 @@ class SchemaLinter:
                 
         print(f"\nResults: {valid_count}/{len(slugs)} valid")
         
+        if manifest:
+            manifest.save(slugs)
+            print(f"Incremental: {manifest.misses} re-linted, {manifest.hits} unchanged")
+        
         if self.issues:
             print(f"\n⚠ Found {len(self.issues)} issues:")
             for issue in self.issues[:20]:  # Show first 20
@@ -218,9 +285,32 @@ class SchemaLinter:
         print(f"  With additions: {sum(1 for v in self.registry.values() if v['has_additions'])}")
         print(f"  With few-shot: {sum(1 for v in self.registry.values() if v['has_few_shot'])}")
 
+def _lint_slug_worker(doc_types_dir: str, slug: str) -> Tuple[str, Dict]:
+    """Lint one slug with a fresh linter (safe to run in a worker process)"""
+    linter = SchemaLinter(doc_types_dir)
+    ok = linter.lint_slug(slug)
+    return slug, {
+        "ok": ok,
+        "issues": linter.issues,
+        "registry": linter.registry.get(slug)
+    }
+
 def main():
+    parser = argparse.ArgumentParser(description="Lint document type schemas and build registry.json")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="Worker processes (default: 1, 0 = one per CPU)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only re-lint slugs whose files changed since the last run")
+    parser.add_argument("--manifest", type=str,
+                        help=f"Manifest path for --incremental (default: <doc_types_dir>/{MANIFEST_NAME})")
+    args = parser.parse_args()
+    
     linter = SchemaLinter()
-    issues, registry = linter.run()
+    issues, registry = linter.run(
+        jobs=args.jobs,
+        incremental=args.incremental,
+        manifest_path=args.manifest
+    )
     
     if registry:
         linter.save_registry()
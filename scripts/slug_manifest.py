@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Content-hash manifest for per-slug lint/validation results
+Lets the linter and batch runner skip document types whose files are unchanged
+"""
+import os
+import json
+import hashlib
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+MANIFEST_VERSION = 1
+
+
+def tool_fingerprint(*paths: Path) -> str:
+    """Hash the source of the tool(s) so rule changes invalidate cached results"""
+    h = hashlib.sha256()
+    for p in paths:
+        h.update(Path(p).read_bytes())
+    return h.hexdigest()[:16]
+
+
+class SlugManifest:
+    """
+    Maps slug -> {files: {name: [size, mtime_ns, sha256]}, result: <cached result>}
+
+    Unchanged check is stat-only (size + mtime) so an untouched tree never reads
+    file contents; a stat change falls back to a content hash so touched-but-equal
+    files still hit the cache.
+    """
+
+    def __init__(self, path: Path, doc_types_dir: Path, tool_hash: str):
+        self.path = Path(path)
+        self.doc_types_dir = Path(doc_types_dir)
+        self.tool_hash = tool_hash
+        self.entries: Dict[str, Dict] = {}
+        self.hits = 0
+        self.misses = 0
+        self._pending: Dict[str, Dict] = {}
+
+    def load(self) -> "SlugManifest":
+        """Load manifest from disk; a version or tool change discards it"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return self
+
+        if data.get("version") == MANIFEST_VERSION and data.get("tool_hash") == self.tool_hash:
+            self.entries = data.get("slugs", {})
+        return self
+
+    def save(self, live_slugs: Optional[Iterable[str]] = None) -> None:
+        """Write manifest atomically, pruning slugs that no longer exist"""
+        if live_slugs is not None:
+            live = set(live_slugs)
+            self.entries = {k: v for k, v in self.entries.items() if k in live}
+
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": MANIFEST_VERSION,
+                "tool_hash": self.tool_hash,
+                "slugs": self.entries,
+            }, f, sort_keys=True)
+        os.replace(tmp, self.path)
+
+    def _stat_files(self, slug: str) -> Dict[str, list]:
+        """Collect [size, mtime_ns] for regular files in a slug directory"""
+        stats = {}
+        try:
+            with os.scandir(self.doc_types_dir / slug) as it:
+                for entry in it:
+                    if entry.is_file() and not entry.name.startswith("."):
+                        st = entry.stat()
+                        stats[entry.name] = [st.st_size, st.st_mtime_ns]
+        except FileNotFoundError:
+            pass
+        return stats
+
+    def _hash_file(self, slug: str, name: str) -> str:
+        return hashlib.sha256((self.doc_types_dir / slug / name).read_bytes()).hexdigest()
+
+    def lookup(self, slug: str) -> Optional[Dict]:
+        """Return the cached result for slug if its files are unchanged, else None"""
+        stats = self._stat_files(slug)
+        cached = self.entries.get(slug)
+
+        if cached is not None:
+            old_files = cached.get("files", {})
+            if set(old_files) == set(stats):
+                if all(old_files[n][:2] == stats[n] for n in stats):
+                    self.hits += 1
+                    return cached["result"]
+
+                # Stats moved: compare content hashes before declaring a change
+                refreshed = {n: stats[n] + [self._hash_file(slug, n)] for n in stats}
+                if all(refreshed[n][2] == old_files[n][2] for n in stats):
+                    cached["files"] = refreshed
+                    self.hits += 1
+                    return cached["result"]
+
+        self.misses += 1
+        self._pending[slug] = stats
+        return None
+
+    def update(self, slug: str, result: Dict) -> None:
+        """Record a fresh result for slug against its current file contents"""
+        stats = self._pending.pop(slug, None) or self._stat_files(slug)
+        self.entries[slug] = {
+            "files": {n: stats[n] + [self._hash_file(slug, n)] for n in stats},
+            "result": result,
+        }
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Train the local document-type classifier and save it for DOC_TYPE_CLASSIFIER_MODEL
+"""
+import os, sys, time, argparse
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.app.services.doc_type_classifier import DocTypeClassifier
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the local document-type classifier")
+    parser.add_argument("--doc-types-dir", default=os.getenv("DOC_TYPES_DIR", "config/prompts/document_types"))
+    parser.add_argument("--history", default=os.getenv("DOC_TYPE_HISTORY"),
+                        help='Labeled history JSONL ({"slug": ..., "text": ...} per line)')
+    parser.add_argument("--output", "-o", default="logs/doc_type_classifier.json")
+    args = parser.parse_args()
+
+    start = time.time()
+    clf = DocTypeClassifier.from_document_types(args.doc_types_dir, args.history)
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    clf.save(args.output)
+
+    print(f"✅ Trained on {len(clf.classes)} document types in {time.time() - start:.2f}s "
+          f"(temperature={clf.temperature}) → {args.output}")
+    print(f"Set DOC_TYPE_CLASSIFIER_MODEL={args.output} to load it at startup.")
+
+if __name__ == "__main__":
+    main()
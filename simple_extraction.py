@@ -5,9 +5,28 @@ import re
 import json
 import logging
 import google.generativeai as genai
+from bisect import bisect_right
+
+from src.app.services.rule_engine import DEFAULT_RULES, RuleEngine
 
 logger = logging.getLogger(__name__)
 
+# Rules for model responses by response section, matched within a line (no
+# newlines inside a match); each section is scanned only with its own rules
+_SECTION_RULES = {
+    "parties": RuleEngine([
+        ("party", r"(?P<party_role>Buyer|Seller|Purchaser|Landlord|Tenant|Escrow|Title|Agent|Broker)[: \t-]+"
+                  r"(?P<party_value>[A-Z][A-Za-z \t&,\.]+(?:LLC|Inc|Corp|Company)?)"),
+    ]),
+    "financial": RuleEngine([
+        ("amount", r"\$(?P<amount_value>[0-9,]+(?:\.[0-9]{2})?)[ \t]*(?:[-–][ \t]*)?(?P<amount_label>[A-Za-z \t]+)"),
+    ]),
+    "dates": RuleEngine([
+        ("date", dict(DEFAULT_RULES)["date"]),
+        ("duration", r"\d+[ \t]*(?:days?|months?)"),
+    ]),
+}
+
 def extract_with_gemini_simple(content: str, filename: str) -> dict:
     """
     Dead simple extraction - just ask Gemini to do better
@@ -108,7 +127,10 @@ def parse_natural_language_response(response_text: str, content: str) -> dict:
     
     lines = response_text.split('\n')
     
+    # Section of each line, and where each line starts in the response
+    sections, starts = [], []
     current_section = None
+    offset = 0
     for line in lines:
         line_lower = line.lower()
         
@@ -121,46 +143,50 @@ def parse_natural_language_response(response_text: str, content: str) -> dict:
             current_section = 'dates'
         elif 'property' in line_lower:
             current_section = 'property'
-        
-        # Extract based on section
-        if current_section == 'parties':
-            # Look for patterns like "Buyer: Coyne Development LLC"
-            party_match = re.search(r'(Buyer|Seller|Purchaser|Landlord|Tenant|Escrow|Title|Agent|Broker)[:\s-]+([A-Z][A-Za-z\s&,\.]+(?:LLC|Inc|Corp|Company)?)', line)
-            if party_match:
-                result['parties'].append({
-                    "role": party_match.group(1),
-                    "name": party_match.group(2).strip(),
-                    "confidence": 0.90
-                })
-        
-        elif current_section == 'financial':
-            # Look for dollar amounts with context
-            money_matches = re.findall(r'\$([0-9,]+(?:\.[0-9]{2})?)\s*(?:[-–]\s*)?([A-Za-z\s]+)', line)
-            for amount_str, description in money_matches:
-                amount = float(amount_str.replace(',', ''))
-                result['financial_terms'].append({
-                    "amount": amount,
-                    "label": description.strip(),
-                    "confidence": 0.85
-                })
-        
-        elif current_section == 'dates':
-            # Look for dates
-            date_patterns = [
-                r'([A-Za-z]+\s+\d{1,2},?\s+\d{4})',
-                r'(\d{1,2}/\d{1,2}/\d{4})',
-                r'(\d{4}-\d{2}-\d{2})',
-                r'(\d+\s*days?)',
-                r'(\d+\s*months?)'
-            ]
-            for pattern in date_patterns:
-                matches = re.findall(pattern, line)
-                for match in matches:
-                    result['dates'].append({
-                        "text": match,
-                        "context": line[:100],
-                        "confidence": 0.80
-                    })
+        sections.append(current_section)
+        starts.append(offset)
+        offset += len(line) + 1
+    
+    # One pass per run of lines in the same section, with that section's rules
+    spans = []
+    first = 0
+    while first < len(lines):
+        last = first
+        while last + 1 < len(lines) and sections[last + 1] == sections[first]:
+            last += 1
+        engine = _SECTION_RULES.get(sections[first])
+        if engine is not None:
+            block_start = starts[first]
+            block = response_text[block_start:starts[last] + len(lines[last])]
+            spans.extend((span, block_start + span.start) for span in engine.scan(block))
+        first = last + 1
+    
+    for span, position in spans:
+        line_no = bisect_right(starts, position) - 1
+        section = sections[line_no]
+        
+        if section == 'parties' and span.kind == 'party':
+            # Patterns like "Buyer: Coyne Development LLC"
+            result['parties'].append({
+                "role": span.fields['role'],
+                "name": span.value.strip(),
+                "confidence": 0.90
+            })
+        
+        elif section == 'financial' and span.kind == 'amount':
+            # Dollar amounts with context
+            result['financial_terms'].append({
+                "amount": span.value,
+                "label": span.fields['label'].strip(),
+                "confidence": 0.85
+            })
+        
+        elif section == 'dates' and span.kind in ('date', 'duration'):
+            result['dates'].append({
+                "text": span.text,
+                "context": lines[line_no][:100],
+                "confidence": 0.80
+            })
     
     return result
 
@@ -6,11 +6,24 @@ import re
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 
-from crewai import Agent, Task
-from langchain_google_genai import ChatGoogleGenerativeAI
+from crewai import Task
 
 from .base import ExtractionAgent, AgentResult, TaskStatus
+from .registry import get_agent_registry
 from ..config import settings
+from ..services.doc_type_classifier import get_doc_type_classifier
+from ..services.blocking_executor import run_task
+from ..services.circuit_breaker import CircuitOpenError
+from ..services.segmenter import section_excerpts
+from ..services.rule_engine import evidence, spans_of
+from ..services.amount_context import amount_contexts
+from ..services.keyword_matcher import DOC_TYPE_KEYWORDS, scan_keywords
+from ..services.fused_extraction import (
+    FUSED_AGENTS,
+    build_fused_prompt,
+    parse_fused_response,
+    split_fused_output,
+)
 
 
 class DocumentClassificationAgent(ExtractionAgent):
@@ -23,19 +36,17 @@ class DocumentClassificationAgent(ExtractionAgent):
         )
         
         # Initialize CrewAI agent
-        self.crew_agent = Agent(
+        self.crew_agent = get_agent_registry().crew_agent(
+            'DocumentClassifier',
+            model=settings.llm_model,
+            api_key=settings.google_api_key,
             role='Document Classification Specialist',
             goal='Accurately classify document types and analyze document structure',
             backstory="""You are an expert in legal and business document classification. 
             You have extensive experience in identifying contract types, agreement structures, 
             and document formatting patterns. You focus on accuracy and provide confidence scores.""",
             verbose=True,
-            allow_delegation=False,
-            llm=ChatGoogleGenerativeAI(
-                model=settings.llm_model,
-                google_api_key=settings.google_api_key,
-                temperature=0.1
-            )
+            allow_delegation=False
         )
     
     async def process(self, document_content: str, context: Dict[str, Any]) -> AgentResult:
@@ -75,7 +86,12 @@ class DocumentClassificationAgent(ExtractionAgent):
             )
     
     async def extract_data(self, content: str, context: Dict[str, Any]) -> Dict[str, Any]:
-        """Extract document classification data using AI."""
+        """Extract document classification data, using AI only when the local classifier is unsure."""
+        
+        if settings.local_classifier_enabled:
+            local_result = self._classify_locally(content, context)
+            if local_result:
+                return local_result
         
         classification_task = Task(
             description=f"""
@@ -96,11 +112,48 @@ class DocumentClassificationAgent(ExtractionAgent):
         )
         
         # Execute the task
-        result = classification_task.execute()
+        try:
+            result = await run_task(classification_task)
+        except CircuitOpenError as e:
+            # No model available right now: rule-based lane
+            self.logger.warning(f"Classification using rules: {e}")
+            return {
+                'document_type': {
+                    'primary': self._classify_fallback(content),
+                    'secondary': 'general',
+                    'structure': 'unknown',
+                    'complexity': 'moderate'
+                },
+                'ai_confidence': 0.5,
+                'classification_method': 'fallback_rules'
+            }
         
         # Parse the AI response
         return self._parse_classification_response(result, content)
     
+    def _classify_locally(self, content: str, context: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Classify with the local document-type model; None when below threshold."""
+        candidates = get_doc_type_classifier().predict(
+            f"{context.get('filename', '')}\n{content[:5000]}",
+            top_k=settings.local_classifier_top_k
+        )
+        if not candidates or candidates[0][1] < settings.local_classifier_threshold:
+            return None
+        
+        slug, confidence = candidates[0]
+        return {
+            'document_type': {
+                'primary': self._classify_fallback(content),
+                'secondary': 'general',
+                'structure': 'unknown',
+                'complexity': 'moderate',
+                'slug': slug
+            },
+            'ai_confidence': confidence,
+            'candidates': [{'slug': s, 'confidence': c} for s, c in candidates],
+            'classification_method': 'local_classifier'
+        }
+    
     def _parse_classification_response(self, ai_response: str, content: str) -> Dict[str, Any]:
         """Parse AI response into structured data with fallback extraction."""
         
@@ -138,20 +191,13 @@ class DocumentClassificationAgent(ExtractionAgent):
     
     def _classify_fallback(self, content: str) -> str:
         """Fallback classification using rule-based approach."""
-        content_lower = content.lower()
-        
-        if any(term in content_lower for term in ["service agreement", "consulting", "professional services"]):
-            return "contract"
-        elif "non-disclosure" in content_lower or "nda" in content_lower:
-            return "nda"
-        elif "employment" in content_lower or "hire" in content_lower:
-            return "employment"
-        elif any(term in content_lower for term in ["lease", "rental", "rent"]):
-            return "lease"
-        elif "invoice" in content_lower or "bill" in content_lower:
-            return "invoice"
-        else:
-            return "other"
+        scan = scan_keywords(content)
+        
+        # First type (in DOC_TYPE_KEYWORDS order) with a keyword in the document
+        for doc_type, _ in DOC_TYPE_KEYWORDS:
+            if scan.any(f'doc_type:{doc_type}'):
+                return doc_type
+        return "other"
     
     def _calculate_confidence(self, classification_data: Dict[str, Any], content: str) -> float:
         """Calculate overall confidence score."""
@@ -178,19 +224,17 @@ class PartyExtractionAgent(ExtractionAgent):
             description="Extracts parties, companies, individuals, and contact information"
         )
         
-        self.crew_agent = Agent(
+        self.crew_agent = get_agent_registry().crew_agent(
+            'PartyExtractor',
+            model=settings.llm_model,
+            api_key=settings.google_api_key,
             role='Party and Contact Extraction Specialist',
             goal='Identify all parties, signatories, companies, and contact information in documents',
             backstory="""You are an expert in identifying business entities, individuals, 
             and contact information in legal and business documents. You excel at distinguishing 
             between different party roles and extracting accurate contact details.""",
             verbose=True,
-            allow_delegation=False,
-            llm=ChatGoogleGenerativeAI(
-                model=settings.llm_model,
-                google_api_key=settings.google_api_key,
-                temperature=0.1
-            )
+            allow_delegation=False
         )
     
     async def process(self, document_content: str, context: Dict[str, Any]) -> AgentResult:
@@ -229,11 +273,14 @@ class PartyExtractionAgent(ExtractionAgent):
     async def extract_data(self, content: str, context: Dict[str, Any]) -> Dict[str, Any]:
         """Extract party data using AI with fallback."""
         
+        # One call on the sections routed to this agent (preamble, recitals,
+        # signature block) packed into the budget the prefix used to take
+        excerpt = section_excerpts(content, self.agent_name, budget=1500, max_excerpts=1)[0]
         party_task = Task(
             description=f"""
-            Extract all parties and contact information from this document:
+            Extract all parties and contact information from this document excerpt:
             
-            {content[:1500]}
+            {excerpt}
             
             For each party, identify:
             - Name (company or individual)
@@ -247,7 +294,11 @@ class PartyExtractionAgent(ExtractionAgent):
             expected_output="Structured list of all parties with roles and contact information"
         )
         
-        ai_result = party_task.execute()
+        try:
+            ai_result = await run_task(party_task)
+        except CircuitOpenError as e:
+            self.logger.warning(f"Party extraction using rules: {e}")
+            ai_result = ""
         
         # Combine AI results with rule-based extraction
         ai_parties = self._parse_party_response(ai_result)
@@ -272,14 +323,10 @@ class PartyExtractionAgent(ExtractionAgent):
         """Fallback party extraction using regex patterns."""
         parties = []
         
-        # Extract email addresses
-        emails = re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', content)
-        
-        # Extract company names
-        companies = re.findall(r'([A-Z][A-Za-z\s&]+(?:LLC|Inc\.|Corp\.|Corporation|Company|Group|Partners|LLP|LP))', content)
-        
-        # Extract individual names
-        individuals = re.findall(r'\b([A-Z][a-z]+ [A-Z][a-z]+(?:\s[A-Z][a-z]+)?)\b', content)
+        # Emails, company and individual names from the shared single-pass scan
+        emails = [span.text for span in spans_of(content, 'email')]
+        companies = spans_of(content, 'company')
+        individuals = spans_of(content, 'person')
         
         # Process companies
         for i, company in enumerate(companies[:3]):  # Max 3 companies
@@ -287,24 +334,27 @@ class PartyExtractionAgent(ExtractionAgent):
             contact_email = emails[i] if i < len(emails) else None
             
             parties.append({
-                'name': company.strip(),
+                'name': company.value,
                 'type': 'company',
                 'role': role,
                 'contact': {
                     'email': contact_email
-                }
+                },
+                'span': company.to_dict()
             })
         
         # Process individuals if not enough companies
         if len(parties) < 2:
-            for individual in individuals[:2-len(parties)]:
-                if individual.lower() not in ['service agreement', 'this agreement', 'letter of']:
-                    parties.append({
-                        'name': individual.strip(),
-                        'type': 'individual',
-                        'role': 'signatory',
-                        'contact': {}
-                    })
+            names = [p for p in individuals
+                     if p.value.lower() not in ['service agreement', 'this agreement', 'letter of']]
+            for individual in names[:2-len(parties)]:
+                parties.append({
+                    'name': individual.value,
+                    'type': 'individual',
+                    'role': 'signatory',
+                    'contact': {},
+                    'span': individual.to_dict()
+                })
         
         return parties
     
@@ -325,6 +375,10 @@ class PartyExtractionAgent(ExtractionAgent):
             return 0.6
 
 
+# Amount label category -> financial term type
+TERM_TYPES = {'purchase_price': 'contract_value'}
+
+
 class FinancialAnalysisAgent(ExtractionAgent):
     """Agent specialized in extracting financial terms, amounts, and payment structures."""
     
@@ -334,19 +388,17 @@ class FinancialAnalysisAgent(ExtractionAgent):
             description="Extracts financial terms, contract values, and payment schedules"
         )
         
-        self.crew_agent = Agent(
+        self.crew_agent = get_agent_registry().crew_agent(
+            'FinancialAnalyzer',
+            model=settings.llm_model,
+            api_key=settings.google_api_key,
             role='Financial Terms Analysis Specialist',
             goal='Extract and analyze all financial terms, amounts, and payment structures',
             backstory="""You are an expert financial analyst specializing in contract terms. 
             You excel at identifying contract values, payment schedules, penalties, 
             and financial obligations in legal documents.""",
             verbose=True,
-            allow_delegation=False,
-            llm=ChatGoogleGenerativeAI(
-                model=settings.llm_model,
-                google_api_key=settings.google_api_key,
-                temperature=0.1
-            )
+            allow_delegation=False
         )
     
     async def process(self, document_content: str, context: Dict[str, Any]) -> AgentResult:
@@ -385,12 +437,14 @@ class FinancialAnalysisAgent(ExtractionAgent):
     async def extract_data(self, content: str, context: Dict[str, Any]) -> Dict[str, Any]:
         """Extract financial data using AI with fallback."""
         
-        # AI-based extraction
+        # AI-based extraction, one call on the price/payment sections packed
+        # into the budget the prefix used to take
+        excerpt = section_excerpts(content, self.agent_name, budget=1500, max_excerpts=1)[0]
         financial_task = Task(
             description=f"""
-            Extract all financial terms from this document:
+            Extract all financial terms from this document excerpt:
             
-            {content[:1500]}
+            {excerpt}
             
             Identify:
             - Total contract value
@@ -406,7 +460,11 @@ class FinancialAnalysisAgent(ExtractionAgent):
             expected_output="Structured financial terms with amounts, currencies, and payment schedules"
         )
         
-        ai_result = financial_task.execute()
+        try:
+            ai_result = await run_task(financial_task)
+        except CircuitOpenError as e:
+            self.logger.warning(f"Financial analysis using rules: {e}")
+            ai_result = ""
         
         # Fallback extraction
         fallback_terms = self._extract_financial_fallback(content)
@@ -422,40 +480,31 @@ class FinancialAnalysisAgent(ExtractionAgent):
         """Extract financial terms using regex patterns."""
         financial_terms = []
         
-        # Find dollar amounts
-        amounts = re.findall(r'\$([0-9,]+(?:\.[0-9]{2})?)', content)
+        # Dollar amounts with their own context and nearest label, from their offsets
+        contexts = amount_contexts(content)
+        has_price = any(c.category == 'purchase_price' for c in contexts)
         
-        for i, amount_str in enumerate(amounts):
-            try:
-                amount = float(amount_str.replace(',', ''))
+        for i, ctx in enumerate(contexts):
+            amount = ctx.span.value
+            
+            # Skip small amounts (likely formatting artifacts)
+            if amount is not None and amount >= 100:
+                if ctx.category:
+                    term_type = TERM_TYPES.get(ctx.category, ctx.category)
+                else:
+                    term_type = "contract_value" if i == 0 and not has_price else "payment"
                 
-                # Skip small amounts (likely formatting artifacts)
-                if amount >= 100:
-                    term_type = "contract_value" if i == 0 else "payment"
-                    
-                    financial_terms.append({
-                        'amount': int(amount),
-                        'currency': 'USD',
-                        'type': term_type,
-                        'description': f'Amount: ${amount_str}',
-                        'context': self._extract_amount_context(content, f'${amount_str}')
-                    })
-                    
-            except (ValueError, TypeError):
-                continue
+                financial_terms.append({
+                    'amount': int(amount),
+                    'currency': 'USD',
+                    'type': term_type,
+                    'description': f'{ctx.label.title()}: {ctx.span.text}' if ctx.label else f'Amount: {ctx.span.text}',
+                    'context': ctx.context,
+                    'span': ctx.span.to_dict()
+                })
         
         return financial_terms[:5]  # Limit to 5 terms
     
-    def _extract_amount_context(self, content: str, amount_str: str) -> str:
-        """Extract context around a financial amount."""
-        # Find the amount in content and get surrounding context
-        index = content.find(amount_str)
-        if index >= 0:
-            start = max(0, index - 50)
-            end = min(len(content), index + len(amount_str) + 50)
-            return content[start:end].strip()
-        return ""
-    
     def _calculate_total_value(self, financial_terms: List[Dict]) -> Optional[int]:
         """Calculate total contract value from financial terms."""
         contract_values = [term['amount'] for term in financial_terms if term.get('type') == 'contract_value']
@@ -475,4 +524,130 @@ class FinancialAnalysisAgent(ExtractionAgent):
         elif len(terms) >= 3:
             return 0.85
         else:
-            return 0.7
\ No newline at end of file
+            return 0.7
+
+class FusedExtractionAgent(ExtractionAgent):
+    """Single-call agent covering classification, parties and financial terms."""
+    
+    def __init__(self):
+        super().__init__(
+            agent_name="FusedExtractor",
+            description="Classifies the document and extracts parties and financial terms in one call"
+        )
+        
+        self.crew_agent = get_agent_registry().crew_agent(
+            'FusedExtractor',
+            model=settings.llm_model,
+            api_key=settings.google_api_key,
+            role='Contract Analysis Specialist',
+            goal='Classify documents and extract parties and financial terms as one structured JSON object',
+            backstory="""You are an expert in legal and business documents. You classify 
+            contracts, identify every party with its role, and explain what each amount 
+            in a document is for, answering strictly in the requested JSON format.""",
+            verbose=True,
+            allow_delegation=False
+        )
+        
+        # Aspect agents supply fallbacks and confidence scoring for the fan-out
+        registry = get_agent_registry()
+        self.classifier = registry.instance(DocumentClassificationAgent)
+        self.party_agent = registry.instance(PartyExtractionAgent)
+        self.financial_agent = registry.instance(FinancialAnalysisAgent)
+    
+    async def process(self, document_content: str, context: Dict[str, Any]) -> AgentResult:
+        """Process document with one fused call; data holds every aspect by agent name."""
+        start_time = time.time()
+        task_id = context.get('task_id', 'unknown')
+        
+        try:
+            fused_data = await self.extract_data(document_content, context)
+            return self._create_result(
+                task_id=task_id,
+                status=TaskStatus.COMPLETED,
+                confidence=fused_data['DocumentClassifier']['ai_confidence'],
+                data=fused_data,
+                processing_time_ms=int((time.time() - start_time) * 1000),
+                metadata={'agent_type': 'extraction', 'extraction_mode': 'fused', 'llm_calls': 1}
+            )
+        except Exception as e:
+            self.logger.error(f"Fused extraction failed: {e}")
+            return self._create_result(
+                task_id=task_id,
+                status=TaskStatus.FAILED,
+                confidence=0.0,
+                data={},
+                processing_time_ms=int((time.time() - start_time) * 1000),
+                error_message=str(e)
+            )
+    
+    async def extract_data(self, content: str, context: Dict[str, Any]) -> Dict[str, Any]:
+        """One structured call, split into each aspect agent's data shape."""
+        
+        fused_task = Task(
+            description=build_fused_prompt(content),
+            agent=self.crew_agent,
+            expected_output="One JSON object with classification, parties and financial_terms"
+        )
+        
+        try:
+            ai_result = await run_task(fused_task)
+        except CircuitOpenError as e:
+            # No model available right now: rule-based lane for every aspect
+            self.logger.warning(f"Fused extraction using rules: {e}")
+            aspects = split_fused_output({})
+            aspects['DocumentClassifier'].update(
+                document_type={**aspects['DocumentClassifier']['document_type'],
+                               'primary': self.classifier._classify_fallback(content)},
+                ai_confidence=0.5,
+                classification_method='fallback_rules'
+            )
+        else:
+            aspects = split_fused_output(parse_fused_response(str(ai_result)))
+        
+        # Provenance: where each extracted amount and party name occurs in the document
+        for term in aspects['FinancialAnalyzer']['financial_terms']:
+            span = evidence(content, 'amount', term['amount'])
+            term['evidence'] = span.to_dict() if span else None
+        for party in aspects['PartyExtractor']['parties']:
+            span = evidence(content, 'company', party['name']) or evidence(content, 'person', party['name'])
+            party['evidence'] = span.to_dict() if span else None
+        
+        # Rule-based fallbacks fill aspects the model left empty, as in multi-call mode
+        if not aspects['PartyExtractor']['parties']:
+            parties = self.party_agent._extract_parties_fallback(content)
+            aspects['PartyExtractor'].update(
+                parties=parties, total_parties=len(parties), extraction_method='fused_with_fallback'
+            )
+        if not aspects['FinancialAnalyzer']['financial_terms']:
+            terms = self.financial_agent._extract_financial_fallback(content)
+            aspects['FinancialAnalyzer'].update(
+                financial_terms=terms,
+                total_contract_value=self.financial_agent._calculate_total_value(terms),
+                currency=self.financial_agent._detect_primary_currency(terms),
+                extraction_method='fused_with_fallback'
+            )
+        return aspects
+    
+    def fan_out(self, fused_result: AgentResult, content: str,
+                agent_names: Optional[List[str]] = None) -> Dict[str, AgentResult]:
+        """Split a fused result into the per-agent results multi-call mode produces."""
+        scorers = {
+            'DocumentClassifier': self.classifier._calculate_confidence,
+            'PartyExtractor': self.party_agent._calculate_party_confidence,
+            'FinancialAnalyzer': self.financial_agent._calculate_financial_confidence,
+        }
+        results = {}
+        for name in agent_names or FUSED_AGENTS:
+            data = fused_result.data.get(name, {})
+            failed = not fused_result.is_successful
+            results[name] = AgentResult(
+                agent_name=name,
+                task_id=fused_result.task_id,
+                status=fused_result.status,
+                confidence=0.0 if failed else scorers[name](data, content),
+                data=data,
+                processing_time_ms=fused_result.processing_time_ms,
+                error_message=fused_result.error_message,
+                metadata={**fused_result.metadata, 'fused_from': self.agent_name}
+            )
+        return results
@@ -4,24 +4,45 @@ OCR Agent for Scanned PDF Processing
 Specialized for real estate contract text extraction
 """
 import os
+import re
+import sys
 import logging
-from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+from dataclasses import dataclass, field, replace
 from datetime import datetime
+from pathlib import Path
 import tempfile
 import hashlib
 
 try:
     import pytesseract
-    from pdf2image import convert_from_path
+    from pdf2image import convert_from_path, pdfinfo_from_path
     from PIL import Image
     import PyPDF2
 except ImportError as e:
     print(f"OCR dependencies not installed: {e}")
     print("Run: pip install pytesseract pdf2image Pillow")
 
+# Add repository root to path (this module also runs as a script)
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+from src.app.services.page_pool import iter_pages, prefetch
+from src.app.services.tesseract_layout import layout_from_data
+
 logger = logging.getLogger(__name__)
 
+# A page's text layer is garbled when undecodable glyphs ("(cid:12)", U+FFFD,
+# control or private-use characters) make up more than this share of it, or
+# when less than this share of its visible characters (ignoring fill such as
+# "____" and "....") are letters or digits
+MAX_GARBLED_RATIO = 0.3
+MIN_ALNUM_RATIO = 0.5
+_GARBLED_RE = re.compile(r"\(cid:\d+\)|[\ufffd\x00-\x08\x0b\x0c\x0e-\x1f\ue000-\uf8ff]")
+_FILL_CHARS = set("_.-–—…·")
+
+DIGITAL_CONFIDENCE = 0.95
+# Embedded text kept for a page whose OCR failed or read less legible text
+EMBEDDED_FALLBACK_CONFIDENCE = 0.5
+
 @dataclass
 class OCRResult:
     """OCR processing result"""
@@ -30,6 +51,7 @@ class OCRResult:
     page_count: int
     processing_method: str
     metadata: Dict
+    pages: List["DocumentPage"] = field(default_factory=list)
     
 @dataclass
 class DocumentPage:
@@ -38,19 +60,79 @@ class DocumentPage:
     text: str
     confidence: float
     image_path: Optional[str] = None
+    seconds: float = 0.0
+    status: str = "ok"
+    words: List[Dict] = field(default_factory=list)  # word text, confidence and box
+    method: str = "ocr"  # "ocr" | "digital"
+
+def select_page(page_number: int, embedded: str, ocr_page: Optional[DocumentPage]) -> DocumentPage:
+    """
+    A page's OCR result, unless OCR failed or read less than the embedded text
+    (compared without undecodable glyphs, which would otherwise inflate it)
+    """
+    legible = _GARBLED_RE.sub("", embedded).strip()
+    if ocr_page is not None and ocr_page.status == "ok" and len(ocr_page.text.strip()) >= len(legible):
+        return ocr_page
+    if legible:
+        return DocumentPage(page_number, embedded, EMBEDDED_FALLBACK_CONFIDENCE, method="digital")
+    return ocr_page or DocumentPage(page_number, "", 0.0, status="failed")
+
+def merge_pages(pages: List[DocumentPage]) -> str:
+    """Document text from its pages in page order, with page markers"""
+    return "".join(
+        f"\n--- Page {page.page_number} ---\n{page.text}\n"
+        for page in sorted(pages, key=lambda page: page.page_number)
+    ).strip()
+
+def _ocr_page_image(task: Tuple[str, str], timeout: Optional[float] = None) -> Tuple[str, float, List[Dict]]:
+    """
+    OCR one rendered page image -> (text, confidence 0-100, words); runs in pool
+    workers and deletes the image once it is read
+    """
+    image_path, tesseract_config = task
+    try:
+        with Image.open(image_path) as image:
+            # One recognition pass: text is rebuilt from the word rows
+            page_data = pytesseract.image_to_data(
+                image, 
+                config=tesseract_config,
+                output_type=pytesseract.Output.DICT,
+                timeout=timeout or 0
+            )
+    except RuntimeError as e:
+        # pytesseract kills tesseract and raises RuntimeError on timeout
+        if 'timeout' in str(e).lower():
+            raise TimeoutError(f"Tesseract exceeded {timeout}s") from None
+        raise
+    finally:
+        if os.path.exists(image_path):
+            os.remove(image_path)
+    
+    layout = layout_from_data(page_data)
+    return layout.text, layout.confidence, [word.to_dict() for word in layout.words]
 
 class OCRAgent:
     """Intelligent OCR agent for real estate documents"""
     
-    def __init__(self):
+    def __init__(self, parallel: bool = True, max_workers: Optional[int] = None,
+                 page_timeout: Optional[float] = 120.0, prefetch_pages: int = 2):
         self.tesseract_config = r'--oem 3 --psm 6'  # Best for dense text documents
         self.dpi = 300  # High quality for legal documents
         
+        # Page OCR runs in a process pool sized to the available cores (None);
+        # parallel=False OCRs pages one after another in this process
+        self.parallel = parallel
+        self.max_workers = max_workers
+        self.page_timeout = page_timeout
+        
+        # Pages are rendered one at a time, at most this many ahead of OCR
+        self.prefetch_pages = prefetch_pages
+        
     def extract_text_from_pdf(self, pdf_path: str) -> OCRResult:
         """
-        Extract text from PDF using hybrid approach:
-        1. Try text extraction first (for digital PDFs)
-        2. Fall back to OCR for scanned PDFs
+        Extract text from PDF page by page (hybrid approach):
+        1. Pages with a usable text layer keep their embedded text (digital)
+        2. Only the pages without one are OCRed; all pages merge in page order
         """
         logger.info(f"Processing PDF: {pdf_path}")
         
@@ -58,110 +140,163 @@ class OCRAgent:
             # First, try direct text extraction
             with open(pdf_path, 'rb') as file:
                 pdf_reader = PyPDF2.PdfReader(file)
-                digital_text = ""
-                
-                for page in pdf_reader.pages:
-                    digital_text += page.extract_text() + "\n"
-                
-                # If we got substantial text, it's likely digital
-                if len(digital_text.strip()) > 100 and self._has_readable_text(digital_text):
-                    logger.info("PDF appears to be digital, using direct text extraction")
-                    return OCRResult(
-                        text=digital_text.strip(),
-                        confidence=0.95,
-                        page_count=len(pdf_reader.pages),
-                        processing_method="digital_extraction",
-                        metadata={
-                            "file_size": os.path.getsize(pdf_path),
-                            "pages": len(pdf_reader.pages),
-                            "extraction_method": "PyPDF2"
-                        }
-                    )
+                page_texts = [page.extract_text() or "" for page in pdf_reader.pages]
         except Exception as e:
             logger.warning(f"Digital extraction failed: {e}")
+            page_texts = []
+        
+        scanned = [n for n, text in enumerate(page_texts, 1) if not self._page_has_text_layer(text)]
+        
+        if page_texts and not scanned:
+            logger.info("PDF appears to be digital, using direct text extraction")
+            digital_text = "".join(text + "\n" for text in page_texts)
+            return OCRResult(
+                text=digital_text.strip(),
+                confidence=DIGITAL_CONFIDENCE,
+                page_count=len(page_texts),
+                processing_method="digital_extraction",
+                metadata={
+                    "file_size": os.path.getsize(pdf_path),
+                    "pages": len(page_texts),
+                    "extraction_method": "PyPDF2"
+                },
+                pages=[DocumentPage(n, text, DIGITAL_CONFIDENCE, method="digital")
+                       for n, text in enumerate(page_texts, 1)]
+            )
         
-        # Fall back to OCR for scanned documents
-        logger.info("Using OCR for scanned PDF")
-        return self._ocr_pdf_to_text(pdf_path)
+        if not page_texts:
+            # Fall back to OCR for scanned documents
+            logger.info("Using OCR for scanned PDF")
+            return self._ocr_pdf_to_text(pdf_path)
+        
+        # OCR only the pages without a usable text layer; a page keeps its
+        # embedded text if its OCR fails or reads less
+        if len(scanned) == len(page_texts):
+            logger.info("Using OCR for scanned PDF")
+        else:
+            logger.info(f"Mixed PDF: OCR of pages {scanned}, embedded text for the other "
+                        f"{len(page_texts) - len(scanned)}")
+        ocr = self._ocr_pdf_to_text(pdf_path, page_numbers=scanned)
+        ocr_pages = {page.page_number: page for page in ocr.pages}
+        pages = [
+            select_page(n, text, ocr_pages.get(n)) if n in scanned
+            else DocumentPage(n, text, DIGITAL_CONFIDENCE, method="digital")
+            for n, text in enumerate(page_texts, 1)
+        ]
+        if all(page.method == "ocr" for page in pages):
+            return ocr
+        
+        return OCRResult(
+            text=merge_pages(pages),
+            confidence=sum(page.confidence for page in pages) / len(pages),
+            page_count=len(pages),
+            processing_method="hybrid",
+            metadata={
+                **ocr.metadata,
+                "file_size": os.path.getsize(pdf_path),
+                "pages": len(pages),
+                "digital_pages": [page.page_number for page in pages if page.method == "digital"],
+                "ocr_pages": scanned,
+                "extraction_method": "PyPDF2+tesseract"
+            },
+            pages=pages
+        )
     
-    def _has_readable_text(self, text: str) -> bool:
-        """Check if extracted text appears to be readable (not garbled)"""
-        if not text.strip():
+    def _page_has_text_layer(self, text: str) -> bool:
+        """Check if one page's embedded text is usable: present and not garbled"""
+        stripped = text.strip()
+        if not stripped:
             return False
-            
-        # Check for common legal/contract words
-        legal_indicators = [
-            'agreement', 'contract', 'party', 'parties', 'whereas',
-            'therefore', 'shall', 'property', 'purchase', 'lease',
-            'amount', 'date', 'signed', 'executed', 'page'
-        ]
         
-        text_lower = text.lower()
-        indicators_found = sum(1 for indicator in legal_indicators if indicator in text_lower)
+        garbled = sum(len(glyph) for glyph in _GARBLED_RE.findall(stripped))
+        if garbled / len(stripped) > MAX_GARBLED_RATIO:
+            return False
         
-        # If we find several legal terms, likely readable
-        return indicators_found >= 3
+        # Short pages, signature blocks and tables are fine; symbol soup is not
+        visible = [ch for ch in _GARBLED_RE.sub("", stripped) if not ch.isspace() and ch not in _FILL_CHARS]
+        if not visible:
+            return False
+        alnum = sum(1 for ch in visible if ch.isalnum())
+        return alnum / len(visible) >= MIN_ALNUM_RATIO
+    
+    def _render_pages(self, pdf_path: str, page_numbers: List[int], output_folder: str) -> Iterator[str]:
+        """Render pages one by one to image files, yielding each path"""
+        for page_number in page_numbers:
+            paths = convert_from_path(
+                pdf_path,
+                dpi=self.dpi,
+                first_page=page_number,
+                last_page=page_number,
+                output_folder=output_folder,
+                output_file=f"page-{page_number:05d}",
+                single_file=True,
+                paths_only=True
+            )
+            yield paths[0]
     
-    def _ocr_pdf_to_text(self, pdf_path: str) -> OCRResult:
-        """OCR processing for scanned PDFs"""
+    def _ocr_pdf_to_text(self, pdf_path: str, page_numbers: Optional[List[int]] = None) -> OCRResult:
+        """OCR processing for scanned PDFs (all pages, or only `page_numbers`)"""
         
         with tempfile.TemporaryDirectory() as temp_dir:
             try:
-                # Convert PDF to images
-                logger.info("Converting PDF pages to images...")
-                images = convert_from_path(
-                    pdf_path, 
-                    dpi=self.dpi,
-                    output_folder=temp_dir,
-                    thread_count=2
+                # Stream pages: render each on demand (a bounded number ahead) and
+                # OCR it in the pool; workers get paths and delete them when done,
+                # so memory and disk use stay flat with the page count
+                if page_numbers is None:
+                    page_numbers = list(range(1, pdfinfo_from_path(pdf_path)["Pages"] + 1))
+                workers = self.max_workers if self.parallel else 1
+                logger.info(f"OCR of {len(page_numbers)} pages (workers: {workers or 'all cores'})")
+                rendered = prefetch(self._render_pages(pdf_path, page_numbers, temp_dir), self.prefetch_pages)
+                stream = iter_pages(
+                    _ocr_page_image,
+                    ((path, self.tesseract_config) for path in rendered),
+                    max_workers=workers,
+                    timeout=self.page_timeout
                 )
                 
+                runs = []
                 pages_processed = []
-                total_text = ""
                 total_confidence = 0
                 
-                for i, image in enumerate(images):
-                    logger.info(f"Processing page {i+1}/{len(images)}")
-                    
-                    # OCR the image
-                    page_data = pytesseract.image_to_data(
-                        image, 
-                        config=self.tesseract_config,
-                        output_type=pytesseract.Output.DICT
-                    )
-                    
-                    page_text = pytesseract.image_to_string(
-                        image,
-                        config=self.tesseract_config
-                    )
-                    
-                    # Calculate page confidence
-                    confidences = [int(conf) for conf in page_data['conf'] if int(conf) > 0]
-                    page_confidence = sum(confidences) / len(confidences) if confidences else 0
+                for run in stream:
+                    # Stream positions back to PDF page numbers
+                    run = replace(run, page_number=page_numbers[run.page_number - 1])
+                    runs.append(run)
+                    page_text, page_confidence, words = run.result if run.status == "ok" else ("", 0, [])
+                    if run.status != "ok":
+                        logger.warning(f"Page {run.page_number} OCR {run.status}: {run.error}")
                     
                     pages_processed.append(DocumentPage(
-                        page_number=i + 1,
+                        page_number=run.page_number,
                         text=page_text,
-                        confidence=page_confidence / 100.0  # Convert to 0-1 range
+                        confidence=page_confidence / 100.0,  # Convert to 0-1 range
+                        seconds=run.seconds,
+                        status=run.status,
+                        words=words
                     ))
-                    
-                    total_text += f"\n--- Page {i+1} ---\n{page_text}\n"
                     total_confidence += page_confidence
                 
-                avg_confidence = (total_confidence / len(images)) / 100.0 if images else 0
+                avg_confidence = (total_confidence / len(runs)) / 100.0 if runs else 0
                 
                 return OCRResult(
-                    text=total_text.strip(),
+                    text=merge_pages(pages_processed),
                     confidence=avg_confidence,
-                    page_count=len(images),
+                    page_count=len(runs),
                     processing_method="tesseract_ocr",
                     metadata={
                         "file_size": os.path.getsize(pdf_path),
                         "dpi": self.dpi,
                         "tesseract_config": self.tesseract_config,
                         "pages_processed": len(pages_processed),
-                        "avg_page_confidence": avg_confidence
-                    }
+                        "avg_page_confidence": avg_confidence,
+                        "parallel": self.parallel,
+                        "page_timeout": self.page_timeout,
+                        "prefetch_pages": self.prefetch_pages,
+                        "page_timings": [run.timing() for run in runs],
+                        "pages_failed": [run.page_number for run in runs if run.status != "ok"],
+                        "word_boxes": sum(len(page.words) for page in pages_processed)
+                    },
+                    pages=pages_processed
                 )
                 
             except Exception as e:
@@ -0,0 +1,112 @@
+"""Process-wide registry of LLM clients, CrewAI agents and extraction agents.
+
+Orchestrators and agents used to construct their own `ChatGoogleGenerativeAI`
+and CrewAI `Agent` objects, so every orchestrator (and every per-request
+construction) repeated the same setup. The registry builds each of them once
+per process and hands out the shared instance afterwards; `stats()` reports
+cold builds versus warm reuse.
+"""
+
+import time
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Type, TypeVar
+
+T = TypeVar("T")
+
+
+def _default_llm_factory(model: str, temperature: float, api_key: Optional[str]) -> Any:
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    return ChatGoogleGenerativeAI(model=model, google_api_key=api_key, temperature=temperature)
+
+
+def _default_agent_factory(llm: Any, **definition: Any) -> Any:
+    from crewai import Agent
+    return Agent(llm=llm, **definition)
+
+
+class AgentRegistry:
+    """Thread-safe build-once cache with warm/cold statistics per kind."""
+
+    def __init__(
+        self,
+        llm_factory: Callable[..., Any] = _default_llm_factory,
+        agent_factory: Callable[..., Any] = _default_agent_factory
+    ):
+        self._llm_factory = llm_factory
+        self._agent_factory = agent_factory
+        self._lock = threading.RLock()
+        self._items: Dict[str, Dict[Hashable, Any]] = {"llms": {}, "crew_agents": {}, "instances": {}}
+        self._stats = {
+            kind: {"cold": 0, "warm": 0, "build_ms": 0.0} for kind in self._items
+        }
+
+    def _get_or_build(self, kind: str, key: Hashable, build: Callable[[], T]) -> T:
+        cache = self._items[kind]
+        stats = self._stats[kind]
+        with self._lock:
+            if key in cache:
+                stats["warm"] += 1
+                return cache[key]
+            # Built under the lock so concurrent first requests share one instance
+            start = time.perf_counter()
+            value = build()
+            stats["build_ms"] += (time.perf_counter() - start) * 1000
+            stats["cold"] += 1
+            cache[key] = value
+            return value
+
+    def llm(self, model: str, temperature: float = 0.1, api_key: Optional[str] = None) -> Any:
+        """Shared LLM client for a model/temperature."""
+        return self._get_or_build(
+            "llms", (model, temperature, api_key),
+            lambda: self._llm_factory(model, temperature, api_key)
+        )
+
+    def crew_agent(
+        self,
+        name: str,
+        model: str,
+        temperature: float = 0.1,
+        api_key: Optional[str] = None,
+        **definition: Any
+    ) -> Any:
+        """Shared CrewAI agent, keyed by name (role/goal/backstory passed as definition)."""
+        return self._get_or_build(
+            "crew_agents", name,
+            lambda: self._agent_factory(self.llm(model, temperature, api_key), **definition)
+        )
+
+    def instance(self, cls: Type[T], *args: Any, **kwargs: Any) -> T:
+        """Shared instance of an agent/router class (constructor args only used on first build)."""
+        return self._get_or_build("instances", cls, lambda: cls(*args, **kwargs))
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                kind: {
+                    "cached": len(self._items[kind]),
+                    "cold": s["cold"],
+                    "warm": s["warm"],
+                    "build_ms": round(s["build_ms"], 1),
+                }
+                for kind, s in self._stats.items()
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            for cache in self._items.values():
+                cache.clear()
+
+
+_registry: Optional[AgentRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_agent_registry() -> AgentRegistry:
+    """Process-wide agent registry."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = AgentRegistry()
+    return _registry
@@ -2,7 +2,7 @@
 
 import os
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, List, Optional
 
 
 class Settings(BaseSettings):
@@ -59,8 +59,45 @@ class Settings(BaseSettings):
     # Agent Configuration
     max_parallel_agents: int = 6
     agent_timeout_seconds: int = 120
+    # "multi": one LLM call per agent; "fused": one structured call covering
+    # classification, parties and financial terms, fanned out per agent
+    extraction_mode: str = "multi"
+    # Per-agent overrides of agent_timeout_seconds, keyed by agent name
+    agent_deadlines: Dict[str, int] = {}
     validation_timeout_seconds: int = 60
     
+    # Document analysis admission scheduler (priority classes: urgent, high,
+    # normal, bulk); weights/caps override the defaults in services/scheduler.py
+    scheduler_max_concurrent: int = 8
+    scheduler_aging_seconds: float = 300.0
+    scheduler_class_weights: Dict[str, float] = {}
+    scheduler_class_caps: Dict[str, int] = {}
+    
+    # Circuit breakers per dependency (LLM model, database): open after N
+    # consecutive failures, probe again after the recovery period
+    circuit_failure_threshold: int = 5
+    circuit_recovery_seconds: float = 30.0
+    circuit_half_open_probes: int = 1
+    # Models tried, in order, while the primary model's breaker is open
+    llm_fallback_models: List[str] = ["gemini-1.5-flash"]
+    # Documents kept in memory for later storage while every database is open
+    deferred_store_max: int = 1000
+    
+    # Thread pool for blocking CrewAI Task.execute() calls
+    crew_executor_workers: int = 8
+    crew_call_timeout_seconds: int = 90
+    
+    # Stage layouts for the orchestration pipelines (per document type)
+    pipeline_config_path: str = "config/pipelines.json"
+    
+    # Local document-type classifier (LLM identification only below threshold)
+    local_classifier_enabled: bool = True
+    local_classifier_threshold: float = 0.6
+    local_classifier_top_k: int = 3
+    
+    # Routing comes from the compiled routing table; LLM router only for unknown slugs
+    llm_routing_for_unknown: bool = True
+    
     # Business Rules
     high_value_threshold: int = 10000000  # $10M
     review_required_keywords: list = [
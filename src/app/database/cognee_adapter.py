@@ -3,9 +3,12 @@
 import asyncio
 import json
 import time
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import structlog
 from .connection_manager import get_db_connection, DatabaseManager
+from ..config import settings
+from ..services.circuit_breaker import get_breaker, get_breaker_registry
+from ..services.deferred_writes import DeferredQueueFull, DeferredWrites
 
 logger = structlog.get_logger()
 
@@ -13,9 +16,17 @@ logger = structlog.get_logger()
 class CogneeAdapter:
     """Adapter for Cognee database operations with enhanced concurrency."""
     
-    def __init__(self, database_manager: DatabaseManager):
+    def __init__(self, database_manager: DatabaseManager, max_attempts: int = 3):
         self.db_manager = database_manager
+        self.max_attempts = max_attempts
         self.logger = structlog.get_logger().bind(component="cognee_adapter")
+        # Documents waiting for a database while every circuit is open; flushed
+        # by their own task once a database breaker may probe again
+        self.deferred = DeferredWrites(
+            self._store_deferred,
+            retry_after=self._next_probe_in,
+            max_items=settings.deferred_store_max
+        )
     
     async def store_document_async(
         self, 
@@ -23,100 +34,153 @@ class CogneeAdapter:
         metadata: Dict[str, Any],
         database_name: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Store document in Cognee with concurrency handling."""
+        """
+        Store document in Cognee with concurrency handling.
+        
+        Each database sits behind a circuit breaker: databases whose breaker
+        is open are skipped without waiting, and a failed write moves on to the
+        next database after a short backoff (awaited, so no worker thread
+        sleeps). When no database is available the document is deferred and stored by a background flush
+        once a database recovers; the result then has `success` False and
+        `deferred` True. Raises if the deferred queue is full.
+        """
         
         start_time = time.time()
+        result, error = await self._store_once(content, metadata, database_name)
+        if result is not None:
+            return result
         
         try:
-            # Use load-balanced database selection if not specified
-            result = await asyncio.to_thread(
-                self._store_document_sync,
-                content,
-                metadata,
-                database_name
-            )
-            
-            duration = time.time() - start_time
-            self.logger.info(
-                "Document stored successfully",
-                duration_ms=int(duration * 1000),
-                database=database_name,
-                size=len(content)
-            )
-            
-            return result
-            
-        except Exception as e:
-            duration = time.time() - start_time
+            deferred = self.deferred.defer((content, metadata))
+        except DeferredQueueFull:
             self.logger.error(
-                "Document storage failed",
-                error=str(e),
-                duration_ms=int(duration * 1000),
-                database=database_name
+                "Document storage failed and deferred queue is full",
+                error=str(error),
+                deferred=len(self.deferred)
             )
-            raise
+            raise error or RuntimeError("No database available and deferred queue is full")
+        
+        self.logger.error(
+            "Document storage deferred",
+            error=str(error) if error else "all database circuits open",
+            duration_ms=int((time.time() - start_time) * 1000),
+            deferred=deferred
+        )
+        return {
+            'success': False,
+            'deferred': True,
+            'deferred_count': deferred,
+            'error': str(error) if error else 'all database circuits open'
+        }
     
-    def _store_document_sync(
+    async def _store_once(
         self,
         content: str,
         metadata: Dict[str, Any],
         database_name: Optional[str] = None
-    ) -> Dict[str, Any]:
-        """Synchronous document storage with retry logic."""
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[Exception]]:
+        """One round over the candidate databases -> (result, None) or (None, last error)."""
         
-        max_retries = 3
+        start_time = time.time()
         retry_delay = 0.5
+        last_error = None
         
-        for attempt in range(max_retries):
+        # Attempts go round the databases (the same one again if it is the only one)
+        names = self.db_manager.candidate_databases(database_name)
+        candidates = [names[i % len(names)] for i in range(self.max_attempts)] if names else []
+        for attempt, name in enumerate(candidates):
+            breaker = get_breaker(f"db:{name}")
+            if not breaker.allow():
+                continue
             try:
-                with get_db_connection(database_name) as conn:
-                    # Prepare document data
-                    document_data = {
-                        'content': content,
-                        'metadata': json.dumps(metadata),
-                        'created_at': time.time(),
-                        'size': len(content)
-                    }
-                    
-                    # Store in documents table
-                    cursor = conn.execute("""
-                        INSERT INTO documents (content, metadata, created_at, size)
-                        VALUES (?, ?, ?, ?)
-                    """, (
-                        document_data['content'],
-                        document_data['metadata'],
-                        document_data['created_at'],
-                        document_data['size']
-                    ))
-                    
-                    document_id = cursor.lastrowid
-                    conn.commit()
-                    
-                    # Create embeddings (simplified)
-                    embedding_result = self._create_embeddings_sync(
-                        conn, document_id, content, metadata
-                    )
-                    
-                    return {
-                        'success': True,
-                        'document_id': document_id,
-                        'embedding_count': embedding_result.get('embedding_count', 0),
-                        'database_used': database_name
-                    }
-                    
+                result = await asyncio.to_thread(self._store_document_sync, content, metadata, name)
+            except asyncio.CancelledError:
+                breaker.release()
+                raise
             except Exception as e:
-                if attempt < max_retries - 1:
-                    self.logger.warning(
-                        f"Storage attempt {attempt + 1} failed, retrying",
-                        error=str(e),
-                        retry_delay=retry_delay
-                    )
-                    time.sleep(retry_delay)
+                breaker.record_failure(e)
+                last_error = e
+                self.logger.warning(
+                    "Storage attempt failed, retrying",
+                    error=str(e),
+                    database=name,
+                    retry_delay=retry_delay
+                )
+                if attempt < len(candidates) - 1:
+                    await asyncio.sleep(retry_delay)
                     retry_delay *= 2  # Exponential backoff
-                else:
-                    raise
+                continue
+            
+            breaker.record_success()
+            self.logger.info(
+                "Document stored successfully",
+                duration_ms=int((time.time() - start_time) * 1000),
+                database=name,
+                size=len(content)
+            )
+            return result, None
         
-        raise Exception("All storage attempts failed")
+        return None, last_error
+    
+    async def _store_deferred(self, item: Tuple[str, Dict[str, Any]]) -> bool:
+        """Flush callback: store one deferred document, False while no database accepts it."""
+        content, metadata = item
+        result, _ = await self._store_once(content, metadata)
+        return result is not None
+    
+    def _next_probe_in(self) -> float:
+        """Seconds until some database breaker lets a call through again."""
+        return min(
+            (get_breaker(f"db:{name}").retry_after() for name in self.db_manager.database_names),
+            default=0.0
+        )
+    
+    async def flush_deferred(self) -> int:
+        """Store deferred documents now while a database accepts them; returns the number stored."""
+        return await self.deferred.flush()
+    
+    def _store_document_sync(
+        self,
+        content: str,
+        metadata: Dict[str, Any],
+        database_name: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Synchronous single-attempt document storage (retries happen in the caller)."""
+        
+        with get_db_connection(database_name) as conn:
+            # Prepare document data
+            document_data = {
+                'content': content,
+                'metadata': json.dumps(metadata),
+                'created_at': time.time(),
+                'size': len(content)
+            }
+            
+            # Store in documents table
+            cursor = conn.execute("""
+                INSERT INTO documents (content, metadata, created_at, size)
+                VALUES (?, ?, ?, ?)
+            """, (
+                document_data['content'],
+                document_data['metadata'],
+                document_data['created_at'],
+                document_data['size']
+            ))
+            
+            document_id = cursor.lastrowid
+            conn.commit()
+            
+            # Create embeddings (simplified)
+            embedding_result = self._create_embeddings_sync(
+                conn, document_id, content, metadata
+            )
+            
+            return {
+                'success': True,
+                'document_id': document_id,
+                'embedding_count': embedding_result.get('embedding_count', 0),
+                'database_used': database_name
+            }
     
     def _create_embeddings_sync(
         self,
@@ -236,7 +300,9 @@ class CogneeAdapter:
             'healthy_databases': sum(1 for is_healthy in health_status.values() if is_healthy),
             'total_databases': len(health_status),
             'database_health': health_status,
-            'load_balancing_enabled': len(health_status) > 1
+            'load_balancing_enabled': len(health_status) > 1,
+            'circuit_breakers': get_breaker_registry().snapshot("db:"),
+            'deferred_documents': len(self.deferred)
         }
         
         return status
@@ -5,7 +5,7 @@ import time
 import sqlite3
 import threading
 from contextlib import contextmanager
-from typing import Optional, Generator, Dict, Any
+from typing import Optional, Generator, Dict, Any, List
 from dataclasses import dataclass
 from queue import Queue, Empty
 import structlog
@@ -215,6 +215,15 @@ class DatabaseManager:
         with self.pools[database_name].get_connection() as conn:
             yield conn
     
+    def candidate_databases(self, preferred: Optional[str] = None) -> List[str]:
+        """Databases to try for a write: the preferred one, then the rest in round-robin order."""
+        start = self.database_names.index(self._get_next_database())
+        ordered = self.database_names[start:] + self.database_names[:start]
+        if preferred in self.pools:
+            ordered.remove(preferred)
+            ordered.insert(0, preferred)
+        return ordered
+    
     def _get_next_database(self) -> str:
         """Get next database for round-robin load balancing."""
         database_name = self.database_names[self._round_robin_index]
@@ -15,9 +15,13 @@ from sqlalchemy.dialects.postgresql import UUID as PG_UUID, JSONB
 from sqlalchemy import Column, String, Text, Integer, DateTime, Boolean, Numeric, ForeignKey
 
 from ..config import settings
+from ..services.circuit_breaker import get_breaker, guarded
 
 logger = structlog.get_logger()
 
+# Writes and searches fail fast while Postgres is unavailable
+POSTGRES_BREAKER = "db:postgres"
+
 
 class Base(DeclarativeBase):
     pass
@@ -101,6 +105,7 @@ class PostgreSQLAdapter:
         
         self.logger = structlog.get_logger().bind(component="postgres_adapter")
         
+    @guarded(POSTGRES_BREAKER)
     async def store_document_with_analysis(
         self,
         content: str,
@@ -208,6 +213,7 @@ class PostgreSQLAdapter:
                 self.logger.error(f"Storage transaction failed: {e}")
                 raise
     
+    @guarded(POSTGRES_BREAKER)
     async def search_documents(
         self,
         query: str,
@@ -326,6 +332,7 @@ class PostgreSQLAdapter:
                 }
             }
     
+    @guarded(POSTGRES_BREAKER)
     async def get_review_queue(self, limit: int = 50) -> List[Dict[str, Any]]:
         """Get documents requiring human review."""
         
@@ -421,6 +428,7 @@ class PostgreSQLAdapter:
                 
                 return {
                     'status': 'healthy',
+                    'circuit_breaker': get_breaker(POSTGRES_BREAKER).snapshot(),
                     'database_url': settings.database_url.replace(settings.postgres_password, '***'),
                     'pool_status': {
                         'size': pool.size(),
@@ -434,6 +442,7 @@ class PostgreSQLAdapter:
         except Exception as e:
             return {
                 'status': 'unhealthy',
+                'circuit_breaker': get_breaker(POSTGRES_BREAKER).snapshot(),
                 'error': str(e)
             }
     
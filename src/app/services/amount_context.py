@@ -0,0 +1,98 @@
+"""
+Offset-based context and labels for amounts.
+
+Amount context used to be recovered with `content.find(amount_str)`, which
+rescans the document for every amount and always lands on the first
+occurrence, so two "$50,000" amounts shared one (possibly wrong) context.
+Here the amount spans from the rule engine carry their offsets, sentence
+boundaries and labeling phrases ("purchase price", "deposit", "insurance")
+are found in one pass each, and every amount is placed among them with a
+binary search.
+"""
+import re
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+from .rule_engine import Span, spans_of
+
+# Category -> phrases that label an amount in the same sentence
+LABEL_PHRASES = {
+    "purchase_price": ["purchase price", "sale price", "sales price", "contract price",
+                       "total consideration", "consideration", "agrees to pay", "price of"],
+    "deposit": ["earnest money", "escrow deposit", "initial deposit", "additional deposit", "deposit"],
+    "insurance": ["insurance", "liability", "coverage", "policy limit", "bond"],
+    "rent": ["base rent", "monthly rent", "annual rent", "rent"],
+    "loan": ["loan amount", "principal amount", "principal"],
+    "fee": ["commission", "closing costs", "fee"],
+    "penalty": ["liquidated damages", "late charge", "penalty"],
+}
+
+_PHRASE_CATEGORY = {phrase: category for category, phrases in LABEL_PHRASES.items() for phrase in phrases}
+
+# Longest phrase first, so "escrow deposit" wins over "deposit"
+_LABEL_RE = re.compile(
+    r"\b(?:" + "|".join(re.escape(p) for p in sorted(_PHRASE_CATEGORY, key=len, reverse=True)) + r")\b",
+    re.IGNORECASE,
+)
+
+# Sentence ends: terminal punctuation before whitespace, or a blank line
+_SENTENCE_END_RE = re.compile(r"[.;!?](?=\s)|\n\s*\n")
+
+
+@dataclass(frozen=True)
+class AmountContext:
+    """An amount span with its surroundings; `label` is the nearest labeling phrase"""
+    span: Span
+    context: str
+    sentence: str
+    label: Optional[str]
+    category: Optional[str]
+
+
+def _label_positions(text: str) -> Tuple[List[int], List[Tuple[int, int, str]]]:
+    labels = [(m.start(), m.end(), m.group(0).lower()) for m in _LABEL_RE.finditer(text)]
+    return [start for start, _, _ in labels], labels
+
+
+def _nearest_label(labels: List[Tuple[int, int, str]], starts: List[int],
+                   span: Span, lo: int, hi: int) -> Optional[str]:
+    """Closest label inside [lo, hi); a preceding label wins ties"""
+    best, best_distance = None, None
+    i = bisect_right(starts, span.start)
+    # Closest label starting before the amount, then closest one after it
+    for j in (i - 1, i):
+        if 0 <= j < len(labels):
+            start, end, phrase = labels[j]
+            if start < lo or end > hi:
+                continue
+            distance = span.start - end if start < span.start else start - span.end
+            if best_distance is None or distance < best_distance:
+                best, best_distance = phrase, distance
+    return best
+
+
+def amount_contexts(text: str, spans: Optional[Sequence[Span]] = None,
+                    width: int = 50) -> List[AmountContext]:
+    """
+    Context window, sentence and nearest label for each amount span (all
+    amounts of `text` by default), in document order
+    """
+    spans = spans_of(text, "amount") if spans is None else spans
+    ends = [m.end() for m in _SENTENCE_END_RE.finditer(text)]
+    label_starts, labels = _label_positions(text)
+
+    contexts = []
+    for span in spans:
+        k = bisect_left(ends, span.end)
+        sentence_start = ends[k - 1] if k > 0 else 0
+        sentence_end = ends[k] if k < len(ends) else len(text)
+        label = _nearest_label(labels, label_starts, span, sentence_start, sentence_end)
+        contexts.append(AmountContext(
+            span=span,
+            context=span.context(text, width),
+            sentence=text[sentence_start:sentence_end].strip(),
+            label=label,
+            category=_PHRASE_CATEGORY.get(label) if label else None,
+        ))
+    return contexts
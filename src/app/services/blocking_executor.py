@@ -0,0 +1,160 @@
+"""
+Bounded thread pool for blocking calls made from async code.
+
+CrewAI's `Task.execute()` is synchronous; calling it directly inside an
+`async def` blocks the event loop, so agents gathered with `asyncio.gather`
+run one after another and the API stalls while they do. Routing those calls
+through this executor runs them in a dedicated, sized pool with a per-call
+timeout.
+
+Threads cannot be interrupted: on timeout or cancellation a call that has not
+started yet is dropped from the queue, while one that is already running is
+abandoned (its result is discarded) and keeps its worker until it returns.
+"""
+import time
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+
+class BlockingCallTimeout(asyncio.TimeoutError):
+    """A blocking call did not finish within its timeout"""
+
+
+class BlockingExecutor:
+    """Runs blocking callables in a dedicated thread pool"""
+
+    def __init__(self, max_workers: int = 8, default_timeout: Optional[float] = None,
+                 name: str = "blocking"):
+        self.max_workers = max_workers
+        self.default_timeout = default_timeout
+        self.name = name
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._stats = {"submitted": 0, "completed": 0, "failed": 0, "timed_out": 0, "cancelled": 0}
+        self._running = 0
+
+    def _count(self, key: str, delta: int = 1) -> None:
+        with self._lock:
+            self._stats[key] += delta
+
+    def _wrap(self, func: Callable[[], Any]) -> Callable[[], Any]:
+        def call():
+            with self._lock:
+                self._running += 1
+            try:
+                return func()
+            finally:
+                with self._lock:
+                    self._running -= 1
+        return call
+
+    async def run(self, func: Callable[..., Any], *args: Any,
+                  timeout: Optional[float] = None, **kwargs: Any) -> Any:
+        """Await `func(*args, **kwargs)` executed in the pool"""
+        timeout = self.default_timeout if timeout is None else timeout
+        loop = asyncio.get_running_loop()
+        self._count("submitted")
+        started = time.perf_counter()
+        future = loop.run_in_executor(self._pool, self._wrap(functools.partial(func, *args, **kwargs)))
+        try:
+            if timeout:
+                result = await asyncio.wait_for(future, timeout)
+            else:
+                result = await future
+        except asyncio.TimeoutError:
+            self._count("timed_out")
+            name = getattr(func, "__qualname__", repr(func))
+            raise BlockingCallTimeout(
+                f"{name} did not finish in {timeout}s "
+                f"(waited {time.perf_counter() - started:.1f}s)"
+            ) from None
+        except asyncio.CancelledError:
+            self._count("cancelled")
+            raise
+        except Exception:
+            self._count("failed")
+            raise
+        self._count("completed")
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "name": self.name,
+                "max_workers": self.max_workers,
+                "running": self._running,
+                **self._stats,
+            }
+
+    def shutdown(self, wait: bool = False) -> None:
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+
+_crew_executor: Optional[BlockingExecutor] = None
+
+
+def get_crew_executor() -> BlockingExecutor:
+    """Process-wide executor for CrewAI `Task.execute()` calls (sized from settings)"""
+    global _crew_executor
+    if _crew_executor is None:
+        from src.app.config import settings
+        _crew_executor = BlockingExecutor(
+            max_workers=settings.crew_executor_workers,
+            default_timeout=settings.crew_call_timeout_seconds,
+            name="crew"
+        )
+    return _crew_executor
+
+
+def _task_model(task: Any) -> str:
+    """Model name behind a CrewAI Task's agent (breaker key)"""
+    llm = getattr(getattr(task, "agent", None), "llm", None)
+    name = getattr(llm, "model", None) or getattr(llm, "model_name", None) or "default"
+    return str(name).split("/")[-1]
+
+
+def _task_with_model(task: Any, model: str) -> Any:
+    """Copy of a CrewAI Task whose agent uses another model (shared agents stay untouched)"""
+    from src.app.config import settings
+    from src.app.agents.registry import get_agent_registry
+    llm = get_agent_registry().llm(model, api_key=settings.google_api_key)
+    agent = task.agent.model_copy(update={"llm": llm})
+    return task.model_copy(update={"agent": agent})
+
+
+async def run_task(task: Any, timeout: Optional[float] = None) -> Any:
+    """
+    Execute a CrewAI Task off the event loop, through its model's circuit
+    breaker. While that breaker is open the task runs on the first fallback
+    model whose breaker allows it; with none available CircuitOpenError is
+    raised at once so agents can take their rule-based lane.
+    """
+    from src.app.config import settings
+    from src.app.services.circuit_breaker import CircuitOpenError, get_breaker
+
+    primary = _task_model(task)
+    rejected = None
+    for model in [primary] + [m for m in settings.llm_fallback_models if m != primary]:
+        breaker = get_breaker(f"llm:{model}")
+        if not breaker.allow():
+            rejected = rejected or CircuitOpenError(breaker.name, breaker.retry_after())
+            continue
+        try:
+            target = task if model == primary else _task_with_model(task, model)
+        except Exception:
+            breaker.release()
+            raise
+        try:
+            result = await get_crew_executor().run(target.execute, timeout=timeout)
+        except asyncio.CancelledError:
+            breaker.release()
+            raise
+        except Exception as e:
+            breaker.record_failure(e)
+            raise
+        breaker.record_success()
+        return result
+    raise rejected
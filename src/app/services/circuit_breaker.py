@@ -0,0 +1,188 @@
+"""
+Circuit breakers for external dependencies (LLM models, databases).
+
+When a dependency degrades, every request would otherwise wait for its full
+timeout and retry. A breaker counts consecutive failures per dependency; after
+`failure_threshold` of them it opens and calls fail immediately with
+`CircuitOpenError`, so callers can take their fallback (alternate model,
+rule-based lane, deferred persistence) at once. After `recovery_timeout`
+seconds the breaker goes half-open and lets a limited number of probe calls
+through: a successful probe closes it, a failed one opens it again.
+
+Breakers are keyed by dependency name, e.g. "llm:gemini-2.0-flash-exp" or
+"db:primary", and their state is reported by the health endpoints.
+"""
+import time
+import asyncio
+import functools
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """A call was rejected because the dependency's breaker is open"""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"Circuit '{name}' is open (retry in {retry_after:.0f}s)")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker with half-open probing"""
+
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_timeout: float = 30.0,
+                 half_open_probes: int = 1, clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_probes = half_open_probes
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._stats = {"successes": 0, "failures": 0, "rejected": 0, "opened": 0}
+        self._last_error: Optional[str] = None
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def _maybe_half_open(self) -> None:
+        if self._state == OPEN and self._clock() - self._opened_at >= self.recovery_timeout:
+            self._state = HALF_OPEN
+            self._probes = 0
+
+    def retry_after(self) -> float:
+        with self._lock:
+            if self._state != OPEN:
+                return 0.0
+            return max(self.recovery_timeout - (self._clock() - self._opened_at), 0.0)
+
+    def allow(self) -> bool:
+        """True if a call may proceed now; every allowed call must be recorded"""
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and self._probes < self.half_open_probes:
+                self._probes += 1
+                return True
+            self._stats["rejected"] += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._stats["successes"] += 1
+            self._failures = 0
+            self._probes = 0
+            self._state = CLOSED
+
+    def record_failure(self, error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            self._stats["failures"] += 1
+            self._failures += 1
+            if error is not None:
+                self._last_error = f"{type(error).__name__}: {error}"[:200]
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    self._stats["opened"] += 1
+                self._state = OPEN
+                self._opened_at = self._clock()
+                self._probes = 0
+
+    def release(self) -> None:
+        """Give back an allowed call that neither succeeded nor failed (cancelled)"""
+        with self._lock:
+            if self._state == HALF_OPEN and self._probes:
+                self._probes -= 1
+
+    async def call(self, func: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any) -> Any:
+        """Await `func(*args, **kwargs)` through the breaker"""
+        if not self.allow():
+            raise CircuitOpenError(self.name, self.retry_after())
+        try:
+            result = await func(*args, **kwargs)
+        except asyncio.CancelledError:
+            self.release()
+            raise
+        except Exception as e:
+            self.record_failure(e)
+            raise
+        self.record_success()
+        return result
+
+    def snapshot(self) -> Dict[str, Any]:
+        state = self.state
+        with self._lock:
+            return {
+                "state": state,
+                "consecutive_failures": self._failures,
+                "retry_after_s": round(max(self.recovery_timeout - (self._clock() - self._opened_at), 0.0), 1)
+                if state == OPEN else 0.0,
+                "last_error": self._last_error,
+                **self._stats,
+            }
+
+
+class BreakerRegistry:
+    """One breaker per dependency name, created on first use"""
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0,
+                 half_open_probes: int = 1):
+        self.defaults = {
+            "failure_threshold": failure_threshold,
+            "recovery_timeout": recovery_timeout,
+            "half_open_probes": half_open_probes,
+        }
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> CircuitBreaker:
+        with self._lock:
+            if name not in self._breakers:
+                self._breakers[name] = CircuitBreaker(name, **self.defaults)
+            return self._breakers[name]
+
+    def snapshot(self, prefix: str = "") -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            breakers = [b for name, b in sorted(self._breakers.items()) if name.startswith(prefix)]
+        return {b.name: b.snapshot() for b in breakers}
+
+
+def guarded(name: str) -> Callable:
+    """Decorator running an async function through the named breaker"""
+    def decorate(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            return await get_breaker(name).call(func, *args, **kwargs)
+        return wrapper
+    return decorate
+
+
+_breakers: Optional[BreakerRegistry] = None
+
+
+def get_breaker_registry() -> BreakerRegistry:
+    """Process-wide breaker registry (thresholds from settings)"""
+    global _breakers
+    if _breakers is None:
+        from src.app.config import settings
+        _breakers = BreakerRegistry(
+            failure_threshold=settings.circuit_failure_threshold,
+            recovery_timeout=settings.circuit_recovery_seconds,
+            half_open_probes=settings.circuit_half_open_probes,
+        )
+    return _breakers
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    return get_breaker_registry().get(name)
@@ -0,0 +1,215 @@
+"""
+Deterministic consolidation of agent outputs.
+
+Agents mostly return disjoint fields, or the same entities under the same
+names, so their outputs can be merged without a model: fields only one agent
+produced are taken as-is, equal values collapse, lists of entities are unioned
+by identity (name, id, ...) or, for items without one, by value (amount or
+span offsets), and nested objects are merged recursively. Only fields where
+sources genuinely disagree are reported as conflicts, so the supervisor LLM
+sees just those fragments (or nothing at all). Sources with a negative
+priority only fill gaps: they never raise a conflict.
+"""
+import re
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+# Bookkeeping fields that legitimately differ per agent
+METADATA_KEYS = {"extraction_method", "classification_method"}
+
+# Keys that identify an entity inside a list, in order of preference
+IDENTITY_KEYS = ("id", "name", "entity_name", "slug")
+
+# Keys that identify a value-like item (a financial term) from another source
+VALUE_KEYS = ("amount",)
+
+_NORMALIZE_RE = re.compile(r"[\W_]+")
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == "" or value == [] or value == {}
+
+
+def _normalize(value: Any) -> Any:
+    """Comparison form: case/punctuation-insensitive strings, numbers as floats"""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        compact = value.replace(",", "").replace("$", "").strip()
+        try:
+            return float(compact)
+        except ValueError:
+            return _NORMALIZE_RE.sub(" ", value).strip().casefold()
+    return json.dumps(value, sort_keys=True, default=str)
+
+
+def _identity(item: Any) -> Optional[Tuple[str, Any]]:
+    if isinstance(item, dict):
+        for key in IDENTITY_KEYS:
+            if not _is_empty(item.get(key)):
+                return key, _normalize(item[key])
+    return None
+
+
+def _value_key(item: Any) -> Optional[Tuple[str, Any]]:
+    if isinstance(item, dict):
+        for key in VALUE_KEYS:
+            if not _is_empty(item.get(key)):
+                return key, _normalize(item[key])
+        span = item.get("span")
+        if isinstance(span, dict) and "start" in span and "end" in span:
+            return "span", (span["start"], span["end"])
+    return None
+
+
+@dataclass
+class Conflict:
+    """Two or more sources disagree on one field"""
+    path: str
+    candidates: Dict[str, Any]
+    chosen: str
+    container: Any = field(repr=False, default=None)
+    key: Any = field(repr=False, default=None)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"path": self.path, "candidates": self.candidates, "chosen": self.chosen}
+
+
+@dataclass
+class MergeResult:
+    merged: Dict[str, Any]
+    conflicts: List[Conflict]
+    resolved: int = 0
+
+    def resolve(self, choices: Dict[str, Any]) -> int:
+        """Apply {path: value} decisions (e.g. from the supervisor) to the merged data"""
+        applied = 0
+        for conflict in self.conflicts:
+            if conflict.path in choices:
+                conflict.container[conflict.key] = choices[conflict.path]
+                conflict.chosen = "supervisor"
+                applied += 1
+        self.resolved += applied
+        return applied
+
+
+class MergeEngine:
+    """
+    Merge agent outputs deterministically.
+
+    `priorities` ranks sources (e.g. agent confidence); on a conflict the
+    highest-priority value is kept provisionally until resolved.
+    """
+
+    def merge(self, outputs: Dict[str, Dict[str, Any]],
+              priorities: Optional[Dict[str, float]] = None) -> MergeResult:
+        priorities = priorities or {}
+        order = sorted(outputs, key=lambda s: -priorities.get(s, 0.0))
+        conflicts: List[Conflict] = []
+        merged: Dict[str, Any] = {}
+        owners: Dict[str, str] = {}
+        for source in order:
+            data = {k: v for k, v in (outputs[source] or {}).items() if k not in METADATA_KEYS}
+            self._merge_dict(merged, data, source, "", conflicts, owners, priorities)
+        return MergeResult(merged, conflicts)
+
+    def _merge_dict(self, target: Dict, incoming: Dict, source: str, path: str,
+                    conflicts: List[Conflict], owners: Dict[str, str],
+                    priorities: Dict[str, float]) -> None:
+        for key, value in incoming.items():
+            if _is_empty(value):
+                continue
+            sub_path = f"{path}.{key}" if path else key
+            if _is_empty(target.get(key)):
+                target[key] = json.loads(json.dumps(value, default=str))
+                owners[sub_path] = source
+                continue
+            self._merge_value(target, key, value, source, sub_path, conflicts, owners, priorities)
+
+    def _merge_value(self, container: Any, key: Any, value: Any, source: str, path: str,
+                     conflicts: List[Conflict], owners: Dict[str, str],
+                     priorities: Dict[str, float]) -> None:
+        current = container[key]
+        if isinstance(current, dict) and isinstance(value, dict):
+            self._merge_dict(current, value, source, path, conflicts, owners, priorities)
+        elif isinstance(current, list) and isinstance(value, list):
+            self._merge_list(current, value, source, path, conflicts, owners, priorities)
+        elif _normalize(current) == _normalize(value):
+            return
+        elif self._more_complete(value, current):
+            # Same value, more complete ("Acme" vs "Acme Holdings LLC")
+            container[key] = value
+        elif self._more_complete(current, value):
+            return
+        else:
+            owner = self._owner(owners, path)
+            owner_priority = priorities.get(owner, 0.0)
+            source_priority = priorities.get(source, 0.0)
+            if owner_priority < 0 or source_priority < 0:
+                # A gap-filling source never raises a conflict: the higher priority value stays
+                if source_priority > owner_priority:
+                    container[key] = value
+                    owners[path] = source
+                return
+            existing = next((c for c in conflicts if c.path == path), None)
+            if existing:
+                existing.candidates[source] = value
+            else:
+                conflicts.append(Conflict(path, {owner: current, source: value}, owner, container, key))
+
+    @staticmethod
+    def _more_complete(a: Any, b: Any) -> bool:
+        """True if string a contains all of string b"""
+        na, nb = _normalize(a), _normalize(b)
+        return isinstance(na, str) and isinstance(nb, str) and nb in na
+
+    @staticmethod
+    def _owner(owners: Dict[str, str], path: str) -> str:
+        """Source that first wrote path (or the nearest enclosing field)"""
+        while path:
+            if path in owners:
+                return owners[path]
+            cut = max(path.rfind("."), path.rfind("["))
+            path = path[:cut] if cut > 0 else ""
+        return "unknown"
+
+    def _merge_list(self, current: List, incoming: List, source: str, path: str,
+                    conflicts: List[Conflict], owners: Dict[str, str],
+                    priorities: Dict[str, float]) -> None:
+        by_identity = {}
+        # Items without an identity, by value; each matches at most one incoming
+        # item, so a source's own repeated amounts stay separate
+        by_value: Dict[Tuple[str, Any], List[int]] = {}
+        seen = set()
+        for index, item in enumerate(current):
+            ident = _identity(item)
+            if ident:
+                by_identity[ident] = index
+            else:
+                value_key = _value_key(item)
+                if value_key:
+                    by_value.setdefault(value_key, []).append(index)
+            seen.add(_normalize(item))
+
+        for item in incoming:
+            ident = _identity(item)
+            value_key = None if ident else _value_key(item)
+            if ident and ident in by_identity:
+                index = by_identity[ident]
+                item_path = f"{path}[{ident[0]}={current[index][ident[0]]}]"
+                self._merge_dict(current[index], item, source, item_path, conflicts, owners, priorities)
+            elif value_key and by_value.get(value_key):
+                index = by_value[value_key].pop(0)
+                item_path = f"{path}[{index}]"
+                self._merge_dict(current[index], item, source, item_path, conflicts, owners, priorities)
+            elif _normalize(item) not in seen:
+                current.append(json.loads(json.dumps(item, default=str)))
+                seen.add(_normalize(item))
+                if ident:
+                    by_identity[ident] = len(current) - 1
+                    owners[f"{path}[{ident[0]}={item[ident[0]]}]"] = source
+                else:
+                    owners[f"{path}[{len(current) - 1}]"] = source
@@ -0,0 +1,105 @@
+"""
+Precompiled analysis of conversation turns for the memory agent.
+
+`MemoryAgent` scored importance by running each uncompiled decision,
+document and business pattern over the whole turn, then again over every
+sentence for the summary. `TurnAnalyzer` compiles every pattern once and
+searches the turn with each; only the patterns that matched the turn are
+searched again per sentence, since a pattern absent from the turn cannot
+match one of its sentences. Tags come from the shared keyword matcher and
+document pointers from one precompiled alternation.
+
+Memory ids are content hashes, so the same turn stored twice is one entry.
+"""
+import re
+import hashlib
+from dataclasses import dataclass
+from typing import Dict, List, Pattern, Sequence, Tuple
+
+from .keyword_matcher import TAG_KEYWORDS, KeywordMatcher
+
+# Importance added per matching pattern of each category, and per-sentence
+# summary weight
+IMPORTANCE_WEIGHTS = {"decision": 0.3, "document": 0.2, "business": 0.1}
+SUMMARY_WEIGHTS = {"decision": 2, "document": 1, "business": 1}
+
+SUMMARY_SENTENCES = 10
+SUMMARY_LENGTH = 3
+
+_POINTER_RE = re.compile(
+    r"(?P<doc>document.{0,10}(?:id|ID).{0,10}(?P<doc_id>[a-f0-9\-]{8,}))"
+    r"|(?P<file>[\w\-_]+\.(?:pdf|docx|doc|txt|contract))",
+    re.IGNORECASE,
+)
+
+
+def memory_id(text: str, context: str = "") -> str:
+    """Stable id for a memory: hash of the whitespace/case-normalized content"""
+    normalized = " ".join(f"{context}\n{text}".lower().split())
+    return hashlib.sha256(normalized.encode()).hexdigest()[:32]
+
+
+@dataclass(frozen=True)
+class TurnAnalysis:
+    """Everything the memory agent needs from one turn"""
+    importance: float
+    summary: str
+    tags: List[str]
+    document_pointers: List[str]
+
+
+class TurnAnalyzer:
+    """Scores, summarizes and tags conversation turns with precompiled matchers"""
+
+    def __init__(self, patterns: Dict[str, Sequence[str]]):
+        self._patterns: List[Tuple[str, Pattern]] = [
+            (category, re.compile(pattern))
+            for category, category_patterns in patterns.items()
+            for pattern in category_patterns
+        ]
+        self._tags = KeywordMatcher(TAG_KEYWORDS)
+
+    def analyze(self, text: str) -> TurnAnalysis:
+        lowered = text.lower()
+        # Importance: each pattern counts once per turn
+        matched = [(category, pattern) for category, pattern in self._patterns if pattern.search(lowered)]
+        importance = sum(IMPORTANCE_WEIGHTS.get(category, 0.0) for category, _ in matched)
+        importance += min(len(text) / 500, 0.2)
+
+        return TurnAnalysis(
+            importance=min(importance, 1.0),
+            summary=self._summary(text, matched),
+            tags=self.tags(text),
+            document_pointers=self.pointers(text),
+        )
+
+    def _summary(self, text: str, matched: List[Tuple[str, Pattern]]) -> str:
+        """Top sentences (of the first ten) by the turn's matched patterns they contain"""
+        scored = []
+        for sentence in text.split(".")[:SUMMARY_SENTENCES]:
+            sentence = sentence.strip()
+            if len(sentence) < 10:
+                continue
+            lowered = sentence.lower()
+            score = sum(SUMMARY_WEIGHTS.get(category, 0) for category, pattern in matched
+                        if pattern.search(lowered))
+            if score > 0:
+                scored.append((sentence, score))
+
+        scored.sort(key=lambda item: item[1], reverse=True)
+        top = [sentence for sentence, _ in scored[:SUMMARY_LENGTH]]
+        return ". ".join(top) + "." if top else text[:200] + "..."
+
+    def tags(self, text: str) -> List[str]:
+        scan = self._tags.scan(text)
+        return [tag for tag in TAG_KEYWORDS if scan.any(tag)]
+
+    def pointers(self, text: str) -> List[str]:
+        """Document ids first, then filenames, in order of appearance"""
+        ids, files = [], []
+        for match in _POINTER_RE.finditer(text):
+            if match.group("doc"):
+                ids.append(match.group("doc_id"))
+            else:
+                files.append(f"filename:{match.group('file')}")
+        return ids + files
@@ -0,0 +1,314 @@
+"""
+Date and deadline engine.
+
+Obligation due dates used to come only from LLM output, and `apply_extraction`
+drops any `due_date` that is not `YYYY-MM-DD`. This engine finds, in one
+compiled scan:
+
+- absolute dates ("March 1, 2025", "3/1/2025", "2025-03-01",
+  "the 1st day of March, 2025")
+- relative deadlines ("within thirty (30) days after the Effective Date",
+  "within 10 days of Closing", "5 business days prior to Closing")
+- anchor definitions ("dated as of March 1, 2025 (the "Effective Date")")
+
+and normalizes them to ISO dates, resolving relative deadlines against the
+anchors it found (or ones passed in). Business days skip weekends and the
+given holidays. `extract_dates_batch` runs the engine over whole corpora.
+"""
+import re
+import calendar
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+
+MONTHS = {name.lower(): i for i, name in enumerate(calendar.month_name) if name}
+MONTHS.update({name.lower(): i for i, name in enumerate(calendar.month_abbr) if name})
+MONTHS["sept"] = 9
+
+NUMBER_WORDS = {
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7, "eight": 8,
+    "nine": 9, "ten": 10, "eleven": 11, "twelve": 12, "thirteen": 13, "fourteen": 14,
+    "fifteen": 15, "sixteen": 16, "seventeen": 17, "eighteen": 18, "nineteen": 19,
+    "twenty": 20, "thirty": 30, "forty": 40, "forty-five": 45, "fifty": 50, "sixty": 60,
+    "seventy": 70, "seventy-five": 75, "eighty": 80, "ninety": 90, "one hundred": 100,
+    "one hundred twenty": 120, "one hundred eighty": 180,
+}
+
+_MONTH = r"(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|June?|July?|Aug(?:ust)?|Sept?(?:ember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)\.?"
+_NUMBER = (
+    r"(?:(?P<{p}word>" + "|".join(sorted(map(re.escape, NUMBER_WORDS), key=len, reverse=True)) + r")"
+    r"(?:[ \t]*\((?P<{p}paren>\d+)\))?|(?P<{p}num>\d+))"
+)
+
+_ABSOLUTE = (
+    rf"(?P<mdy>(?P<mdy_month>{_MONTH})[ \t]+(?P<mdy_day>\d{{1,2}})(?:st|nd|rd|th)?,?[ \t]+(?P<mdy_year>\d{{4}}))"
+    rf"|(?P<dmy>(?:the[ \t]+)?(?P<dmy_day>\d{{1,2}})(?:st|nd|rd|th)?[ \t]+day[ \t]+of[ \t]+(?P<dmy_month>{_MONTH}),?[ \t]+(?P<dmy_year>\d{{4}}))"
+    r"|(?P<num_date>\b(?P<nd_month>\d{1,2})/(?P<nd_day>\d{1,2})/(?P<nd_year>\d{4}|\d{2})\b)"
+    r"|(?P<iso>\b(?P<iso_year>\d{4})-(?P<iso_month>\d{2})-(?P<iso_day>\d{2})\b)"
+)
+
+# Anchor spellings that name the same date
+ANCHOR_ALIASES = {
+    "date hereof": "effective date",
+    "effective date of this agreement": "effective date",
+    "closing date": "closing",
+    "close of escrow": "closing",
+}
+
+KNOWN_ANCHORS = sorted(
+    {"effective date", "closing", "opening of escrow", *ANCHOR_ALIASES},
+    key=len, reverse=True,
+)
+
+# Known anchors first (the first alternative that matches wins, so "the
+# Effective Date Buyer shall" stops at "Effective Date"), then other
+# capitalized defined terms, which end at a word ending in "Date"
+_ANCHOR_NAME = (
+    r"(?:the[ \t]+)?(?P<anchor>"
+    + "|".join(re.escape(name).replace(r"\ ", r"[ \t]+") + r"\b" for name in KNOWN_ANCHORS)
+    + r"|(?-i:[A-Z][A-Za-z]*(?:(?<!Date)[ \t]+(?:of[ \t]+)?[A-Z][A-Za-z]*){0,3}))"
+)
+
+_DATE_RE = re.compile(
+    # Anchor definition: <date> (the "Effective Date")
+    rf"(?P<definition>(?:{_ABSOLUTE.replace('?P<', '?P<def_')})[ \t]*\((?:the[ \t]+|hereinafter[ \t]+)?[\"“](?P<def_name>[^\"”]{{2,40}})[\"”]\))"
+    # Relative deadline: [within] N [business|calendar] days|weeks|months after|of|before <anchor>
+    # ("within 10 days of" a date means after it)
+    rf"|(?P<relative>\b(?:(?P<qualifier>within|no[ \t]+later[ \t]+than|not[ \t]+later[ \t]+than|at[ \t]+least|on[ \t]+or[ \t]+before)[ \t]+)?"
+    rf"{_NUMBER.format(p='rel_')}[ \t]+(?:\((?P<rel_paren2>\d+)\)[ \t]+)?(?P<daykind>business|calendar|banking)?[ \t]*"
+    r"(?P<unit>days?|weeks?|months?|years?)[ \t]+(?P<direction>after|following|from|of|before|prior[ \t]+to)[ \t]+"
+    rf"{_ANCHOR_NAME})"
+    rf"|{_ABSOLUTE}",
+    re.IGNORECASE,
+)
+
+_AS_OF_RE = re.compile(
+    rf"\b(?:dated|made|entered[ \t]+into|effective)[ \t]+(?:and[ \t]+entered[ \t]+into[ \t]+)?as[ \t]+of[ \t]+(?P<date>{_MONTH}[ \t]+\d{{1,2}}(?:st|nd|rd|th)?,?[ \t]+\d{{4}}|\d{{1,2}}/\d{{1,2}}/\d{{4}})",
+    re.IGNORECASE,
+)
+
+
+@dataclass(frozen=True)
+class DateMention:
+    """An absolute date or relative deadline found at `start`-`end`"""
+    kind: str                       # "absolute" | "relative" | "definition"
+    text: str
+    start: int
+    end: int
+    date: Optional[date] = None     # absolute/definition date, or resolved deadline
+    amount: Optional[int] = None    # relative: number of units
+    unit: Optional[str] = None      # "day" | "week" | "month" | "year"
+    business: bool = False
+    direction: Optional[str] = None  # "after" | "before"
+    anchor: Optional[str] = None    # normalized anchor name ("effective date")
+
+    @property
+    def iso(self) -> Optional[str]:
+        return self.date.isoformat() if self.date else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {"kind": self.kind, "text": self.text, "start": self.start, "end": self.end,
+                "date": self.iso}
+        if self.kind == "relative":
+            data.update(amount=self.amount, unit=self.unit, business=self.business,
+                        direction=self.direction, anchor=self.anchor)
+        elif self.anchor:
+            data["anchor"] = self.anchor
+        return data
+
+
+@dataclass
+class DateExtraction:
+    """Mentions of one document plus the anchor dates used to resolve them"""
+    mentions: List[DateMention]
+    anchors: Dict[str, date] = field(default_factory=dict)
+
+    @property
+    def deadlines(self) -> List[DateMention]:
+        return [m for m in self.mentions if m.kind == "relative"]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "anchors": {name: d.isoformat() for name, d in self.anchors.items()},
+            "mentions": [m.to_dict() for m in self.mentions],
+        }
+
+
+def normalize_anchor(name: str) -> str:
+    name = " ".join(name.lower().split())
+    return ANCHOR_ALIASES.get(name, name)
+
+
+def _build_date(year: str, month: str, day: str) -> Optional[date]:
+    try:
+        y = int(year)
+        if y < 100:
+            y += 2000
+        m = int(month) if month.isdigit() else MONTHS[month.lower().rstrip(".")]
+        return date(y, m, int(day))
+    except (KeyError, ValueError):
+        return None
+
+
+def _absolute(match: re.Match, prefix: str = "") -> Optional[date]:
+    g = match.group
+    if g(f"{prefix}mdy"):
+        return _build_date(g(f"{prefix}mdy_year"), g(f"{prefix}mdy_month"), g(f"{prefix}mdy_day"))
+    if g(f"{prefix}dmy"):
+        return _build_date(g(f"{prefix}dmy_year"), g(f"{prefix}dmy_month"), g(f"{prefix}dmy_day"))
+    if g(f"{prefix}num_date"):
+        return _build_date(g(f"{prefix}nd_year"), g(f"{prefix}nd_month"), g(f"{prefix}nd_day"))
+    if g(f"{prefix}iso"):
+        return _build_date(g(f"{prefix}iso_year"), g(f"{prefix}iso_month"), g(f"{prefix}iso_day"))
+    return None
+
+
+def _number(match: re.Match) -> Optional[int]:
+    g = match.group
+    for digits in (g("rel_paren"), g("rel_paren2"), g("rel_num")):
+        if digits:
+            return int(digits)
+    word = g("rel_word")
+    return NUMBER_WORDS.get(" ".join(word.lower().split())) if word else None
+
+
+def add_months(start: date, months: int) -> date:
+    """Same day `months` later, clamped to the end of shorter months"""
+    index = start.month - 1 + months
+    year, month = start.year + index // 12, index % 12 + 1
+    return date(year, month, min(start.day, calendar.monthrange(year, month)[1]))
+
+
+def add_business_days(start: date, days: int, holidays: FrozenSet[date] = frozenset()) -> date:
+    """`days` business days after (or, if negative, before) `start`"""
+    step = 1 if days >= 0 else -1
+    current, remaining = start, abs(days)
+    while remaining:
+        current += timedelta(days=step)
+        if current.weekday() < 5 and current not in holidays:
+            remaining -= 1
+    return current
+
+
+def resolve(mention: DateMention, anchors: Dict[str, date],
+            holidays: FrozenSet[date] = frozenset()) -> Optional[date]:
+    """Due date of a relative deadline, if its anchor is known"""
+    base = anchors.get(mention.anchor or "")
+    if base is None or mention.amount is None:
+        return None
+    n = mention.amount if mention.direction == "after" else -mention.amount
+    if mention.unit == "day":
+        return add_business_days(base, n, holidays) if mention.business else base + timedelta(days=n)
+    if mention.unit == "week":
+        return base + timedelta(weeks=n)
+    if mention.unit == "month":
+        return add_months(base, n)
+    return add_months(base, 12 * n)
+
+
+class DateEngine:
+    """Finds, normalizes and resolves dates and deadlines in one scan per document"""
+
+    def __init__(self, holidays: Iterable[date] = ()):
+        self.holidays = frozenset(holidays)
+
+    def scan(self, text: str) -> Iterator[DateMention]:
+        """Mentions in document order (relative deadlines unresolved)"""
+        for match in _DATE_RE.finditer(text):
+            if match.group("definition"):
+                yield DateMention("definition", match.group(0), match.start(), match.end(),
+                                  date=_absolute(match, "def_"),
+                                  anchor=normalize_anchor(match.group("def_name")))
+            elif match.group("relative"):
+                unit = match.group("unit").lower().rstrip("s")
+                direction = match.group("direction").lower()
+                yield DateMention(
+                    "relative", match.group(0), match.start(), match.end(),
+                    amount=_number(match), unit=unit,
+                    business=(match.group("daykind") or "").lower() in ("business", "banking"),
+                    direction="before" if direction.startswith(("before", "prior")) else "after",
+                    anchor=normalize_anchor(match.group("anchor")),
+                )
+            else:
+                parsed = _absolute(match)
+                if parsed:
+                    yield DateMention("absolute", match.group(0), match.start(), match.end(), date=parsed)
+
+    def anchors(self, text: str, mentions: Iterable[DateMention]) -> Dict[str, date]:
+        """Anchor dates defined in the document ("as of" dates are the effective date)"""
+        anchors: Dict[str, date] = {}
+        as_of = _AS_OF_RE.search(text)
+        if as_of:
+            parsed = self.normalize(as_of.group("date"))
+            if parsed:
+                anchors["effective date"] = parsed
+        for mention in mentions:
+            if mention.kind == "definition" and mention.date:
+                anchors.setdefault(mention.anchor, mention.date)
+        return anchors
+
+    def extract(self, text: str, anchors: Optional[Dict[str, Any]] = None) -> DateExtraction:
+        """All mentions with relative deadlines resolved against document and given anchors"""
+        mentions = list(self.scan(text))
+        known = self.anchors(text, mentions)
+        for name, value in (anchors or {}).items():
+            parsed = value if isinstance(value, date) else self.normalize(str(value))
+            if parsed:
+                known[normalize_anchor(name)] = parsed
+        resolved = [
+            DateMention(**{**m.__dict__, "date": resolve(m, known, self.holidays)})
+            if m.kind == "relative" else m
+            for m in mentions
+        ]
+        return DateExtraction(resolved, known)
+
+    def normalize(self, value: str) -> Optional[date]:
+        """The absolute date a string consists of, if any"""
+        match = _DATE_RE.fullmatch(value.strip())
+        return _absolute(match) if match and not match.group("relative") else None
+
+    def due_date(self, value: str, anchors: Optional[Dict[str, date]] = None) -> Optional[str]:
+        """
+        ISO due date for a free-form value such as "March 1, 2025" or "within
+        10 business days after the Effective Date"; None when it cannot be resolved
+        """
+        if not value:
+            return None
+        for mention in self.scan(value):
+            if mention.kind == "relative":
+                resolved = resolve(mention, anchors or {}, self.holidays)
+                if resolved:
+                    return resolved.isoformat()
+            elif mention.date:
+                return mention.date.isoformat()
+        return None
+
+
+_engine: Optional[DateEngine] = None
+
+
+def get_date_engine() -> DateEngine:
+    global _engine
+    if _engine is None:
+        _engine = DateEngine()
+    return _engine
+
+
+def _extract_one(item: Tuple[Any, str]) -> Tuple[Any, Dict[str, Any]]:
+    key, text = item
+    return key, get_date_engine().extract(text).to_dict()
+
+
+def extract_dates_batch(documents: Iterable[Tuple[Any, str]], processes: int = 1,
+                        chunksize: int = 16) -> Iterator[Tuple[Any, Dict[str, Any]]]:
+    """
+    (key, extraction dict) for each (key, text) document, in input order;
+    with `processes` > 1 documents are spread over a process pool
+    """
+    if processes <= 1:
+        for item in documents:
+            yield _extract_one(item)
+        return
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        yield from pool.map(_extract_one, documents, chunksize=chunksize)
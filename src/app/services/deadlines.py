@@ -0,0 +1,75 @@
+"""
+Run named coroutines concurrently, each with its own deadline.
+
+Unlike wrapping `asyncio.gather` in one `asyncio.wait_for`, a slow coroutine
+only loses its own result: finished results are kept, and each straggler is
+cancelled individually when its deadline passes.
+"""
+import asyncio
+import inspect
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+class DeadlineExceeded(asyncio.TimeoutError):
+    """A coroutine was cancelled because its deadline passed"""
+
+    def __init__(self, name: str, seconds: float):
+        super().__init__(f"{name} exceeded its {seconds:g}s deadline")
+        self.name = name
+        self.seconds = seconds
+
+
+async def run_with_deadlines(
+    coros: Dict[str, Awaitable[Any]],
+    deadlines: Dict[str, float],
+    on_result: Optional[Callable[[str, Any], Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Await every coroutine in `coros` with the per-name deadline (seconds).
+
+    Returns name -> result, or the exception it raised, or DeadlineExceeded.
+    `on_result(name, outcome)` is called (and awaited if needed) as each one
+    finishes, so callers can stream partial results.
+    """
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    tasks = {asyncio.ensure_future(coro): name for name, coro in coros.items()}
+    expires = {task: start + deadlines[name] for task, name in tasks.items()}
+    outcomes: Dict[str, Any] = {}
+    pending = set(tasks)
+
+    async def record(name: str, outcome: Any) -> None:
+        outcomes[name] = outcome
+        if on_result is not None:
+            ret = on_result(name, outcome)
+            if inspect.isawaitable(ret):
+                await ret
+
+    try:
+        while pending:
+            now = loop.time()
+            for task in [t for t in pending if expires[t] <= now]:
+                task.cancel()
+                pending.discard(task)
+                name = tasks[task]
+                await record(name, DeadlineExceeded(name, deadlines[name]))
+            if not pending:
+                break
+
+            timeout = min(expires[t] for t in pending) - loop.time()
+            done, pending = await asyncio.wait(
+                pending, timeout=max(timeout, 0), return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                if task.cancelled():
+                    outcome: Any = asyncio.CancelledError()
+                else:
+                    outcome = task.exception() or task.result()
+                await record(tasks[task], outcome)
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    return {name: outcomes[name] for name in coros}
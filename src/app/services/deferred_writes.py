@@ -0,0 +1,93 @@
+"""
+Writes held back while their dependency is unavailable.
+
+When every database breaker is open a document cannot be stored, but
+dropping it loses the analysis. `DeferredWrites` keeps such writes in a
+bounded in-memory queue and flushes them from its own background task: the
+task sleeps until the dependency may accept calls again (its breakers go
+half-open), then retries the writes in order, so the first retry is the
+breaker's half-open probe. The task runs only while writes are waiting and
+is kept by the queue, so it is neither garbage-collected nor leaked.
+"""
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class DeferredQueueFull(RuntimeError):
+    """A write could not be deferred because the queue is at capacity"""
+
+
+class DeferredWrites:
+    """Bounded queue of pending writes with a self-scheduling flush task"""
+
+    def __init__(self, write: Callable[[Any], Awaitable[bool]],
+                 retry_after: Callable[[], float] = lambda: 0.0,
+                 max_items: int = 1000, min_interval: float = 1.0):
+        """
+        `write(item)` stores one item and returns False if the dependency is
+        still unavailable; `retry_after()` is the seconds until it may accept
+        calls again (e.g. the smallest breaker `retry_after`).
+        """
+        self._write = write
+        self._retry_after = retry_after
+        self.max_items = max_items
+        self.min_interval = min_interval
+        self._items: Deque[Any] = deque()
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+        self._stats = {"deferred": 0, "flushed": 0}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def defer(self, item: Any) -> int:
+        """Queue `item` and make sure a flush is scheduled; returns the queue length"""
+        if len(self._items) >= self.max_items:
+            raise DeferredQueueFull(f"{len(self._items)} writes already deferred")
+        self._items.append(item)
+        self._stats["deferred"] += 1
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._flush_loop())
+        return len(self._items)
+
+    async def flush(self) -> int:
+        """Write queued items in order until one is refused; returns the number written"""
+        written = 0
+        async with self._lock:
+            while self._items:
+                try:
+                    stored = await self._write(self._items[0])
+                except Exception as e:
+                    logger.warning(f"Deferred write failed: {e}")
+                    stored = False
+                if not stored:
+                    break
+                self._items.popleft()
+                written += 1
+        self._stats["flushed"] += written
+        if written:
+            logger.info(f"Flushed {written} deferred writes ({len(self._items)} remaining)")
+        return written
+
+    async def _flush_loop(self) -> None:
+        while self._items:
+            await asyncio.sleep(max(self._retry_after(), self.min_interval))
+            await self.flush()
+
+    async def close(self) -> None:
+        """Stop the flush task (queued items stay queued)"""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    def stats(self) -> dict:
+        return {"queued": len(self._items), "flushing": self._task is not None and not self._task.done(),
+                **self._stats}
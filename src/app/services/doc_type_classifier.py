@@ -0,0 +1,308 @@
+"""
+Local document-type classifier used ahead of the LLM identification call.
+
+Hashed word/bigram TF-IDF features with a nearest-centroid linear model,
+trained from the per-slug `_fse.txt` examples plus optional labeled history.
+Scores are turned into calibrated probabilities with a softmax temperature so
+callers can decide when a local answer is good enough to skip the LLM.
+"""
+import os
+import re
+import json
+import math
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_CONFIDENCE_THRESHOLD = 0.6
+DEFAULT_TEMPERATURE = 25.0
+
+_TOKEN_RE = re.compile(r"[a-z0-9]{2,}")
+# Example markers appear both bold (`**INPUT DOCUMENT TEXT:**`) and plain
+_FSE_INPUT_MARKER_RE = re.compile(r"^[ \t]*(?:\*\*)?INPUT DOCUMENT TEXT:(?:\*\*)?", re.M)
+_FSE_OUTPUT_MARKER_RE = re.compile(r"^[ \t]*(?:\*\*)?(?:JSON )?OUTPUT:(?:\*\*)?", re.M)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens (2+ chars)"""
+    return _TOKEN_RE.findall((text or "").lower())
+
+
+def split_fse_examples(few_shot_text: str) -> Tuple[str, List[Tuple[str, str]]]:
+    """
+    Split a `_fse.txt` file into (preamble, [(example_block, input_text), ...]).
+
+    Each block runs from an INPUT DOCUMENT TEXT marker up to the next one; its
+    input text stops at the JSON OUTPUT marker. A file without markers is a
+    single example whose input is the whole file.
+    """
+    text = few_shot_text or ""
+    starts = [m.start() for m in _FSE_INPUT_MARKER_RE.finditer(text)]
+    if not starts:
+        body = text.strip()
+        return "", [(body, body)] if body else []
+
+    examples = []
+    for start, end in zip(starts, starts[1:] + [len(text)]):
+        block = text[start:end].strip()
+        body = _FSE_INPUT_MARKER_RE.sub("", block, count=1)
+        out = _FSE_OUTPUT_MARKER_RE.search(body)
+        input_text = (body[:out.start()] if out else body).strip()
+        if input_text:
+            examples.append((block, input_text))
+    return text[:starts[0]].strip(), examples
+
+
+def split_fse_inputs(few_shot_text: str) -> List[str]:
+    """Return the input document texts from a `_fse.txt` file"""
+    return [input_text for _, input_text in split_fse_examples(few_shot_text)[1]]
+
+
+class HashedTfidfVectorizer:
+    """Sparse hashed n-gram TF-IDF vectors (dict of bucket -> weight, L2-normalized)"""
+
+    def __init__(self, n_features: int = 2 ** 18, ngram_range: Tuple[int, int] = (1, 2)):
+        self.n_features = n_features
+        self.ngram_range = ngram_range
+        self.idf: Dict[int, float] = {}
+        self.default_idf = 1.0
+
+    def _buckets(self, text: str) -> Dict[int, int]:
+        tokens = tokenize(text)
+        counts: Dict[int, int] = {}
+        lo, hi = self.ngram_range
+        for n in range(lo, hi + 1):
+            for i in range(len(tokens) - n + 1):
+                gram = " ".join(tokens[i:i + n]).encode()
+                # crc32 is stable across processes, unlike hash()
+                b = zlib.crc32(gram) % self.n_features
+                counts[b] = counts.get(b, 0) + 1
+        return counts
+
+    def fit(self, docs: Iterable[str]) -> "HashedTfidfVectorizer":
+        df: Dict[int, int] = {}
+        n_docs = 0
+        for doc in docs:
+            n_docs += 1
+            for b in self._buckets(doc):
+                df[b] = df.get(b, 0) + 1
+        # Smoothed idf as in scikit-learn
+        self.idf = {b: math.log((1 + n_docs) / (1 + c)) + 1 for b, c in df.items()}
+        self.default_idf = math.log(1 + n_docs) + 1
+        return self
+
+    def transform(self, text: str) -> Dict[int, float]:
+        vec = {
+            b: (1 + math.log(c)) * self.idf.get(b, self.default_idf)
+            for b, c in self._buckets(text).items()
+        }
+        norm = math.sqrt(sum(v * v for v in vec.values()))
+        if norm:
+            vec = {b: v / norm for b, v in vec.items()}
+        return vec
+
+    @staticmethod
+    def cosine(a: Dict[int, float], b: Dict[int, float]) -> float:
+        if len(a) > len(b):
+            a, b = b, a
+        return sum(v * b.get(k, 0.0) for k, v in a.items())
+
+    def to_dict(self) -> Dict:
+        return {
+            "n_features": self.n_features,
+            "ngram_range": list(self.ngram_range),
+            "idf": {str(k): v for k, v in self.idf.items()},
+            "default_idf": self.default_idf,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "HashedTfidfVectorizer":
+        vec = cls(data["n_features"], tuple(data["ngram_range"]))
+        vec.idf = {int(k): v for k, v in data["idf"].items()}
+        vec.default_idf = data["default_idf"]
+        return vec
+
+
+class DocTypeClassifier:
+    """
+    Nearest-centroid linear classifier over hashed TF-IDF features.
+
+    Each slug is represented by the normalized centroid of its training vectors;
+    the score for a slug is the dot product with that centroid. Scores are kept
+    in an inverted index (bucket -> [(class, weight)]) so prediction only touches
+    features present in the document.
+    """
+
+    def __init__(self, vectorizer: Optional[HashedTfidfVectorizer] = None,
+                 temperature: float = DEFAULT_TEMPERATURE):
+        self.vectorizer = vectorizer or HashedTfidfVectorizer()
+        self.temperature = temperature
+        self.classes: List[str] = []
+        self._index: Dict[int, List[Tuple[int, float]]] = {}
+
+    # Training
+
+    def fit(self, samples: List[Tuple[str, str]]) -> "DocTypeClassifier":
+        """Train from (slug, text) samples"""
+        self.vectorizer.fit(text for _, text in samples)
+
+        centroids: Dict[str, Dict[int, float]] = {}
+        for slug, text in samples:
+            c = centroids.setdefault(slug, {})
+            for b, v in self.vectorizer.transform(text).items():
+                c[b] = c.get(b, 0.0) + v
+
+        self.classes = sorted(centroids)
+        self._index = {}
+        for ci, slug in enumerate(self.classes):
+            c = centroids[slug]
+            norm = math.sqrt(sum(v * v for v in c.values())) or 1.0
+            for b, v in c.items():
+                self._index.setdefault(b, []).append((ci, v / norm))
+        return self
+
+    def calibrate(self, samples: List[Tuple[str, str]],
+                  grid: Iterable[float] = (5, 10, 15, 20, 25, 35, 50, 75, 100)) -> float:
+        """Pick the softmax temperature that minimizes log-loss on held-out samples"""
+        known = [(slug, self._scores(text)) for slug, text in samples if slug in self.classes]
+        if not known:
+            return self.temperature
+
+        best_t, best_loss = self.temperature, float("inf")
+        for t in grid:
+            loss = 0.0
+            for slug, scores in known:
+                probs = self._softmax(scores, t)
+                loss -= math.log(max(probs[self.classes.index(slug)], 1e-12))
+            if loss < best_loss:
+                best_t, best_loss = float(t), loss
+        self.temperature = best_t
+        return best_t
+
+    # Prediction
+
+    def _scores(self, text: str) -> List[float]:
+        scores = [0.0] * len(self.classes)
+        for b, v in self.vectorizer.transform(text).items():
+            for ci, w in self._index.get(b, ()):
+                scores[ci] += v * w
+        return scores
+
+    @staticmethod
+    def _softmax(scores: List[float], temperature: float) -> List[float]:
+        if not scores:
+            return []
+        m = max(scores)
+        exps = [math.exp((s - m) * temperature) for s in scores]
+        total = sum(exps)
+        return [e / total for e in exps]
+
+    def predict(self, text: str, top_k: int = 3) -> List[Tuple[str, float]]:
+        """Return the top-k (slug, probability) pairs, best first"""
+        probs = self._softmax(self._scores(text), self.temperature)
+        ranked = sorted(range(len(probs)), key=probs.__getitem__, reverse=True)[:top_k]
+        return [(self.classes[i], probs[i]) for i in ranked]
+
+    # Persistence
+
+    def save(self, path: str) -> None:
+        data = {
+            "vectorizer": self.vectorizer.to_dict(),
+            "temperature": self.temperature,
+            "classes": self.classes,
+            "index": {str(b): postings for b, postings in self._index.items()},
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+
+    @classmethod
+    def load(cls, path: str) -> "DocTypeClassifier":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        clf = cls(HashedTfidfVectorizer.from_dict(data["vectorizer"]), data["temperature"])
+        clf.classes = data["classes"]
+        clf._index = {int(b): [tuple(p) for p in postings] for b, postings in data["index"].items()}
+        return clf
+
+    # Construction from the document_types tree
+
+    @staticmethod
+    def training_samples(doc_types_dir: str) -> List[Tuple[str, str]]:
+        """(slug, text) samples from each slug's title and few-shot example inputs"""
+        samples = []
+        root = Path(doc_types_dir)
+        for ddir in sorted(p for p in root.iterdir() if p.is_dir() and not p.name.startswith(".")):
+            slug = ddir.name
+            title = slug.replace("-", " ")
+            ss_path = ddir / f"{slug}_ss.json"
+            if ss_path.is_file():
+                try:
+                    spec = json.loads(ss_path.read_text(encoding="utf-8"))
+                    title = f"{title} {spec.get('title', '')} {spec.get('description', '')}"
+                except (json.JSONDecodeError, AttributeError):
+                    pass
+
+            fse_path = ddir / f"{slug}_fse.txt"
+            inputs = []
+            if fse_path.is_file():
+                inputs = split_fse_inputs(fse_path.read_text(encoding="utf-8", errors="ignore"))
+
+            samples.append((slug, title))
+            samples.extend((slug, f"{title}\n{text}") for text in inputs)
+        return samples
+
+    @staticmethod
+    def history_samples(history_path: str) -> List[Tuple[str, str]]:
+        """Labeled history as JSONL lines of {"slug": ..., "text": ...}"""
+        samples = []
+        with open(history_path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                row = json.loads(line)
+                if row.get("slug") and row.get("text"):
+                    samples.append((row["slug"], row["text"]))
+        return samples
+
+    @classmethod
+    def from_document_types(cls, doc_types_dir: str,
+                            history_path: Optional[str] = None) -> "DocTypeClassifier":
+        """
+        Train on the document_types tree plus labeled history.
+
+        When history is available, every fifth history sample is held out to
+        calibrate the softmax temperature.
+        """
+        samples = cls.training_samples(doc_types_dir)
+        held_out: List[Tuple[str, str]] = []
+        if history_path and Path(history_path).is_file():
+            history = cls.history_samples(history_path)
+            held_out = history[::5]
+            samples.extend(s for i, s in enumerate(history) if i % 5)
+
+        clf = cls().fit(samples)
+        if held_out:
+            clf.calibrate(held_out)
+        return clf
+
+
+_default_classifier: Optional[DocTypeClassifier] = None
+
+
+def get_doc_type_classifier() -> DocTypeClassifier:
+    """
+    Process-wide classifier, loaded from DOC_TYPE_CLASSIFIER_MODEL if it exists,
+    otherwise trained from DOC_TYPES_DIR (+ DOC_TYPE_HISTORY) on first use.
+    """
+    global _default_classifier
+    if _default_classifier is None:
+        model_path = os.getenv("DOC_TYPE_CLASSIFIER_MODEL")
+        if model_path and Path(model_path).is_file():
+            _default_classifier = DocTypeClassifier.load(model_path)
+        else:
+            _default_classifier = DocTypeClassifier.from_document_types(
+                os.getenv("DOC_TYPES_DIR", "config/prompts/document_types"),
+                os.getenv("DOC_TYPE_HISTORY")
+            )
+    return _default_classifier
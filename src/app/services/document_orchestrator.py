@@ -3,23 +3,33 @@ Containerized Document Processing Pipeline with CrewAI
 Main orchestrator for document identification and routing
 """
 import os
-import asyncio
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 import uuid
 import json
 from pathlib import Path
 
-from crewai import Agent, Task, Crew, Process
-from langchain_google_genai import ChatGoogleGenerativeAI
+from crewai import Task
 import structlog
 
 from src.app.agents.base import BaseAgent, AgentResult, TaskStatus
 from src.app.agents.extractors import (
     DocumentClassificationAgent,
     PartyExtractionAgent,
-    FinancialAnalysisAgent
+    FinancialAnalysisAgent,
+    FusedExtractionAgent
 )
+from src.app.agents.registry import get_agent_registry
+from src.app.config import settings
+from src.app.services.doc_type_classifier import get_doc_type_classifier
+from src.app.services.pipeline import PipelineRegistry, text_statistics
+from src.app.services.routing_table import DEFAULT_AGENTS, RoutingTable
+from src.app.services.blocking_executor import get_crew_executor, run_task
+from src.app.services.circuit_breaker import CircuitOpenError, get_breaker_registry
+from src.app.services.consolidation import Conflict, MergeEngine
+from src.app.services.deadlines import DeadlineExceeded, run_with_deadlines
+from src.app.services.segmenter import segment_contract
+from src.app.services.fused_extraction import FUSED_AGENTS
 
 logger = structlog.get_logger()
 
@@ -37,39 +47,39 @@ class DocumentIdentificationRouter:
         with open(self.pre_prompt_path, 'r') as f:
             self.pre_prompt = f.read()
         
-        # Load document type mappings
+        # Load document type mappings (and compile the routing table)
+        self.routing_table = RoutingTable()
         self.document_types = self._load_document_types()
         
+        # Local classifier answers confidently-typed documents without an LLM call
+        self.local_classifier = get_doc_type_classifier() if settings.local_classifier_enabled else None
+        
         # Initialize CrewAI agent for document identification
-        self.identifier_agent = Agent(
+        self.identifier_agent = get_agent_registry().crew_agent(
+            'DocumentTypeIdentifier',
+            model="gemini-1.5-pro",
+            api_key=os.getenv("GOOGLE_API_KEY"),
             role='Document Type Identifier',
             goal='Accurately identify document type from 350+ real estate document categories',
             backstory="""You are an expert in real estate documentation with deep knowledge 
             of development, construction, legal, and financial documents. You can identify 
             any document type from title reports to CFD bonds to environmental assessments.""",
             verbose=True,
-            allow_delegation=False,
-            llm=ChatGoogleGenerativeAI(
-                model="gemini-1.5-pro",
-                google_api_key=os.getenv("GOOGLE_API_KEY"),
-                temperature=0.1
-            )
+            allow_delegation=False
         )
         
         # Initialize routing agent
-        self.router_agent = Agent(
+        self.router_agent = get_agent_registry().crew_agent(
+            'DocumentRouter',
+            model="gemini-1.5-flash",
+            api_key=os.getenv("GOOGLE_API_KEY"),
             role='Document Router',
             goal='Route documents to the correct extraction pipeline based on type',
             backstory="""You determine which extraction agents should process each document 
             based on its type. You understand which agents specialize in financial terms, 
             parties, obligations, property details, and complex legal structures.""",
             verbose=True,
-            allow_delegation=True,
-            llm=ChatGoogleGenerativeAI(
-                model="gemini-1.5-flash",
-                google_api_key=os.getenv("GOOGLE_API_KEY"),
-                temperature=0.1
-            )
+            allow_delegation=True
         )
     
     def _load_document_types(self) -> Dict[str, Dict]:
@@ -92,10 +102,10 @@ class DocumentIdentificationRouter:
                 # Convert slug to readable name
                 doc_name = dir_name.replace('-', ' ').title()
                 
-                # Look for specialist schema and other files
-                specialist_schema_files = list(dir_path.glob("*specialist_schema.json"))
-                schema_additions_files = list(dir_path.glob("*schema_additions.json"))
-                few_shot_files = list(dir_path.glob("*few_shot_examples.txt"))
+                # Look for specialist schema (_ss), schema additions (_sa) and few-shot examples (_fse)
+                specialist_schema_files = list(dir_path.glob(f"{dir_name}_ss.json"))
+                schema_additions_files = list(dir_path.glob(f"{dir_name}_sa.json"))
+                few_shot_files = list(dir_path.glob(f"{dir_name}_fse.txt"))
                 
                 # Load the schemas
                 specialist_schema = None
@@ -119,6 +129,9 @@ class DocumentIdentificationRouter:
                     'few_shot_examples': few_shot_examples,
                     'original_name': reverse_mapping.get(dir_name, dir_name)
                 }
+                
+                # Routing is decided here, once, from what the schema asks for
+                self.routing_table.add(dir_name, specialist_schema, schema_additions)
         
         logger.info(f"Loaded {len(document_types)} document type definitions")
         return document_types
@@ -134,15 +147,45 @@ class DocumentIdentificationRouter:
     
     async def identify_document(self, content: str, filename: str) -> Dict[str, Any]:
         """
-        Identify document type using CrewAI agent
+        Identify document type, using the local classifier when it is confident
+        and the CrewAI agent otherwise
         """
         
+        candidates = []
+        if self.local_classifier is not None:
+            candidates = self.local_classifier.predict(
+                f"{filename}\n{content[:5000]}", top_k=settings.local_classifier_top_k
+            )
+            
+            top_slug, top_conf = candidates[0] if candidates else (None, 0.0)
+            if top_conf >= settings.local_classifier_threshold and top_slug in self.document_types:
+                doc_type_info = self._build_doc_type_info(
+                    top_slug,
+                    top_conf,
+                    reasoning=f"Local classifier: {top_slug} ({top_conf:.2f})",
+                    method='local_classifier'
+                )
+                doc_type_info['candidates'] = candidates
+                
+                logger.info(f"Identified document locally as: {doc_type_info['name']} (slug: {top_slug}, Confidence: {top_conf:.2f})")
+                
+                return doc_type_info
+        
+        candidate_hint = ""
+        if candidates:
+            candidate_hint = "Likely candidates from the local classifier:\n" + "\n".join(
+                f"• {self.document_types.get(slug, {}).get('name', slug)} ({slug}): {conf:.2f}"
+                for slug, conf in candidates
+            )
+        
         # Create identification task
         identification_task = Task(
             description=f"""
             Identify the document type from these categories:
             {self._get_document_type_list()}
             
+            {candidate_hint}
+            
             Document filename: {filename}
             Document content (first 2000 chars):
             {content[:2000]}
@@ -158,10 +201,21 @@ class DocumentIdentificationRouter:
         )
         
         # Execute identification
-        result = identification_task.execute()
+        try:
+            result = await run_task(identification_task)
+        except CircuitOpenError as e:
+            # No model available: settle for the local classifier's best guess
+            top_slug, top_conf = candidates[0] if candidates else (None, 0.0)
+            logger.warning(f"Identification falling back to local classifier: {e}")
+            doc_type_info = self._build_doc_type_info(
+                top_slug, top_conf, reasoning=str(e), method='local_classifier_fallback'
+            )
+            doc_type_info['candidates'] = candidates
+            return doc_type_info
         
         # Parse result
         doc_type_info = self._parse_identification_result(result, content)
+        doc_type_info['candidates'] = candidates
         
         logger.info(f"Identified document as: {doc_type_info['name']} (slug: {doc_type_info.get('slug', 'unknown')}, Confidence: {doc_type_info['confidence']})")
         
@@ -197,7 +251,17 @@ class DocumentIdentificationRouter:
         conf_match = re.search(r'confidence:\s*([\d.]+)', result.lower())
         confidence = float(conf_match.group(1)) if conf_match else 0.7
         
-        # Get document info from our registry
+        return self._build_doc_type_info(doc_slug, confidence, reasoning=result, method='llm')
+    
+    def _build_doc_type_info(
+        self,
+        doc_slug: Optional[str],
+        confidence: float,
+        reasoning: str,
+        method: str
+    ) -> Dict[str, Any]:
+        """Build the identification result for a slug from our registry"""
+        
         if doc_slug and doc_slug in self.document_types:
             doc_info = self.document_types[doc_slug]
         else:
@@ -215,14 +279,30 @@ class DocumentIdentificationRouter:
             'specialist_schema': doc_info.get('specialist_schema'),
             'schema_additions': doc_info.get('schema_additions'),
             'few_shot_examples': doc_info.get('few_shot_examples'),
-            'reasoning': result
+            'reasoning': reasoning,
+            'identification_method': method
         }
     
     async def route_document(self, doc_type_info: Dict, content: str) -> Dict[str, List[str]]:
         """
         Route document to appropriate extraction agents based on type
+        
+        Known slugs are routed from the compiled routing table; the LLM router is
+        only consulted for unknown slugs (if llm_routing_for_unknown is set).
         """
         
+        routing = self.routing_table.lookup(doc_type_info.get('slug', 'unknown'))
+        if routing:
+            logger.info(f"Routing document to agents: {routing['agents']} (routing table)")
+            return routing
+        
+        if not settings.llm_routing_for_unknown:
+            return {
+                'agents': list(DEFAULT_AGENTS),
+                'reasoning': 'Unknown document type, default agents',
+                'method': 'default'
+            }
+        
         routing_task = Task(
             description=f"""
             Document type: {doc_type_info['name']} (slug: {doc_type_info.get('slug', 'unknown')})
@@ -244,7 +324,15 @@ class DocumentIdentificationRouter:
             expected_output="List of extraction agents to use for this document type"
         )
         
-        result = routing_task.execute()
+        try:
+            result = await run_task(routing_task)
+        except CircuitOpenError as e:
+            logger.warning(f"Routing with default agents: {e}")
+            return {
+                'agents': list(DEFAULT_AGENTS),
+                'reasoning': f'LLM routing unavailable ({e}), default agents',
+                'method': 'default'
+            }
         
         # Parse routing decision
         routing = self._parse_routing_result(result, doc_type_info)
@@ -296,49 +384,74 @@ class DocumentIdentificationRouter:
             elif doc_slug == 'development-agreement':
                 agents = ['PartyExtractor', 'ObligationExtractor', 'PropertyExtractor']
             else:
-                agents = ['PartyExtractor', 'FinancialAnalyzer']  # Default
+                agents = list(DEFAULT_AGENTS)
         
         return {
             'agents': agents,
-            'reasoning': result
+            'reasoning': result,
+            'method': 'llm'
         }
 
 
+# Used when config/pipelines.json has no "extraction" pipeline
+DEFAULT_EXTRACTION_PIPELINE = [
+    {"name": "text_stats"},
+    {"name": "pre_extract", "optional": True},
+    {"name": "segment", "optional": True},
+    {"name": "identify"},
+    {"name": "route", "depends_on": ["identify"]},
+    {"name": "extract", "depends_on": ["route", "segment"]},
+    {"name": "consolidate", "depends_on": ["extract", "pre_extract"]},
+]
+
+
 class ExtractionOrchestrator:
     """
     Main orchestration crew that coordinates all extraction agents
     """
     
     def __init__(self):
-        self.router = DocumentIdentificationRouter()
+        registry = get_agent_registry()
+        self.router = registry.instance(DocumentIdentificationRouter)
+        self.pipelines = PipelineRegistry.load(settings.pipeline_config_path)
         
-        # Initialize extraction agents
+        # Extraction agents are shared per process via the registry
         self.agents = {
-            'DocumentClassifier': DocumentClassificationAgent(),
-            'PartyExtractor': PartyExtractionAgent(),
-            'FinancialAnalyzer': FinancialAnalysisAgent(),
+            'DocumentClassifier': registry.instance(DocumentClassificationAgent),
+            'PartyExtractor': registry.instance(PartyExtractionAgent),
+            'FinancialAnalyzer': registry.instance(FinancialAnalysisAgent),
             # Add more agents as they're built
         }
+        self.fused_agent = registry.instance(FusedExtractionAgent)
+        
+        self.merge_engine = MergeEngine()
         
-        # Supervisor agent to coordinate results
-        self.supervisor = Agent(
+        # Supervisor agent, consulted only for conflicting fields
+        self.supervisor = get_agent_registry().crew_agent(
+            'ExtractionSupervisor',
+            model="gemini-1.5-pro",
+            api_key=os.getenv("GOOGLE_API_KEY"),
             role='Extraction Supervisor',
             goal='Coordinate extraction results and ensure completeness',
             backstory="""You oversee the extraction process and ensure all agents 
             work together effectively. You resolve conflicts between agent outputs 
             and ensure the final extraction is complete and accurate.""",
             verbose=True,
-            allow_delegation=False,
-            llm=ChatGoogleGenerativeAI(
-                model="gemini-1.5-pro",
-                google_api_key=os.getenv("GOOGLE_API_KEY"),
-                temperature=0.1
-            )
+            allow_delegation=False
         )
     
-    async def process_document(self, content: str, filename: str) -> Dict[str, Any]:
+    async def process_document(
+        self, 
+        content: str, 
+        filename: str,
+        doc_type: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Main processing pipeline
+        
+        Stages and their dependencies come from the "extraction" pipeline in
+        config/pipelines.json (or the per-doc-type override when the caller
+        already knows the document type).
         """
         
         task_id = str(uuid.uuid4())
@@ -346,25 +459,19 @@ class ExtractionOrchestrator:
         
         logger.info(f"Starting document processing: {filename} (Task: {task_id})")
         
-        # Step 1: Identify document type
-        doc_type_info = await self.router.identify_document(content, filename)
-        
-        # Step 2: Route to appropriate agents
-        routing = await self.router.route_document(doc_type_info, content)
-        
-        # Step 3: Execute extraction with selected agents
-        extraction_results = await self._execute_extractions(
-            content, 
-            routing['agents'], 
-            {'task_id': task_id, 'doc_type': doc_type_info}
+        executor = self.pipelines.executor(
+            "extraction", self._stage_functions(), DEFAULT_EXTRACTION_PIPELINE, doc_type
         )
+        run = await executor.run({
+            'content': content,
+            'filename': filename,
+            'task_id': task_id,
+            'doc_type': doc_type
+        })
         
-        # Step 4: Consolidate results with supervisor
-        final_result = await self._consolidate_results(
-            extraction_results, 
-            doc_type_info,
-            content
-        )
+        doc_type_info = run.output('identify')
+        routing = run.output('route') if 'route' in run.results else self._direct_routing()
+        final_result = run.output('consolidate')
         
         # Add metadata
         final_result['metadata'] = {
@@ -373,34 +480,122 @@ class ExtractionOrchestrator:
             'document_type': doc_type_info,
             'routing': routing,
             'processing_time': (datetime.now() - start_time).total_seconds(),
-            'agents_used': routing['agents']
+            'agents_used': routing['agents'],
+            'text_stats': run.output('text_stats') if 'text_stats' in run.results else None,
+            'sections': run.output('segment') if 'segment' in run.results else None,
+            'stage_timings': run.timings()
         }
         
         logger.info(f"Document processing complete: {task_id}")
         
         return final_result
     
+    def _stage_functions(self) -> Dict[str, Any]:
+        """Stage name -> callable(context) available to pipeline configs"""
+        return {
+            'text_stats': lambda ctx: text_statistics(ctx['content']),
+            'pre_extract': self._stage_pre_extract,
+            # Section index shared (cached) with the agents' section excerpts
+            'segment': lambda ctx: segment_contract(ctx['content']).summary(),
+            'identify': self._stage_identify,
+            'route': lambda ctx: self.router.route_document(ctx['identify'], ctx['content']),
+            'extract': self._stage_extract,
+            'consolidate': lambda ctx: self._consolidate_results(
+                ctx['extract'], ctx['identify'], ctx['content'], ctx.get('pre_extract')
+            ),
+        }
+    
+    async def _stage_identify(self, ctx: Dict[str, Any]) -> Dict[str, Any]:
+        """Identify the document type unless the caller supplied it"""
+        if ctx.get('doc_type'):
+            return self.router._build_doc_type_info(
+                ctx['doc_type'], 1.0, "Document type supplied by caller", 'caller'
+            )
+        return await self.router.identify_document(ctx['content'], ctx['filename'])
+    
+    def _stage_pre_extract(self, ctx: Dict[str, Any]) -> Dict[str, Any]:
+        """Rule-based extraction that needs no LLM; runs alongside identification"""
+        content = ctx['content']
+        return {
+            'parties': self.agents['PartyExtractor']._extract_parties_fallback(content),
+            'financial_terms': self.agents['FinancialAnalyzer']._extract_financial_fallback(content),
+            'extraction_method': 'rules'
+        }
+    
+    async def _stage_extract(self, ctx: Dict[str, Any]) -> List[AgentResult]:
+        routing = ctx.get('route') or self._direct_routing()
+        return await self._execute_extractions(
+            ctx['content'],
+            routing['agents'],
+            {'task_id': ctx['task_id'], 'doc_type': ctx['identify']}
+        )
+    
+    def _direct_routing(self) -> Dict[str, Any]:
+        """Routing used by pipelines without a route stage: every registered agent"""
+        return {'agents': list(self.agents), 'reasoning': 'Pipeline without routing stage'}
+    
     async def _execute_extractions(
         self, 
         content: str, 
         agent_names: List[str], 
         context: Dict
     ) -> List[AgentResult]:
-        """Execute extraction with selected agents"""
+        """Execute extraction with selected agents, each under its own deadline"""
+        
+        selected = [name for name in agent_names if name in self.agents]
+        
+        # Fused mode: one call stands in for the classification, party and
+        # financial agents and is fanned back out into their results
+        fused_names = []
+        if settings.extraction_mode == "fused":
+            fused_names = [name for name in selected if name in FUSED_AGENTS]
+            if len(fused_names) < 2:
+                fused_names = []
+        
+        coros = {
+            agent_name: self.agents[agent_name].process(content, context)
+            for agent_name in selected
+            if agent_name not in fused_names
+        }
+        if fused_names:
+            coros[self.fused_agent.agent_name] = self.fused_agent.process(content, context)
+        if not coros:
+            return []
+        
+        deadlines = {
+            name: settings.agent_deadlines.get(name, settings.agent_timeout_seconds)
+            for name in coros
+        }
+        outcomes = await run_with_deadlines(coros, deadlines)
         
+        # Keep whatever finished; stragglers and failures become unsuccessful
+        # results so consolidation works on the partial set
         results = []
-        
-        # Run agents in parallel
-        tasks = []
-        for agent_name in agent_names:
-            if agent_name in self.agents:
-                agent = self.agents[agent_name]
-                task = agent.process(content, context)
-                tasks.append(task)
-        
-        # Wait for all agents to complete
-        if tasks:
-            results = await asyncio.gather(*tasks)
+        for agent_name, outcome in outcomes.items():
+            covers = fused_names if agent_name == self.fused_agent.agent_name else [agent_name]
+            if isinstance(outcome, AgentResult):
+                if agent_name == self.fused_agent.agent_name:
+                    results.extend(self.fused_agent.fan_out(outcome, content, fused_names).values())
+                else:
+                    results.append(outcome)
+                continue
+            timed_out = isinstance(outcome, DeadlineExceeded)
+            logger.error(
+                "Extraction agent did not finish",
+                agent=agent_name,
+                task_id=context.get('task_id'),
+                error=str(outcome)
+            )
+            for name in covers:
+                results.append(AgentResult(
+                    agent_name=name,
+                    task_id=context.get('task_id', ''),
+                    status=TaskStatus.TIMEOUT if timed_out else TaskStatus.FAILED,
+                    confidence=0.0,
+                    data={},
+                    processing_time_ms=int(deadlines[agent_name] * 1000) if timed_out else 0,
+                    error_message=str(outcome)
+                ))
         
         return results
     
@@ -408,100 +603,77 @@ class ExtractionOrchestrator:
         self, 
         extraction_results: List[AgentResult],
         doc_type_info: Dict,
-        content: str
+        content: str,
+        pre_extraction: Optional[Dict] = None
     ) -> Dict[str, Any]:
-        """Consolidate results from multiple agents"""
+        """
+        Consolidate results from multiple agents
+        
+        Outputs are merged deterministically; the supervisor is only asked to
+        decide the fields where agents genuinely disagree.
+        """
         
-        # Prepare data for supervisor
         agent_outputs = {}
+        priorities = {}
         for result in extraction_results:
             if result.is_successful:
                 agent_outputs[result.agent_name] = result.data
+                priorities[result.agent_name] = result.confidence
+        if pre_extraction:
+            # Rule-based output only fills gaps and never outranks an agent
+            agent_outputs['RuleBasedPreExtraction'] = pre_extraction
+            priorities['RuleBasedPreExtraction'] = -1.0
+        
+        merge = self.merge_engine.merge(agent_outputs, priorities)
+        
+        if merge.conflicts:
+            choices = await self._resolve_conflicts(merge.conflicts, doc_type_info)
+            merge.resolve(choices)
+        
+        result = merge.merged
+        result['consolidation'] = {
+            'method': 'supervisor' if merge.resolved else 'deterministic',
+            'sources': list(agent_outputs),
+            'conflicts': [c.to_dict() for c in merge.conflicts]
+        }
+        return result
+    
+    async def _resolve_conflicts(self, conflicts: List[Conflict], doc_type_info: Dict) -> Dict[str, Any]:
+        """Ask the supervisor to pick values for conflicting fields only"""
         
-        # Create consolidation task
+        fragments = {c.path: c.candidates for c in conflicts}
         consolidation_task = Task(
             description=f"""
-            Consolidate extraction results from multiple agents for a {doc_type_info['name']} document.
-            
-            Agent outputs:
-            {json.dumps(agent_outputs, indent=2)}
+            Extraction agents disagree on some fields of a {doc_type_info['name']} document.
             
-            {self.router.pre_prompt}
+            Conflicting fields (field path -> value proposed by each agent):
+            {json.dumps(fragments, indent=2, default=str)}
             
-            Create a unified extraction that includes:
-            1. All parties with complete information
-            2. All financial terms with context
-            3. All dates and deadlines
-            4. Any obligations or conditions
-            5. Property/asset details
-            
-            Resolve any conflicts between agent outputs by preferring:
+            For each field choose the correct value, preferring:
             - More complete information over partial
-            - Higher confidence scores
             - Specific values over generic
             
-            Return as clean JSON matching the document schema.
+            Return a JSON object mapping each field path to the chosen value.
             """,
             agent=self.supervisor,
-            expected_output="Consolidated extraction results as JSON"
+            expected_output="JSON object of field path to chosen value"
         )
         
-        consolidated = consolidation_task.execute()
-        
-        # Parse consolidated result
         try:
+            consolidated = await run_task(consolidation_task)
+            
             # Clean up response
             if '```json' in consolidated:
                 consolidated = consolidated.split('```json')[1].split('```')[0]
             elif '```' in consolidated:
                 consolidated = consolidated.split('```')[1].split('```')[0]
             
-            result = json.loads(consolidated)
-        except json.JSONDecodeError:
-            logger.error("Failed to parse consolidated results")
-            # Fallback to merging agent outputs
-            result = self._merge_agent_outputs(agent_outputs)
-        
-        return result
-    
-    def _merge_agent_outputs(self, agent_outputs: Dict) -> Dict:
-        """Fallback method to merge agent outputs"""
-        
-        merged = {
-            'parties': [],
-            'financial_terms': [],
-            'dates': [],
-            'obligations': [],
-            'property': {},
-            'discovered_entities': []
-        }
-        
-        for agent_name, output in agent_outputs.items():
-            if 'parties' in output:
-                merged['parties'].extend(output['parties'])
-            if 'financial_terms' in output:
-                merged['financial_terms'].extend(output['financial_terms'])
-            # Continue for other fields
-        
-        # Deduplicate
-        merged['parties'] = self._deduplicate_list(merged['parties'])
-        merged['financial_terms'] = self._deduplicate_list(merged['financial_terms'])
-        
-        return merged
-    
-    def _deduplicate_list(self, items: List[Dict]) -> List[Dict]:
-        """Remove duplicate items from list"""
-        seen = set()
-        unique = []
-        
-        for item in items:
-            # Create a hashable representation
-            item_hash = json.dumps(item, sort_keys=True)
-            if item_hash not in seen:
-                seen.add(item_hash)
-                unique.append(item)
-        
-        return unique
+            choices = json.loads(consolidated)
+            return choices if isinstance(choices, dict) else {}
+        except Exception as e:
+            # Keep the highest-priority values chosen by the merge
+            logger.error(f"Failed to resolve consolidation conflicts: {e}")
+            return {}
 
 
 # Containerized service entry point
@@ -531,7 +703,8 @@ if __name__ == "__main__":
         try:
             result = await orchestrator.process_document(
                 request.content, 
-                request.filename
+                request.filename,
+                request.options.get('doc_type')
             )
             return result
         except Exception as e:
@@ -540,7 +713,19 @@ if __name__ == "__main__":
     
     @app.get("/health")
     async def health():
-        return {"status": "healthy", "service": "extraction-orchestrator"}
+        breakers = get_breaker_registry().snapshot()
+        degraded = any(b["state"] != "closed" for b in breakers.values())
+        return {
+            "status": "degraded" if degraded else "healthy",
+            "service": "extraction-orchestrator",
+            "crew_executor": get_crew_executor().stats(),
+            "agent_registry": get_agent_registry().stats(),
+            "circuit_breakers": breakers
+        }
+    
+    @app.on_event("shutdown")
+    async def shutdown():
+        get_crew_executor().shutdown()
     
     @app.get("/document-types")
     async def get_document_types():
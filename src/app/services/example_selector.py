@@ -0,0 +1,106 @@
+"""
+Retrieval-based few-shot example selection.
+
+Each slug's `_fse.txt` is split into individual examples and indexed with the
+same hashed TF-IDF features as the local document-type classifier. For an
+incoming document only the most similar examples that fit a token budget are
+put into the extraction prompt, instead of the whole example file.
+"""
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from src.app.services.doc_type_classifier import HashedTfidfVectorizer, split_fse_examples
+
+DEFAULT_TOP_K = 2
+DEFAULT_TOKEN_BUDGET = 1500
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token)"""
+    return (len(text or "") + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+@dataclass
+class FewShotExample:
+    """One example block from a `_fse.txt` file"""
+    position: int
+    text: str
+    input_text: str
+    tokens: int
+
+
+class ExampleIndex:
+    """Vector index over the examples of a single slug"""
+
+    def __init__(self, few_shot_text: str):
+        self.preamble, blocks = split_fse_examples(few_shot_text)
+        self.examples = [
+            FewShotExample(i, block, input_text, estimate_tokens(block))
+            for i, (block, input_text) in enumerate(blocks)
+        ]
+        self.vectorizer = HashedTfidfVectorizer().fit(e.input_text for e in self.examples)
+        self._vectors = [self.vectorizer.transform(e.input_text) for e in self.examples]
+
+    def rank(self, document_text: Optional[str]) -> List[Tuple[FewShotExample, float]]:
+        """Examples ordered by similarity to the document (file order if no document)"""
+        if not document_text:
+            return [(e, 0.0) for e in self.examples]
+        query = self.vectorizer.transform(document_text)
+        scored = [
+            (e, self.vectorizer.cosine(query, v))
+            for e, v in zip(self.examples, self._vectors)
+        ]
+        # Stable sort keeps file order between equally similar examples
+        return sorted(scored, key=lambda pair: pair[1], reverse=True)
+
+    def select(self, document_text: Optional[str], top_k: int = DEFAULT_TOP_K,
+               token_budget: int = DEFAULT_TOKEN_BUDGET) -> List[Tuple[FewShotExample, float]]:
+        """
+        Greedily take the most similar examples while they fit the token budget.
+
+        An example that would overflow the budget is skipped so a shorter, less
+        similar one can still be used.
+        """
+        budget = token_budget - estimate_tokens(self.preamble)
+        selected = []
+        for example, score in self.rank(document_text):
+            if len(selected) >= top_k:
+                break
+            if example.tokens <= budget:
+                selected.append((example, score))
+                budget -= example.tokens
+        return selected
+
+    def render(self, selected: List[Tuple[FewShotExample, float]]) -> str:
+        """Prompt text for the selected examples, preamble first"""
+        parts = [self.preamble] if self.preamble and selected else []
+        parts.extend(example.text for example, _ in selected)
+        return "\n\n".join(parts)
+
+
+@lru_cache(maxsize=512)
+def get_example_index(few_shot_text: str) -> ExampleIndex:
+    """Index for a `_fse.txt` body, built once per distinct file content"""
+    return ExampleIndex(few_shot_text)
+
+
+def select_few_shot(few_shot_text: str, document_text: Optional[str] = None,
+                    top_k: int = DEFAULT_TOP_K,
+                    token_budget: int = DEFAULT_TOKEN_BUDGET) -> Tuple[str, dict]:
+    """
+    Pick few-shot examples for a document.
+
+    Returns (prompt_text, stats) where stats records how many examples were
+    available and selected, their estimated tokens and similarity scores.
+    """
+    index = get_example_index(few_shot_text)
+    selected = index.select(document_text, top_k, token_budget)
+    text = index.render(selected)
+    return text, {
+        "few_shot_available": len(index.examples),
+        "few_shot_selected": len(selected),
+        "few_shot_tokens": estimate_tokens(text),
+        "few_shot_scores": [round(score, 4) for _, score in selected],
+    }
@@ -4,13 +4,14 @@ Extraction prompt bundle builder
 import os
 import json
 import hashlib
-from typing import Dict, Tuple
+from typing import Dict, Iterable, Optional, Tuple
 from pathlib import Path
 import sys
 
 # Add parent directories to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 from improved_loader import SchemaLoader
+from src.app.services.example_selector import DEFAULT_TOKEN_BUDGET, DEFAULT_TOP_K, select_few_shot
 
 # Pre-prompt for high-quality extraction
 EXTRACTION_PRE_PROMPT = """You are a contract extraction specialist. Your task is to extract structured data from the provided document according to the given JSON schema.
@@ -58,13 +59,31 @@ def normalize_slug(label: str) -> str:
     
     return label
 
-def build_prompt_bundle(slug_or_label: str, base_schema_path: str = None) -> Tuple[str, Dict]:
+def restrict_schema(schema: Dict, properties: Iterable[str]) -> Dict:
+    """Copy of an object schema limited to the given top-level properties"""
+    keep = [p for p in properties if p in schema.get("properties", {})]
+    sub = {k: v for k, v in schema.items() if k not in ("properties", "required")}
+    sub["properties"] = {p: schema["properties"][p] for p in keep}
+    required = [p for p in schema.get("required", []) if p in keep]
+    if required:
+        sub["required"] = required
+    return sub
+
+def build_prompt_bundle(slug_or_label: str, base_schema_path: str = None,
+                        document_text: Optional[str] = None,
+                        max_examples: int = DEFAULT_TOP_K,
+                        example_token_budget: int = DEFAULT_TOKEN_BUDGET,
+                        properties: Optional[Iterable[str]] = None) -> Tuple[str, Dict]:
     """
     Build a complete prompt bundle for extraction
     
     Args:
         slug_or_label: Document type slug or label to normalize
         base_schema_path: Optional path to base schema
+        document_text: Incoming document, used to pick the most similar few-shot examples
+        max_examples: Maximum number of few-shot examples to include
+        example_token_budget: Approximate token budget for the few-shot section
+        properties: Only extract these top-level properties (partial re-extraction)
     
     Returns:
         (prompt_text, metadata_dict)
@@ -85,6 +104,9 @@ def build_prompt_bundle(slug_or_label: str, base_schema_path: str = None) -> Tup
         else:
             raise e
     
+    if properties is not None:
+        schema = restrict_schema(schema, properties)
+    
     # Build the complete prompt
     prompt_parts = [EXTRACTION_PRE_PROMPT]
     
@@ -92,10 +114,13 @@ def build_prompt_bundle(slug_or_label: str, base_schema_path: str = None) -> Tup
     prompt_parts.append("\n# JSON SCHEMA")
     prompt_parts.append(json.dumps(schema, indent=2))
     
-    # Add few-shot examples if available
-    if few_shot_examples:
+    # Add the few-shot examples closest to the document, within budget
+    few_shot_text, few_shot_stats = select_few_shot(
+        few_shot_examples or "", document_text, max_examples, example_token_budget
+    )
+    if few_shot_text:
         prompt_parts.append("\n# FEW-SHOT EXAMPLES")
-        prompt_parts.append(few_shot_examples)
+        prompt_parts.append(few_shot_text)
     
     # Add extraction instructions
     prompt_parts.append("\n# EXTRACTION TASK")
@@ -113,7 +138,8 @@ def build_prompt_bundle(slug_or_label: str, base_schema_path: str = None) -> Tup
         "slug": slug,
         "schema": schema,
         "schema_sha256": schema_hash,
-        "has_few_shot": bool(few_shot_examples),
+        "has_few_shot": bool(few_shot_text),
+        **few_shot_stats,
         "schema_properties_count": len(schema.get("properties", {})),
         **meta  # Include loader metadata
     }
@@ -0,0 +1,218 @@
+"""
+Fused single-call extraction.
+
+The classification, party and financial agents each send an overlapping slice
+of the same document to the model. In fused mode one structured call asks for
+all three aspects against a combined schema, and the answer is split back
+into each agent's usual data shape so validation, consolidation and storage
+see the same `AgentResult`s as in multi-call mode.
+
+Enabled with `settings.extraction_mode = "fused"`; results carry
+`extraction_mode`/`llm_calls` metadata so both modes can be benchmarked.
+"""
+import re
+import json
+from typing import Any, Dict, List, Optional
+
+from .segmenter import segment_contract
+
+FUSED_AGENTS = ("DocumentClassifier", "PartyExtractor", "FinancialAnalyzer")
+
+# Budget for the document text in the fused prompt: roughly what the three
+# separate prompts sent together (2000 + 1500 + 1500 chars)
+DEFAULT_FUSED_BUDGET = 5000
+
+FUSED_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "classification": {
+            "type": "object",
+            "properties": {
+                "document_type": {
+                    "enum": ["contract", "agreement", "nda", "lease", "employment", "invoice",
+                             "legal", "correspondence", "other"]
+                },
+                "sub_type": {"type": "string"},
+                "structure": {"enum": ["formal", "informal", "template", "custom"]},
+                "complexity": {"enum": ["simple", "moderate", "complex", "legal_heavy"]},
+                "confidence": {"type": "number", "minimum": 0, "maximum": 1},
+            },
+            "required": ["document_type", "confidence"],
+        },
+        "parties": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "name": {"type": "string"},
+                    "role": {"type": "string"},
+                    "entity_type": {"type": "string"},
+                    "email": {"type": ["string", "null"]},
+                    "phone": {"type": ["string", "null"]},
+                    "address": {"type": ["string", "null"]},
+                },
+                "required": ["name"],
+            },
+        },
+        "financial_terms": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "amount": {"type": "number"},
+                    "currency": {"type": "string"},
+                    "type": {"type": "string"},
+                    "description": {"type": "string"},
+                },
+                "required": ["amount"],
+            },
+        },
+        "total_contract_value": {"type": ["number", "null"]},
+    },
+    "required": ["classification", "parties", "financial_terms"],
+}
+
+
+def fused_excerpt(content: str, budget: int = DEFAULT_FUSED_BUDGET) -> str:
+    """
+    Document text for the fused prompt: the sections any of the fused agents
+    needs (in document order, labelled with offsets), or the prefix for
+    documents without structure.
+    """
+    index = segment_contract(content)
+    if not index.structured:
+        return content[:budget]
+    pieces, used = [], 0
+    for section in index.sections:
+        if not set(index.routes[section]) & set(FUSED_AGENTS):
+            continue
+        piece = f"[{section.label}]\n{index.section_text(section).strip()}"
+        if used + len(piece) > budget:
+            piece = piece[:max(budget - used, 0)]
+        if piece:
+            pieces.append(piece)
+            used += len(piece) + 2
+        if used >= budget:
+            break
+    return "\n\n".join(pieces) or content[:budget]
+
+
+def build_fused_prompt(content: str, budget: int = DEFAULT_FUSED_BUDGET) -> str:
+    return f"""
+            Analyze this document and return ONE JSON object that matches this JSON schema:
+
+            {json.dumps(FUSED_SCHEMA)}
+
+            - classification: the document type, sub-type, structure, language complexity
+              and your confidence (0.0-1.0)
+            - parties: every party with its full legal name, role (buyer, seller, landlord,
+              tenant, lender, borrower, vendor, signatory, ...), entity type and any contact details
+            - financial_terms: every amount with what it is for (purchase price, deposit,
+              fee, penalty, payment, insurance requirement, ...); amounts as plain numbers
+            - total_contract_value: the main deal value, not insurance limits or deposits
+
+            Document:
+            {fused_excerpt(content, budget)}
+
+            Return ONLY the JSON object.
+            """
+
+
+def parse_fused_response(text: str) -> Dict[str, Any]:
+    """First JSON object in a model response (code fences and trailing commas tolerated)"""
+    cleaned = (text or "").strip()
+    if "```" in cleaned:
+        cleaned = re.sub(r"```(?:json)?", "", cleaned)
+    start, end = cleaned.find("{"), cleaned.rfind("}")
+    if start < 0 or end < start:
+        raise ValueError("No JSON object in fused extraction response")
+    blob = cleaned[start:end + 1]
+    try:
+        data = json.loads(blob)
+    except json.JSONDecodeError:
+        data = json.loads(re.sub(r",\s*([}\]])", r"\1", blob))
+    if not isinstance(data, dict):
+        raise ValueError("Fused extraction response is not a JSON object")
+    return data
+
+
+def _amount(value: Any) -> Optional[float]:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value.replace("$", "").replace(",", "").strip())
+        except ValueError:
+            return None
+    return None
+
+
+def _parties(items: Any) -> List[Dict[str, Any]]:
+    parties = []
+    for item in items if isinstance(items, list) else []:
+        if not isinstance(item, dict) or not item.get("name"):
+            continue
+        entity_type = item.get("entity_type") or ""
+        parties.append({
+            "name": str(item["name"]).strip(),
+            "type": "individual" if entity_type.lower() == "individual" else "company",
+            "role": item.get("role") or "party",
+            "entity_type": entity_type or None,
+            "contact": {k: item[k] for k in ("email", "phone", "address") if item.get(k)},
+        })
+    return parties
+
+
+def _financial_terms(items: Any) -> List[Dict[str, Any]]:
+    terms = []
+    for item in items if isinstance(items, list) else []:
+        if not isinstance(item, dict):
+            continue
+        amount = _amount(item.get("amount"))
+        if amount is None:
+            continue
+        terms.append({
+            "amount": int(amount) if amount.is_integer() else amount,
+            "currency": item.get("currency") or "USD",
+            "type": item.get("type") or "payment",
+            "description": item.get("description") or f"Amount: ${amount:,.2f}",
+        })
+    return terms
+
+
+def split_fused_output(data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Fan a fused response out into each agent's data shape"""
+    classification = data.get("classification") or {}
+    parties = _parties(data.get("parties"))
+    terms = _financial_terms(data.get("financial_terms"))
+    total = _amount(data.get("total_contract_value"))
+    currencies = [t["currency"] for t in terms]
+    confidence = _amount(classification.get("confidence"))
+
+    return {
+        "DocumentClassifier": {
+            "document_type": {
+                "primary": classification.get("document_type") or "other",
+                "secondary": classification.get("sub_type") or "general",
+                "structure": classification.get("structure") or "unknown",
+                "complexity": classification.get("complexity") or "moderate",
+            },
+            "ai_confidence": min(max(confidence, 0.0), 1.0) if confidence is not None else 0.7,
+            "classification_method": "fused",
+        },
+        "PartyExtractor": {
+            "parties": parties,
+            "extraction_method": "fused",
+            "total_parties": len(parties),
+        },
+        "FinancialAnalyzer": {
+            "financial_terms": terms,
+            "total_contract_value": total if total is not None else next(
+                (t["amount"] for t in terms if t["type"] in ("contract_value", "purchase_price")), None
+            ),
+            "currency": max(set(currencies), key=currencies.count) if currencies else "USD",
+            "extraction_method": "fused",
+        },
+    }
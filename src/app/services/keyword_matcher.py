@@ -0,0 +1,153 @@
+"""
+Shared multi-pattern keyword matcher.
+
+Business rules, the rule-based classifier and memory tags each lowercased
+the text and ran one `in` scan per keyword, so their cost grew with every
+keyword added. `KeywordMatcher` compiles every configured keyword set into
+one Aho-Corasick automaton (a DFA over the keywords' characters) and reports
+every hit, with offsets, in a single pass over the text; the pass costs the
+same however many keywords there are.
+
+Matching is case-insensitive substring matching, like the `in` checks it
+replaces ("rent" also hits "rental").
+"""
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Rule-based document types, checked in this order
+DOC_TYPE_KEYWORDS: List[Tuple[str, List[str]]] = [
+    ("contract", ["service agreement", "consulting", "professional services"]),
+    ("nda", ["non-disclosure", "nda"]),
+    ("employment", ["employment", "hire"]),
+    ("lease", ["lease", "rental", "rent"]),
+    ("invoice", ["invoice", "bill"]),
+]
+
+# Memory entry tags
+TAG_KEYWORDS: Dict[str, List[str]] = {
+    "contract": ["contract", "agreement"],
+    "client": ["client", "customer"],
+    "vendor": ["vendor", "supplier"],
+    "financial": ["payment", "financial", "money", "$"],
+    "legal": ["legal", "law", "jurisdiction"],
+    "decision": ["decision", "approved", "rejected"],
+}
+
+
+@dataclass(frozen=True)
+class KeywordHit:
+    """One keyword occurrence; `start`/`end` are char offsets into the text"""
+    keyword: str
+    start: int
+    end: int
+
+
+class KeywordScan:
+    """All hits of one pass, queried by keyword set"""
+
+    def __init__(self, hits: List[KeywordHit], sets: Dict[str, frozenset]):
+        self.hits = hits
+        self._sets = sets
+
+    def hits_for(self, name: str) -> List[KeywordHit]:
+        keywords = self._sets.get(name, frozenset())
+        return [hit for hit in self.hits if hit.keyword in keywords]
+
+    def found(self, name: str) -> List[str]:
+        """Distinct keywords of the set that occur, in order of first occurrence"""
+        return list(dict.fromkeys(hit.keyword for hit in self.hits_for(name)))
+
+    def any(self, name: str) -> bool:
+        keywords = self._sets.get(name, frozenset())
+        return any(hit.keyword in keywords for hit in self.hits)
+
+    def citations(self, name: str, text: str, width: int = 40) -> List[Dict]:
+        """Hits of a set with surrounding text, for rules that cite their evidence"""
+        return [
+            {"keyword": hit.keyword, "start": hit.start, "end": hit.end,
+             "context": text[max(0, hit.start - width):hit.end + width].strip()}
+            for hit in self.hits_for(name)
+        ]
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over named keyword sets"""
+
+    def __init__(self, keyword_sets: Dict[str, Iterable[str]]):
+        self.sets = {name: frozenset(k.lower() for k in keywords if k)
+                     for name, keywords in keyword_sets.items()}
+        keywords = sorted(set().union(*self.sets.values())) if self.sets else []
+
+        # Trie
+        goto: List[Dict[str, int]] = [{}]
+        output: List[List[str]] = [[]]
+        for keyword in keywords:
+            state = 0
+            for ch in keyword:
+                if ch not in goto[state]:
+                    goto.append({})
+                    output.append([])
+                    goto[state][ch] = len(goto) - 1
+                state = goto[state][ch]
+            output[state].append(keyword)
+
+        # Failure links (breadth first), folded into a complete transition table
+        # so scanning never follows failure links
+        fail = [0] * len(goto)
+        self._delta: List[Dict[str, int]] = [dict(goto[0])] + [{} for _ in goto[1:]]
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            output[state] = output[state] + output[fail[state]]
+            self._delta[state] = {**self._delta[fail[state]], **goto[state]}
+            for ch, child in goto[state].items():
+                fail[child] = self._delta[fail[state]].get(ch, 0) if state else 0
+                queue.append(child)
+        self._output = [tuple(out) for out in output]
+
+    def iter_hits(self, text: str) -> Iterator[KeywordHit]:
+        """Every keyword occurrence (overlaps included), ordered by end offset"""
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # Case folding changed the length (rare Unicode); keep offsets exact
+            lowered = "".join(ch.lower()[0] for ch in text)
+        delta, output = self._delta, self._output
+        state = 0
+        for i, ch in enumerate(lowered):
+            state = delta[state].get(ch, 0)
+            if output[state]:
+                for keyword in output[state]:
+                    yield KeywordHit(keyword, i + 1 - len(keyword), i + 1)
+
+    def scan(self, text: str) -> KeywordScan:
+        return KeywordScan(list(self.iter_hits(text)), self.sets)
+
+
+def default_keyword_sets() -> Dict[str, List[str]]:
+    """Every keyword set the agents and rules screen documents with"""
+    from src.app.config import settings
+    sets: Dict[str, List[str]] = {
+        "review": list(settings.review_required_keywords),
+    }
+    sets.update({f"doc_type:{doc_type}": keywords for doc_type, keywords in DOC_TYPE_KEYWORDS})
+    sets.update({f"tag:{tag}": keywords for tag, keywords in TAG_KEYWORDS.items()})
+    return sets
+
+
+_matcher: Optional[KeywordMatcher] = None
+
+
+def get_keyword_matcher() -> KeywordMatcher:
+    """Process-wide matcher over `default_keyword_sets()`"""
+    global _matcher
+    if _matcher is None:
+        _matcher = KeywordMatcher(default_keyword_sets())
+    return _matcher
+
+
+@lru_cache(maxsize=32)
+def scan_keywords(text: str) -> KeywordScan:
+    """Keyword scan of a document (cached, so rules and agents share one pass)"""
+    return get_keyword_matcher().scan(text)
@@ -1,6 +1,5 @@
 """Main orchestration service that coordinates agents with database concurrency handling."""
 
-import asyncio
 import time
 from typing import Dict, Any, List, Optional
 from uuid import uuid4
@@ -10,14 +9,30 @@ from crewai import Crew
 from ..agents.extractors import (
     DocumentClassificationAgent, 
     PartyExtractionAgent, 
-    FinancialAnalysisAgent
+    FinancialAnalysisAgent,
+    FusedExtractionAgent
 )
 from ..agents.base import AgentResult, TaskStatus
+from ..agents.registry import get_agent_registry
 from ..database.cognee_adapter import CogneeAdapter
 from ..config import settings
+from .pipeline import PipelineError, PipelineRegistry, text_statistics
+from .consolidation import MergeEngine
+from .deadlines import DeadlineExceeded, run_with_deadlines
+from .scheduler import classify_priority, document_cost, get_document_scheduler
+from .keyword_matcher import scan_keywords
 
 logger = structlog.get_logger()
 
+# Used when config/pipelines.json has no "analysis" pipeline
+DEFAULT_ANALYSIS_PIPELINE = [
+    {"name": "text_stats"},
+    {"name": "extract"},
+    {"name": "validate", "depends_on": ["extract"]},
+    {"name": "store", "depends_on": ["validate"]},
+    {"name": "compile", "depends_on": ["extract", "validate", "store"]},
+]
+
 
 class DocumentAnalysisOrchestrator:
     """Orchestrates multiple agents for parallel document analysis with database concurrency handling."""
@@ -26,93 +41,129 @@ class DocumentAnalysisOrchestrator:
         self.cognee_adapter = cognee_adapter
         self.logger = structlog.get_logger().bind(component="orchestrator")
         
-        # Initialize agents
-        self.classification_agent = DocumentClassificationAgent()
-        self.party_agent = PartyExtractionAgent()
-        self.financial_agent = FinancialAnalysisAgent()
+        # Agents (and their LLM clients) are shared per process via the registry
+        registry = get_agent_registry()
+        self.classification_agent = registry.instance(DocumentClassificationAgent)
+        self.party_agent = registry.instance(PartyExtractionAgent)
+        self.financial_agent = registry.instance(FinancialAnalysisAgent)
         
         self.agents = [
             self.classification_agent,
             self.party_agent,
             self.financial_agent
         ]
+        self.fused_agent = registry.instance(FusedExtractionAgent)
+        
+        self.pipelines = PipelineRegistry.load(settings.pipeline_config_path)
+        self.scheduler = get_document_scheduler()
     
     async def analyze_document(
         self,
         document_content: str,
         filename: str,
-        priority: str = "normal"
+        priority: str = "normal",
+        tenant: str = "default"
     ) -> Dict[str, Any]:
-        """Orchestrate parallel document analysis with database load balancing."""
+        """
+        Orchestrate parallel document analysis with database load balancing.
+        
+        Documents are admitted through the process-wide priority scheduler:
+        `priority` is one of urgent/high/normal/bulk (normal high-value
+        contracts are raised to "high"), and `tenant` names the source that shares its
+        class fairly with other sources (e.g. a backfill job).
+        """
         
         task_id = str(uuid4())
         start_time = time.time()
+        priority = classify_priority(priority, document_content, settings.high_value_threshold)
         
         self.logger.info(
             "Starting document analysis orchestration",
             task_id=task_id,
             filename=filename,
             content_length=len(document_content),
-            priority=priority
+            priority=priority,
+            tenant=tenant
+        )
+        
+        executor = self.pipelines.executor(
+            "analysis", self._stage_functions(), DEFAULT_ANALYSIS_PIPELINE
         )
         
         try:
-            # Stage 1: Parallel extraction
-            extraction_results = await self._run_parallel_extraction(
-                document_content, filename, task_id
-            )
-            
-            # Stage 2: Validation and confidence assessment
-            validation_result = await self._validate_extraction_results(
-                extraction_results, document_content, task_id
-            )
-            
-            # Stage 3: Database storage with load balancing
-            storage_result = await self._store_results_with_load_balancing(
-                document_content, validation_result, filename
-            )
+            async with self.scheduler.slot(priority, tenant, document_cost(document_content)):
+                queue_wait_ms = int((time.time() - start_time) * 1000)
+                run = await executor.run({
+                    'content': document_content,
+                    'filename': filename,
+                    'task_id': task_id,
+                    'start_time': start_time
+                })
             
-            # Stage 4: Final orchestration result
-            final_result = await self._compile_final_result(
-                extraction_results,
-                validation_result,
-                storage_result,
-                task_id,
-                start_time
-            )
+            final_result = run.output('compile')
+            final_result['processing_summary']['stage_timings'] = run.timings()
+            final_result['processing_summary']['scheduling'] = {
+                'priority': priority,
+                'tenant': tenant,
+                'queue_wait_ms': queue_wait_ms
+            }
+            if 'text_stats' in run.results:
+                final_result['processing_summary']['text_stats'] = run.output('text_stats')
             
             self.logger.info(
                 "Document analysis orchestration completed",
                 task_id=task_id,
                 total_duration_ms=int((time.time() - start_time) * 1000),
                 confidence_score=final_result.get('confidence_score', 0),
-                requires_review=final_result.get('requires_human_review', False)
+                requires_review=final_result.get('requires_human_review', False),
+                stage_timings=run.timings()
             )
             
             return final_result
             
         except Exception as e:
+            stage_timings = e.run.timings() if isinstance(e, PipelineError) else None
             self.logger.error(
                 "Document analysis orchestration failed",
                 task_id=task_id,
                 error=str(e),
-                duration_ms=int((time.time() - start_time) * 1000)
+                duration_ms=int((time.time() - start_time) * 1000),
+                stage_timings=stage_timings
             )
             
             return {
                 'success': False,
                 'task_id': task_id,
                 'error': str(e),
-                'processing_time_ms': int((time.time() - start_time) * 1000)
+                'processing_time_ms': int((time.time() - start_time) * 1000),
+                'stage_timings': stage_timings
             }
     
+    def _stage_functions(self) -> Dict[str, Any]:
+        """Stage name -> callable(context) available to pipeline configs"""
+        return {
+            'text_stats': lambda ctx: text_statistics(ctx['content']),
+            'extract': lambda ctx: self._run_parallel_extraction(
+                ctx['content'], ctx['filename'], ctx['task_id']
+            ),
+            'validate': lambda ctx: self._validate_extraction_results(
+                ctx['extract'], ctx['content'], ctx['task_id']
+            ),
+            'store': lambda ctx: self._store_results_with_load_balancing(
+                ctx['content'], ctx['validate'], ctx['filename']
+            ),
+            'compile': lambda ctx: self._compile_final_result(
+                ctx['extract'], ctx['validate'], ctx['store'], ctx['task_id'], ctx['start_time']
+            ),
+        }
+    
     async def _run_parallel_extraction(
         self,
         content: str,
         filename: str,
         task_id: str
     ) -> Dict[str, AgentResult]:
-        """Run extraction agents in parallel."""
+        """Run extraction agents in parallel, each under its own deadline."""
         
         context = {
             'task_id': task_id,
@@ -120,45 +171,85 @@ class DocumentAnalysisOrchestrator:
             'timestamp': time.time()
         }
         
-        self.logger.info("Starting parallel extraction", task_id=task_id)
+        self.logger.info(
+            "Starting parallel extraction",
+            task_id=task_id,
+            extraction_mode=settings.extraction_mode
+        )
         
-        # Create tasks for each agent
-        tasks = [
-            self.classification_agent.process(content, context),
-            self.party_agent.process(content, context),
-            self.financial_agent.process(content, context)
-        ]
+        if settings.extraction_mode == "fused":
+            fused_results = await self._run_fused_extraction(content, context, task_id)
+            if fused_results:
+                return fused_results
         
-        # Run agents in parallel with timeout
-        try:
-            results = await asyncio.wait_for(
-                asyncio.gather(*tasks, return_exceptions=True),
-                timeout=settings.agent_timeout_seconds
-            )
-            
-            # Process results
-            extraction_results = {}
-            for i, result in enumerate(results):
-                agent_name = self.agents[i].agent_name
-                
-                if isinstance(result, Exception):
-                    self.logger.error(f"Agent {agent_name} failed: {result}")
-                    extraction_results[agent_name] = self._create_failed_result(
-                        agent_name, task_id, str(result)
-                    )
-                else:
-                    extraction_results[agent_name] = result
-            
-            return extraction_results
-            
-        except asyncio.TimeoutError:
-            self.logger.error("Parallel extraction timed out", task_id=task_id)
-            
-            # Return partial results
-            return {
-                agent.agent_name: self._create_timeout_result(agent.agent_name, task_id)
-                for agent in self.agents
-            }
+        # Each agent gets its own deadline; a slow agent is cancelled on its
+        # own while the results of the others are kept
+        coros = {
+            agent.agent_name: agent.process(content, context)
+            for agent in self.agents
+        }
+        deadlines = {
+            name: settings.agent_deadlines.get(name, settings.agent_timeout_seconds)
+            for name in coros
+        }
+        
+        def on_result(agent_name: str, outcome: Any) -> None:
+            if isinstance(outcome, AgentResult):
+                self.logger.info(
+                    "Agent finished",
+                    task_id=task_id,
+                    agent=agent_name,
+                    status=outcome.status.value,
+                    elapsed_ms=int((time.time() - context['timestamp']) * 1000)
+                )
+        
+        outcomes = await run_with_deadlines(coros, deadlines, on_result=on_result)
+        
+        extraction_results = {}
+        for agent_name, outcome in outcomes.items():
+            if isinstance(outcome, DeadlineExceeded):
+                self.logger.error(
+                    "Agent timed out",
+                    task_id=task_id,
+                    agent=agent_name,
+                    deadline_seconds=outcome.seconds
+                )
+                extraction_results[agent_name] = self._create_timeout_result(
+                    agent_name, task_id, outcome.seconds
+                )
+            elif isinstance(outcome, BaseException):
+                self.logger.error(f"Agent {agent_name} failed: {outcome}")
+                extraction_results[agent_name] = self._create_failed_result(
+                    agent_name, task_id, str(outcome)
+                )
+            else:
+                extraction_results[agent_name] = outcome
+        
+        return extraction_results
+    
+    async def _run_fused_extraction(
+        self,
+        content: str,
+        context: Dict[str, Any],
+        task_id: str
+    ) -> Optional[Dict[str, AgentResult]]:
+        """One fused call fanned out per agent; None falls back to multi-call mode."""
+        
+        name = self.fused_agent.agent_name
+        outcome = (await run_with_deadlines(
+            {name: self.fused_agent.process(content, context)},
+            {name: settings.agent_deadlines.get(name, settings.agent_timeout_seconds)}
+        ))[name]
+        
+        if isinstance(outcome, AgentResult) and outcome.is_successful:
+            return self.fused_agent.fan_out(outcome, content)
+        
+        self.logger.warning(
+            "Fused extraction failed, falling back to per-agent calls",
+            task_id=task_id,
+            error=outcome.error_message if isinstance(outcome, AgentResult) else str(outcome)
+        )
+        return None
     
     async def _validate_extraction_results(
         self,
@@ -203,6 +294,10 @@ class DocumentAnalysisOrchestrator:
             'successful_agents': successful_agents,
             'total_agents': len(self.agents),
             'requires_human_review': requires_review,
+            'timed_out_agents': [
+                name for name, result in extraction_results.items()
+                if result.status == TaskStatus.TIMEOUT
+            ],
             'confidence_breakdown': {
                 name: result.confidence for name, result in extraction_results.items()
                 if result.is_successful
@@ -232,9 +327,8 @@ class DocumentAnalysisOrchestrator:
                     requires_review = True
                     break
         
-        # Check for critical keywords
-        content_lower = content.lower()
-        if any(keyword in content_lower for keyword in settings.review_required_keywords):
+        # Check for critical keywords (one shared pass over the document)
+        if scan_keywords(content).any('review'):
             requires_review = True
         
         # Check extraction quality
@@ -266,6 +360,13 @@ class DocumentAnalysisOrchestrator:
         if len(content) > 10000:
             notes.append("Document is very long, may require additional review")
         
+        # Cite where each review keyword first appears
+        cited = set()
+        for hit in scan_keywords(content).hits_for('review'):
+            if hit.keyword not in cited:
+                cited.add(hit.keyword)
+                notes.append(f"Review keyword '{hit.keyword}' at chars {hit.start}-{hit.end}")
+        
         return notes
     
     async def _store_results_with_load_balancing(
@@ -286,26 +387,21 @@ class DocumentAnalysisOrchestrator:
             'orchestration_version': '1.0'
         }
         
-        try:
-            storage_result = await self.cognee_adapter.store_document_async(
-                content=content,
-                metadata=metadata,
-                database_name=database_name
-            )
-            
-            return storage_result
-            
-        except Exception as e:
-            self.logger.error(f"Storage failed, trying fallback database: {e}")
-            
-            # Try with load balancing (no specific database)
-            fallback_result = await self.cognee_adapter.store_document_async(
-                content=content,
-                metadata=metadata,
-                database_name=None  # Let adapter choose
+        # The adapter tries the preferred database first and then the others;
+        # with none available the document is deferred rather than dropped
+        storage_result = await self.cognee_adapter.store_document_async(
+            content=content,
+            metadata=metadata,
+            database_name=database_name
+        )
+        if storage_result.get('deferred'):
+            self.logger.warning(
+                "Document not stored yet, deferred until a database recovers",
+                filename=filename,
+                deferred_count=storage_result.get('deferred_count')
             )
-            
-            return fallback_result
+        
+        return storage_result
     
     def _select_optimal_database(
         self,
@@ -333,12 +429,15 @@ class DocumentAnalysisOrchestrator:
     ) -> Dict[str, Any]:
         """Compile final orchestration result."""
         
-        # Merge extraction data
-        merged_data = {}
-        
-        for agent_name, result in extraction_results.items():
-            if result.is_successful:
-                merged_data.update(result.data)
+        # Merge extraction data (higher-confidence agents win conflicting fields)
+        successful = {
+            name: result for name, result in extraction_results.items() if result.is_successful
+        }
+        merge = MergeEngine().merge(
+            {name: result.data for name, result in successful.items()},
+            {name: result.confidence for name, result in successful.items()}
+        )
+        merged_data = merge.merged
         
         # Add orchestration metadata
         merged_data['processing_metadata'] = {
@@ -351,7 +450,8 @@ class DocumentAnalysisOrchestrator:
             'requires_human_review': validation_result['requires_human_review'],
             'database_used': storage_result.get('database_used'),
             'document_id': storage_result.get('document_id'),
-            'validation_notes': validation_result.get('validation_notes', [])
+            'validation_notes': validation_result.get('validation_notes', []),
+            'merge_conflicts': [c.to_dict() for c in merge.conflicts]
         }
         
         return {
@@ -364,6 +464,7 @@ class DocumentAnalysisOrchestrator:
                 'total_agents': len(extraction_results),
                 'successful_agents': validation_result['successful_agents'],
                 'storage_success': storage_result.get('success', False),
+                'storage_deferred': storage_result.get('deferred', False),
                 'processing_time_ms': int((time.time() - start_time) * 1000)
             }
         }
@@ -382,7 +483,9 @@ class DocumentAnalysisOrchestrator:
             error_message=error
         )
     
-    def _create_timeout_result(self, agent_name: str, task_id: str) -> AgentResult:
+    def _create_timeout_result(
+        self, agent_name: str, task_id: str, timeout_seconds: Optional[float] = None
+    ) -> AgentResult:
         """Create a timeout result for an agent."""
         from ..agents.base import AgentResult, TaskStatus
         
@@ -392,6 +495,6 @@ class DocumentAnalysisOrchestrator:
             status=TaskStatus.TIMEOUT,
             confidence=0.0,
             data={},
-            processing_time_ms=settings.agent_timeout_seconds * 1000,
+            processing_time_ms=int((timeout_seconds or settings.agent_timeout_seconds) * 1000),
             error_message="Agent execution timed out"
         )
\ No newline at end of file
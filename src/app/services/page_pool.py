@@ -0,0 +1,205 @@
+"""
+Process pool for per-page work on multi-page documents.
+
+OCR is CPU-bound and pages are independent, so a scanned document can use
+every core instead of one. `run_pages` maps a worker over pages in a process
+pool sized to the cores this process may use, returns outcomes in page order
+whatever order they finish in, and records how long each page took.
+
+Timeouts: the worker is handed the per-page timeout and is expected to
+enforce it itself (tesseract is killed by pytesseract after `timeout`
+seconds); a worker that raises `TimeoutError` is reported as timed out. As a
+backstop the pool waits at most as long as every page timing out in turn
+would take; pages still unfinished then are reported as timed out and their
+worker processes are abandoned.
+
+`iter_pages` is the streaming form for pages produced on demand (rendered
+one by one): it keeps only a bounded window of pages in flight and yields
+outcomes in page order as they become available, so memory stays flat
+however long the document is. `prefetch` runs the producer in a background
+thread a bounded number of items ahead, overlapping rendering with OCR.
+"""
+import os
+import math
+import time
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# Extra time the backstop allows for process start-up and result transfer
+BACKSTOP_GRACE = 10.0
+
+
+@dataclass
+class PageRun:
+    """Outcome of one page; `result` is None unless `status` is "ok" """
+    page_number: int
+    status: str  # "ok" | "timeout" | "failed"
+    seconds: float
+    result: Any = None
+    error: Optional[str] = None
+
+    def timing(self) -> dict:
+        return {"page": self.page_number, "seconds": round(self.seconds, 3), "status": self.status}
+
+
+def available_cores() -> int:
+    """Cores this process may run on (honours CPU affinity / container limits)"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def default_workers(page_count: int) -> int:
+    return max(1, min(available_cores(), page_count))
+
+
+def _timed(worker: Callable[[Any, Optional[float]], Any], page: Any,
+           timeout: Optional[float]) -> Tuple[Any, float]:
+    """Runs in the worker process, so the timing excludes queueing"""
+    started = time.perf_counter()
+    result = worker(page, timeout)
+    return result, time.perf_counter() - started
+
+
+def _outcome(page_number: int, call: Callable[[], Tuple[Any, float]]) -> PageRun:
+    started = time.perf_counter()
+    try:
+        result, seconds = call()
+    except TimeoutError as e:
+        return PageRun(page_number, "timeout", time.perf_counter() - started, error=str(e) or "timeout")
+    except Exception as e:
+        return PageRun(page_number, "failed", time.perf_counter() - started, error=str(e))
+    return PageRun(page_number, "ok", seconds, result=result)
+
+
+def run_pages(worker: Callable[[Any, Optional[float]], Any], pages: Sequence[Any],
+              max_workers: Optional[int] = None,
+              timeout: Optional[float] = None) -> List[PageRun]:
+    """
+    Run `worker(page, timeout)` for every page and return outcomes in page order
+    (page numbers start at 1). `worker` must be a module-level function so it
+    can be sent to the pool; with one worker the pages run in this process.
+    """
+    if not pages:
+        return []
+    workers = max_workers or default_workers(len(pages))
+    if workers <= 1 or len(pages) == 1:
+        return [_outcome(i + 1, lambda page=page: _timed(worker, page, timeout))
+                for i, page in enumerate(pages)]
+
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        futures = [pool.submit(_timed, worker, page, timeout) for page in pages]
+        backstop = None
+        if timeout:
+            backstop = timeout * math.ceil(len(pages) / workers) + BACKSTOP_GRACE
+        done, _ = wait(futures, timeout=backstop)
+
+        runs = []
+        for i, future in enumerate(futures):
+            if future in done:
+                runs.append(_outcome(i + 1, future.result))
+            else:
+                future.cancel()
+                runs.append(PageRun(i + 1, "timeout", backstop or 0.0,
+                                    error=f"no result within {backstop:.0f}s"))
+        return runs
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_pages(worker: Callable[[Any, Optional[float]], Any], pages: Iterable[Any],
+               max_workers: Optional[int] = None, timeout: Optional[float] = None,
+               window: Optional[int] = None) -> Iterator[PageRun]:
+    """
+    Streaming `run_pages`: pages are drawn from `pages` only as the window
+    (default: twice the workers) frees up, and outcomes are yielded in page order
+    """
+    workers = max_workers or available_cores()
+    if workers <= 1:
+        for i, page in enumerate(pages):
+            yield _outcome(i + 1, lambda page=page: _timed(worker, page, timeout))
+        return
+
+    window = max(window or 2 * workers, workers)
+    # The page at the head of the window waits behind at most a window of others
+    backstop = None
+    if timeout:
+        backstop = timeout * math.ceil(window / workers) + BACKSTOP_GRACE
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        source = iter(pages)
+        in_flight: deque = deque()
+        page_number = 0
+        exhausted = False
+        while True:
+            while not exhausted and len(in_flight) < window:
+                try:
+                    page = next(source)
+                except StopIteration:
+                    exhausted = True
+                    break
+                page_number += 1
+                in_flight.append((page_number, pool.submit(_timed, worker, page, timeout)))
+            if not in_flight:
+                return
+
+            number, future = in_flight.popleft()
+            done, _ = wait([future], timeout=backstop)
+            if future in done:
+                yield _outcome(number, future.result)
+            else:
+                future.cancel()
+                yield PageRun(number, "timeout", backstop, error=f"no result within {backstop:.0f}s")
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+_DONE = object()
+
+
+def prefetch(items: Iterable[Any], size: int = 2) -> Iterator[Any]:
+    """
+    Iterate `items` produced by a background thread at most `size` items ahead;
+    producer errors are raised in the consumer. Closing the iterator stops the
+    producer at its next item.
+    """
+    buffer: queue.Queue = queue.Queue(maxsize=max(1, size))
+    stop = threading.Event()
+
+    def put(item: Any) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for item in items:
+                if not put((item, None)):
+                    return
+        except Exception as e:
+            put((_DONE, e))
+            return
+        put((_DONE, None))
+
+    producer = threading.Thread(target=produce, name="page-prefetch", daemon=True)
+    producer.start()
+    try:
+        while True:
+            item, error = buffer.get()
+            if item is _DONE:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        stop.set()
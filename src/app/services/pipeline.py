@@ -0,0 +1,276 @@
+"""
+Small DAG executor for orchestration pipelines.
+
+A pipeline is a list of stages with dependencies. Each stage is an async (or
+plain) callable that receives the shared run context: the pipeline inputs plus
+the output of every stage that has finished, keyed by stage name. Stages whose
+dependencies are satisfied start immediately, so independent stages run
+concurrently. Stages support timeouts, retries with backoff and a concurrency
+limit shared by all runs of the same executor.
+
+Stage layouts live in config/pipelines.json so different document types can use
+different pipelines without code changes.
+"""
+import json
+import time
+import asyncio
+import inspect
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+STAGE_OPTIONS = ("depends_on", "timeout", "retries", "retry_delay", "concurrency", "optional")
+
+
+@dataclass
+class Stage:
+    """One node of a pipeline"""
+    name: str
+    func: Callable[[Dict[str, Any]], Union[Any, Awaitable[Any]]]
+    depends_on: List[str] = field(default_factory=list)
+    timeout: Optional[float] = None
+    retries: int = 0
+    retry_delay: float = 0.5
+    concurrency: Optional[int] = None
+    optional: bool = False
+
+
+@dataclass
+class StageResult:
+    name: str
+    status: str = "pending"  # succeeded | failed | timeout | cancelled | skipped
+    value: Any = None
+    error: Optional[str] = None
+    attempts: int = 0
+    started_ms: Optional[int] = None
+    duration_ms: Optional[int] = None
+
+
+@dataclass
+class PipelineRun:
+    """Outcome of one pipeline execution"""
+    results: Dict[str, StageResult]
+    duration_ms: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return all(r.status == "succeeded" for r in self.results.values())
+
+    def output(self, name: str) -> Any:
+        return self.results[name].value
+
+    def timings(self) -> Dict[str, Dict[str, Any]]:
+        """Per-stage status, start offset and duration (ms) for metadata/logging"""
+        return {
+            name: {
+                "status": r.status,
+                "started_ms": r.started_ms,
+                "duration_ms": r.duration_ms,
+                "attempts": r.attempts,
+            }
+            for name, r in self.results.items()
+        }
+
+
+class PipelineError(Exception):
+    """A required stage failed; remaining stages were cancelled or skipped"""
+
+    def __init__(self, stage: str, message: str, run: PipelineRun):
+        super().__init__(f"Stage '{stage}' failed: {message}")
+        self.stage = stage
+        self.run = run
+
+
+class PipelineExecutor:
+    """Runs a validated stage graph"""
+
+    def __init__(self, stages: List[Stage]):
+        self.stages = {s.name: s for s in stages}
+        if len(self.stages) != len(stages):
+            raise ValueError("Duplicate stage names in pipeline")
+        self.order = self._topological_order()
+        self._limits: Dict[str, asyncio.Semaphore] = {}
+
+    def _topological_order(self) -> List[str]:
+        for stage in self.stages.values():
+            unknown = [d for d in stage.depends_on if d not in self.stages]
+            if unknown:
+                raise ValueError(f"Stage '{stage.name}' depends on unknown stage(s): {unknown}")
+
+        indegree = {name: len(s.depends_on) for name, s in self.stages.items()}
+        ready = [name for name, n in indegree.items() if n == 0]
+        order = []
+        while ready:
+            name = ready.pop(0)
+            order.append(name)
+            for other in self.stages.values():
+                if name in other.depends_on:
+                    indegree[other.name] -= 1
+                    if indegree[other.name] == 0:
+                        ready.append(other.name)
+        if len(order) != len(self.stages):
+            cyclic = sorted(set(self.stages) - set(order))
+            raise ValueError(f"Pipeline has a dependency cycle among: {cyclic}")
+        return order
+
+    def _limit(self, stage: Stage) -> Optional[asyncio.Semaphore]:
+        if not stage.concurrency:
+            return None
+        if stage.name not in self._limits:
+            self._limits[stage.name] = asyncio.Semaphore(stage.concurrency)
+        return self._limits[stage.name]
+
+    async def _call(self, stage: Stage, context: Dict[str, Any]) -> Any:
+        value = stage.func(context)
+        if inspect.isawaitable(value):
+            value = await value
+        return value
+
+    async def _run_stage(self, stage: Stage, context: Dict[str, Any],
+                         result: StageResult, run_start: float) -> None:
+        limit = self._limit(stage)
+        if limit:
+            await limit.acquire()
+        try:
+            started = time.perf_counter()
+            result.started_ms = int((started - run_start) * 1000)
+            for attempt in range(stage.retries + 1):
+                result.attempts = attempt + 1
+                try:
+                    if stage.timeout:
+                        result.value = await asyncio.wait_for(self._call(stage, context), stage.timeout)
+                    else:
+                        result.value = await self._call(stage, context)
+                    result.status = "succeeded"
+                    result.error = None
+                    return
+                except asyncio.TimeoutError:
+                    result.status = "timeout"
+                    result.error = f"timed out after {stage.timeout}s"
+                except Exception as e:
+                    result.status = "failed"
+                    result.error = str(e) or type(e).__name__
+                if attempt < stage.retries:
+                    await asyncio.sleep(stage.retry_delay * (2 ** attempt))
+        finally:
+            result.duration_ms = int((time.perf_counter() - started) * 1000)
+            if limit:
+                limit.release()
+
+    async def run(self, inputs: Optional[Dict[str, Any]] = None) -> PipelineRun:
+        """
+        Execute the pipeline.
+
+        Raises PipelineError when a non-optional stage fails (after retries); an
+        optional stage that fails leaves None in the context for its dependents.
+        Cancelling the caller cancels every running stage.
+        """
+        context = dict(inputs or {})
+        results = {name: StageResult(name) for name in self.order}
+        run = PipelineRun(results)
+        run_start = time.perf_counter()
+        running: Dict[asyncio.Task, str] = {}
+        finished = set()
+
+        def start_ready() -> None:
+            for name in self.order:
+                stage = self.stages[name]
+                if results[name].status != "pending" or name in running.values():
+                    continue
+                if all(d in finished for d in stage.depends_on):
+                    task = asyncio.ensure_future(self._run_stage(stage, context, results[name], run_start))
+                    running[task] = name
+
+        try:
+            start_ready()
+            while running:
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    name = running.pop(task)
+                    result = results[name]
+                    if task.exception() is not None:
+                        result.status, result.error = "failed", str(task.exception())
+                    if result.status != "succeeded":
+                        if not self.stages[name].optional:
+                            raise PipelineError(name, result.error or result.status, run)
+                        result.value = None
+                    context[name] = result.value
+                    finished.add(name)
+                start_ready()
+        finally:
+            for task, name in running.items():
+                task.cancel()
+                results[name].status = "cancelled"
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+            for result in results.values():
+                if result.status == "pending":
+                    result.status = "skipped"
+            run.duration_ms = int((time.perf_counter() - run_start) * 1000)
+
+        return run
+
+
+class PipelineRegistry:
+    """
+    Pipeline layouts loaded from JSON:
+
+        {
+          "pipelines": {"<name>": {"stages": [{"name": ..., "depends_on": [...], ...}]}},
+          "doc_types": {"<slug>": {"<name>": "<override pipeline name>"}}
+        }
+
+    Stage functions are supplied by the orchestrator; the config only chooses
+    which of them run, their dependencies and limits. Executors are cached so
+    concurrency limits hold across documents.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        self.config = config or {}
+        self._executors: Dict[str, PipelineExecutor] = {}
+
+    @classmethod
+    def load(cls, path: str) -> "PipelineRegistry":
+        if not Path(path).is_file():
+            return cls()
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def resolve(self, pipeline: str, doc_type: Optional[str] = None) -> str:
+        """Pipeline name to use for a document type (falls back to `pipeline`)"""
+        overrides = self.config.get("doc_types", {}).get(doc_type or "", {})
+        return overrides.get(pipeline, pipeline)
+
+    def stage_specs(self, name: str, default: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        spec = self.config.get("pipelines", {}).get(name)
+        return spec["stages"] if spec else default
+
+    def executor(self, pipeline: str, functions: Dict[str, Callable],
+                 default: List[Dict[str, Any]], doc_type: Optional[str] = None) -> PipelineExecutor:
+        name = self.resolve(pipeline, doc_type)
+        if name not in self._executors:
+            self._executors[name] = build_executor(self.stage_specs(name, default), functions)
+        return self._executors[name]
+
+
+def build_executor(specs: List[Dict[str, Any]], functions: Dict[str, Callable]) -> PipelineExecutor:
+    """Create an executor from stage specs, binding each stage name to its function"""
+    stages = []
+    for spec in specs:
+        name = spec["name"]
+        if name not in functions:
+            raise ValueError(f"Unknown pipeline stage '{name}' (available: {sorted(functions)})")
+        options = {k: spec[k] for k in STAGE_OPTIONS if k in spec}
+        stages.append(Stage(name=name, func=functions[name], **options))
+    return PipelineExecutor(stages)
+
+
+def text_statistics(content: str) -> Dict[str, Any]:
+    """Cheap document statistics shared by the orchestration pipelines"""
+    return {
+        "characters": len(content),
+        "words": len(content.split()),
+        "lines": content.count("\n") + 1 if content else 0,
+        # OCR output separates pages with form feeds
+        "pages": content.count("\f") + 1 if content else 0,
+    }
@@ -0,0 +1,118 @@
+"""
+Deterministic agent routing compiled from slug schemas.
+
+Which extraction agents a document needs follows from what its schema asks
+for: a `parties` property needs the PartyExtractor, `purchase_price` or
+`loan_amount` the FinancialAnalyzer, and so on. Routes are compiled once per
+slug from the top-level properties and the properties one level inside them
+(most schemas group their type-specific fields under a `*_details` object),
+so routing a document is a dictionary lookup instead of an LLM call.
+"""
+import re
+from typing import Dict, List, Optional, Set
+
+# Agent -> property-name words, in routing order. A word matches a whole
+# underscore-separated token (plural "s" allowed); words containing "_" match
+# anywhere in the property name.
+AGENT_PROPERTY_RULES = {
+    "PartyExtractor": {
+        "party", "parties", "grantor", "grantee", "lender", "borrower", "landlord", "tenant",
+        "buyer", "seller", "owner", "signatory", "signatories", "attendee", "developer",
+        "contractor", "guarantor",
+    },
+    "FinancialAnalyzer": {
+        "price", "amount", "fee", "rent", "cost", "payment", "deposit", "tax", "interest",
+        "principal", "balance", "consideration", "sum", "retainage", "compensation",
+        "valuation", "penal", "escrow", "budget", "assessment",
+    },
+    "ObligationExtractor": {
+        "obligation", "deadline", "due_date", "covenant", "condition", "requirement", "cure",
+        "termination", "completion", "mitigation", "restriction", "warranty",
+    },
+    "PropertyExtractor": {
+        "property", "apn", "parcel", "address", "premises", "site", "lot", "acre",
+        "legal_description", "easement_area",
+    },
+    "LegalStructureAnalyzer": {
+        "entity_type", "corporate", "governance", "ownership", "capital_contribution",
+        "director", "officer", "llc", "member", "partnership", "profit_loss",
+    },
+}
+
+DEFAULT_AGENTS = ["PartyExtractor", "FinancialAnalyzer"]
+
+
+def schema_property_names(*schemas: Optional[Dict], depth: int = 2) -> Set[str]:
+    """Property names of the given schemas down to `depth` levels (array items included)"""
+    names: Set[str] = set()
+
+    def walk(node: Dict, level: int) -> None:
+        if not isinstance(node, dict) or level > depth:
+            return
+        for name, sub in (node.get("properties") or {}).items():
+            names.add(name)
+            if isinstance(sub, dict):
+                walk(sub, level + 1)
+                walk(sub.get("items") or {}, level + 1)
+
+    for schema in schemas:
+        walk(schema or {}, 1)
+    return names
+
+
+def compile_route(*schemas: Optional[Dict]) -> Dict[str, List[str]]:
+    """
+    Agent -> matched property names for the union of the given schemas
+    (e.g. a slug's `_ss.json` and `_sa.json`). Agents appear in routing order.
+    """
+    names = sorted(schema_property_names(*schemas))
+    route = {}
+    for agent, words in AGENT_PROPERTY_RULES.items():
+        matched = [n for n in names if _matches(n.lower(), words)]
+        if matched:
+            route[agent] = matched
+    return route
+
+
+def agents_for_name(name: str) -> List[str]:
+    """Agents whose property words match a name ("loan_amount", a section heading, ...)"""
+    token_name = "_".join(re.findall(r"[a-z0-9]+", name.lower()))
+    return [agent for agent, words in AGENT_PROPERTY_RULES.items() if _matches(token_name, words)]
+
+
+def _matches(name: str, words: Set[str]) -> bool:
+    for token in name.split("_"):
+        if token in words or (token.endswith("s") and token[:-1] in words):
+            return True
+    return any("_" in w and w in name for w in words)
+
+
+class RoutingTable:
+    """slug -> compiled route, built when the document type registry is loaded"""
+
+    def __init__(self, routes: Optional[Dict[str, Dict[str, List[str]]]] = None):
+        self.routes = routes or {}
+
+    def add(self, slug: str, *schemas: Optional[Dict]) -> None:
+        self.routes[slug] = compile_route(*schemas)
+
+    def __contains__(self, slug: str) -> bool:
+        return slug in self.routes
+
+    def lookup(self, slug: str) -> Optional[Dict]:
+        """Routing decision for a known slug, None if the slug was never compiled"""
+        route = self.routes.get(slug)
+        if route is None:
+            return None
+        agents = list(route) or list(DEFAULT_AGENTS)
+        reasoning = "; ".join(f"{agent}: {', '.join(props[:5])}" for agent, props in route.items())
+        return {
+            "agents": agents,
+            "reasoning": f"Compiled from {slug} schema properties ({reasoning or 'no matches, default agents'})",
+            "method": "routing_table",
+        }
+
+    @classmethod
+    def from_registry(cls, registry: Dict[str, Dict]) -> "RoutingTable":
+        """Load routes stored in registry.json entries ("routes" key)"""
+        return cls({slug: entry["routes"] for slug, entry in registry.items() if "routes" in entry})
@@ -0,0 +1,169 @@
+"""
+Vectorized rule extraction for corpus backfills.
+
+The per-document fallbacks (`FinancialAnalysisAgent._extract_financial_fallback`,
+`PartyExtractionAgent._extract_parties_fallback`) run one document at a time.
+For backfilling thousands of stored documents the same rules are applied to a
+whole chunk at once: `Series.str.extractall` finds every match in every
+document, and labeling, typing, ranking and per-document aggregation are
+column operations instead of Python loops.
+
+Amounts are labeled by the closest preceding phrase in the same sentence
+(the per-document path also looks at phrases that follow an amount).
+"""
+import json
+import hashlib
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from .amount_context import LABEL_PHRASES
+from .rule_engine import DEFAULT_RULES
+
+# Bump when the rules change so earlier backfill rows are re-extracted;
+# RULES_DIGEST pins the rules this version was cut from (checked by the tests)
+RULES_VERSION = "rules-2"
+RULES_DIGEST = "5a1c3ae8a50639a7"
+
+_RULES = dict(DEFAULT_RULES)
+
+
+def rules_digest() -> str:
+    """Fingerprint of the rules and label phrases the backfill extracts with"""
+    source = json.dumps([DEFAULT_RULES, LABEL_PHRASES], sort_keys=True)
+    return hashlib.sha256(source.encode()).hexdigest()[:16]
+
+_PHRASE_CATEGORY = {phrase: category for category, phrases in LABEL_PHRASES.items() for phrase in phrases}
+_PHRASES = "|".join(p.replace(" ", r"\s+") for p in sorted(_PHRASE_CATEGORY, key=len, reverse=True))
+
+# [label, then a gap in the same sentence with no other label or amount] $amount
+AMOUNT_PATTERN = (
+    rf"(?i:(?:\b(?P<label>{_PHRASES})\b(?:(?!\b(?:{_PHRASES})\b)[^$.;\n]){{0,80}}?)?)"
+    + _RULES["amount"]
+)
+COMPANY_PATTERN = f"(?P<name>{_RULES['company']})"
+EMAIL_PATTERN = f"(?P<email>{_RULES['email']})"
+
+# Amount label category -> financial term type, as in FinancialAnalysisAgent
+TERM_TYPES = {"purchase_price": "contract_value"}
+
+MIN_AMOUNT = 100
+MAX_TERMS = 5
+MAX_PARTIES = 3
+NON_PARTIES = ["service agreement", "this agreement", "letter of"]
+
+
+def financial_frame(docs: pd.DataFrame) -> pd.DataFrame:
+    """
+    One row per financial term: document_id, occurrence (match number in the
+    document), amount, label, category, type. `docs` has document_id and content.
+    """
+    matches = docs["content"].fillna("").str.extractall(AMOUNT_PATTERN)
+    if matches.empty:
+        return pd.DataFrame(columns=["document_id", "occurrence", "amount", "label", "category", "type"])
+
+    terms = matches.reset_index(level="match").rename(columns={"match": "occurrence"})
+    terms["document_id"] = docs["document_id"].reindex(terms.index).to_numpy()
+    terms["amount"] = pd.to_numeric(terms["amount_value"].str.replace(",", "", regex=False), errors="coerce")
+    terms["label"] = terms["label"].str.lower().str.replace(r"\s+", " ", regex=True)
+    terms["category"] = terms["label"].map(_PHRASE_CATEGORY)
+    terms = terms[terms["amount"] >= MIN_AMOUNT].reset_index(drop=True)
+
+    # Labeled terms take their category's type; the first unlabeled amount is
+    # the contract value unless the document labels a purchase price
+    by_doc = terms.groupby("document_id", sort=False)
+    has_price = (terms["category"] == "purchase_price").groupby(terms["document_id"]).transform("any")
+    first = by_doc.cumcount() == 0
+    terms["type"] = np.where(
+        terms["category"].notna(),
+        terms["category"].map(TERM_TYPES).fillna(terms["category"]),
+        np.where(first & ~has_price, "contract_value", "payment"),
+    )
+    terms = terms[terms.groupby("document_id", sort=False).cumcount() < MAX_TERMS]
+    return terms[["document_id", "occurrence", "amount", "label", "category", "type"]].reset_index(drop=True)
+
+
+def party_frame(docs: pd.DataFrame) -> pd.DataFrame:
+    """
+    One row per party: document_id, name, type, role, email (company names
+    first, paired with the document's emails in order, like the fallback)
+    """
+    content = docs["content"].fillna("")
+    ids = docs["document_id"]
+
+    companies = content.str.extractall(COMPANY_PATTERN)
+    companies = companies.reset_index(level="match", drop=True)
+    companies["document_id"] = ids.reindex(companies.index).to_numpy()
+    companies["name"] = companies["name"].str.split().str.join(" ")
+    companies = companies.drop_duplicates(["document_id", "name"]).copy()
+    companies["rank"] = companies.groupby("document_id", sort=False).cumcount()
+    companies = companies[companies["rank"] < MAX_PARTIES].copy()
+    companies["type"] = "company"
+    companies["role"] = np.where(companies["rank"] == 0, "client", "vendor")
+
+    emails = content.str.extractall(EMAIL_PATTERN)
+    emails = emails.reset_index(level="match")
+    emails["document_id"] = ids.reindex(emails.index).to_numpy()
+    emails = emails.rename(columns={"match": "rank"})[["document_id", "rank", "email"]]
+    parties = companies.merge(emails, on=["document_id", "rank"], how="left")
+    parties["email"] = parties["email"].astype(object).where(parties["email"].notna(), None)
+
+    # Documents with fewer than two companies get individual signatories
+    person = _RULES["person"]
+    counts = parties.groupby("document_id").size().reindex(ids, fill_value=0).to_numpy()
+    needy = docs[counts < 2]
+    individuals = needy["content"].fillna("").str.extractall(f"(?P<name>{person})")
+    if not individuals.empty:
+        individuals = individuals.reset_index(level="match", drop=True)
+        individuals["document_id"] = needy["document_id"].reindex(individuals.index).to_numpy()
+        individuals = individuals[~individuals["name"].str.lower().isin(NON_PARTIES)]
+        individuals = individuals.drop_duplicates(["document_id", "name"])
+        slots = 2 - individuals["document_id"].map(parties.groupby("document_id").size()).fillna(0)
+        individuals = individuals[individuals.groupby("document_id", sort=False).cumcount() < slots]
+        individuals = individuals.assign(type="individual", role="signatory", email=None)
+        parties = pd.concat([parties, individuals], ignore_index=True)
+
+    return parties[["document_id", "name", "type", "role", "email"]].reset_index(drop=True)
+
+
+def backfill_records(docs: pd.DataFrame) -> List[Dict[str, Any]]:
+    """
+    One analysis row per document with rule-extracted financial terms and
+    parties (documents without matches get empty lists)
+    """
+    terms = financial_frame(docs)
+    parties = party_frame(docs)
+
+    term_lists = {
+        doc_id: group.drop(columns="document_id").replace({np.nan: None}).to_dict("records")
+        for doc_id, group in terms.groupby("document_id", sort=False)
+    }
+    party_lists = {
+        doc_id: [
+            {"name": p["name"], "type": p["type"], "role": p["role"],
+             "contact": {"email": p["email"]} if p["email"] else {}}
+            for p in group.to_dict("records")
+        ]
+        for doc_id, group in parties.groupby("document_id", sort=False)
+    }
+    contract_values = terms[terms["type"] == "contract_value"].groupby("document_id", sort=False)["amount"].first()
+
+    records = []
+    for doc_id in docs["document_id"]:
+        doc_terms = term_lists.get(doc_id, [])
+        doc_parties = party_lists.get(doc_id, [])
+        value = contract_values.get(doc_id)
+        records.append({
+            "document_id": doc_id,
+            "contract_value": None if value is None or pd.isna(value) else float(value),
+            "parties": json.dumps(doc_parties),
+            "extracted_metadata": json.dumps({
+                "rules_version": RULES_VERSION,
+                "financial_terms": doc_terms,
+                "parties": doc_parties,
+                "extraction_method": "rule_backfill",
+            }, default=str),
+            "confidence_score": 0.7 if doc_terms or doc_parties else 0.3,
+        })
+    return records
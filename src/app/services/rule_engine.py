@@ -0,0 +1,149 @@
+"""
+Compiled single-pass rule engine.
+
+The regex fallbacks used to compile their patterns on every call, rescan the
+whole document once per pattern and keep only the matched strings. Here every
+rule (amounts, emails, dates, APNs, company and person names, durations) is
+one named alternative of a single precompiled pattern, so one `finditer` pass
+yields typed `Span`s with char offsets into the original text.
+
+Spans are the zero-cost fast lane (rule-based party and financial extraction)
+and provenance for LLM output: `evidence` finds where in the document an
+extracted value actually appears.
+
+Alternatives are tried in rule order at each position, so earlier rules win
+overlaps: "$1,500,000" is an amount, "Acme Holdings LLC" a company rather than
+a person.
+"""
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+_MONTHS = (
+    r"(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|June?|July?|Aug(?:ust)?|"
+    r"Sep(?:t(?:ember)?)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)\.?"
+)
+
+# (kind, pattern); a group named "<kind>_value" marks the part that is normalized,
+# other "<kind>_<name>" groups are kept in `Span.fields`
+DEFAULT_RULES: List[Tuple[str, str]] = [
+    ("email", r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b"),
+    ("amount", r"\$[ \t]?(?P<amount_value>\d{1,3}(?:,\d{3})+(?:\.\d{2})?|\d+(?:\.\d{2})?)"),
+    ("apn", r"\b(?:APN|A\.P\.N\.|Assessor'?s Parcel (?:No\.|Number))[ \t]*(?:No\.|#)?[ \t:#]*"
+            r"(?P<apn_value>\d{3}-?\d{2,3}-?\d{2,3}(?:-?\d{1,3})?)"),
+    ("date", rf"\b{_MONTHS}[ \t]+\d{{1,2}}(?:st|nd|rd|th)?,?[ \t]+\d{{4}}\b"
+             r"|\b\d{1,2}/\d{1,2}/\d{4}\b|\b\d{4}-\d{2}-\d{2}\b"),
+    ("duration", r"\b\d+[ \t]*(?:business[ \t]+|calendar[ \t]+)?(?:days?|weeks?|months?|years?)\b"),
+    # (?!\w) rather than \b: a boundary never follows "Inc." before a space or the end
+    ("company", r"[A-Z][A-Za-z\s&]+(?:LLC|Inc\.|Corp\.|Corporation|Company|Group|Partners|LLP|LP)(?!\w)"),
+    ("person", r"\b[A-Z][a-z]+ [A-Z][a-z]+(?: [A-Z][a-z]+)?\b"),
+]
+
+
+def _amount(value: str) -> Optional[float]:
+    try:
+        return float(value.replace(",", ""))
+    except ValueError:
+        return None
+
+
+def _apn(value: str) -> str:
+    return re.sub(r"\D", "", value)
+
+
+NORMALIZERS: Dict[str, Callable[[str], Any]] = {
+    "amount": _amount,
+    "apn": _apn,
+    "company": lambda v: " ".join(v.split()),
+    "person": lambda v: " ".join(v.split()),
+}
+
+
+@dataclass(frozen=True)
+class Span:
+    """One rule match; `start`/`end` are char offsets into the scanned text"""
+    kind: str
+    text: str
+    start: int
+    end: int
+    value: Any
+    fields: Dict[str, str] = field(default_factory=dict, compare=False, hash=False)
+
+    def context(self, text: str, width: int = 50) -> str:
+        """The match with `width` characters either side"""
+        return text[max(0, self.start - width):min(len(text), self.end + width)].strip()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"kind": self.kind, "text": self.text, "start": self.start, "end": self.end}
+
+
+class RuleEngine:
+    """All rules compiled into one alternation, scanned in a single pass"""
+
+    def __init__(self, rules: Sequence[Tuple[str, str]] = DEFAULT_RULES,
+                 normalizers: Optional[Dict[str, Callable[[str], Any]]] = None):
+        self.kinds = [kind for kind, _ in rules]
+        self.normalizers = NORMALIZERS if normalizers is None else normalizers
+        self.pattern = re.compile("|".join(f"(?P<{kind}>{pattern})" for kind, pattern in rules))
+        self._fields = {
+            kind: [g for g in self.pattern.groupindex
+                   if g.startswith(f"{kind}_") and g != f"{kind}_value"]
+            for kind in self.kinds
+        }
+
+    def scan(self, text: str, kinds: Optional[Iterable[str]] = None) -> Iterator[Span]:
+        """Spans in document order, optionally only those of `kinds`"""
+        wanted = set(kinds) if kinds is not None else None
+        for match in self.pattern.finditer(text):
+            kind = match.lastgroup
+            if wanted is not None and kind not in wanted:
+                continue
+            raw = match.group(f"{kind}_value") if f"{kind}_value" in self.pattern.groupindex else None
+            raw = raw if raw is not None else match.group(kind)
+            normalize = self.normalizers.get(kind)
+            fields = {g[len(kind) + 1:]: match.group(g) for g in self._fields[kind] if match.group(g)}
+            yield Span(kind, match.group(kind), match.start(kind), match.end(kind),
+                       normalize(raw) if normalize else raw, fields)
+
+    def extract(self, text: str) -> Dict[str, List[Span]]:
+        """Spans grouped by kind (every kind present, possibly empty)"""
+        grouped: Dict[str, List[Span]] = {kind: [] for kind in self.kinds}
+        for span in self.scan(text):
+            grouped[span.kind].append(span)
+        return grouped
+
+
+_engine: Optional[RuleEngine] = None
+
+
+def get_rule_engine() -> RuleEngine:
+    """Process-wide engine with the default rules"""
+    global _engine
+    if _engine is None:
+        _engine = RuleEngine()
+    return _engine
+
+
+@lru_cache(maxsize=32)
+def scan_document(text: str) -> Tuple[Span, ...]:
+    """All spans of a document (cached, so agents sharing a document share one pass)"""
+    return tuple(get_rule_engine().scan(text))
+
+
+def spans_of(text: str, kind: str) -> List[Span]:
+    return [span for span in scan_document(text) if span.kind == kind]
+
+
+def evidence(text: str, kind: str, value: Any) -> Optional[Span]:
+    """First span of `kind` whose normalized value matches an extracted value"""
+    for span in spans_of(text, kind):
+        if kind == "amount":
+            try:
+                if span.value is not None and abs(span.value - float(value)) < 0.005:
+                    return span
+            except (TypeError, ValueError):
+                return None
+        elif isinstance(value, str) and " ".join(value.split()).lower() in str(span.value).lower():
+            return span
+    return None
@@ -0,0 +1,227 @@
+"""
+Priority-aware admission scheduler for document analysis.
+
+Documents are admitted to extraction through a fixed number of slots. Waiting
+documents are ordered by weighted fair queueing (WFQ): every (priority class,
+tenant) pair is its own flow, and each document gets a virtual finish tag of
+`max(virtual_time, flow's last tag) + cost / class weight`. The smallest tag
+goes next, so a heavy class drains faster, tenants within a class share it
+evenly, and a 10k-document backfill in one flow cannot push an urgent deal
+document behind all of its queued work.
+
+On top of that:
+- per-class concurrency caps keep slots free for other classes (a bulk
+  backfill can never occupy every slot);
+- aging within a class: once WFQ has picked a class, a document of that
+  class that has waited longer than `aging_seconds` takes the slot (oldest
+  first) and swaps tags with the document it displaces, so no tenant starves
+  inside its class. Which class goes next is still WFQ's choice alone, so an
+  aged backlog never delays urgent work.
+"""
+import re
+import time
+import asyncio
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class PriorityClass:
+    """Scheduling policy for one priority class"""
+    weight: float
+    max_concurrent: Optional[int] = None  # None: limited only by the scheduler size
+
+
+DEFAULT_CLASSES = {
+    "urgent": PriorityClass(weight=16.0),
+    "high": PriorityClass(weight=8.0),
+    "normal": PriorityClass(weight=4.0, max_concurrent=6),
+    "bulk": PriorityClass(weight=1.0, max_concurrent=4),
+}
+
+
+# Characters of document text that count as one unit of WFQ cost
+COST_UNIT_CHARS = 20000
+
+_AMOUNT_RE = re.compile(
+    r"\$\s?(\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?)\s*(million|billion|mm|bn|m|b)?\b",
+    re.IGNORECASE,
+)
+_SCALE = {"million": 1e6, "mm": 1e6, "m": 1e6, "billion": 1e9, "bn": 1e9, "b": 1e9}
+
+
+def largest_amount(content: str) -> float:
+    """Largest dollar amount written in the text ("$12,500,000", "$12.5 million")"""
+    largest = 0.0
+    for match in _AMOUNT_RE.finditer(content):
+        value = float(match.group(1).replace(",", "")) * _SCALE.get((match.group(2) or "").lower(), 1.0)
+        largest = max(largest, value)
+    return largest
+
+
+def classify_priority(requested: str, content: str, high_value_threshold: float,
+                      classes: Dict[str, "PriorityClass"] = None) -> str:
+    """
+    Priority class for a document: the requested class (unknown names fall
+    back to "normal"), with "normal" raised to "high" when the text mentions an
+    amount above `high_value_threshold`. Other classes are kept as requested:
+    "urgent" and "high" are never lowered, and "bulk" work stays under its cap.
+    """
+    classes = classes or DEFAULT_CLASSES
+    priority = (requested or "normal").lower()
+    if priority not in classes:
+        priority = "normal"
+    if priority == "normal" and largest_amount(content) > high_value_threshold:
+        priority = "high"
+    return priority
+
+
+def document_cost(content: str) -> float:
+    """WFQ cost of a document, proportional to its length (at least 1)"""
+    return max(1.0, len(content) / COST_UNIT_CHARS)
+
+
+@dataclass(order=True)
+class _Ticket:
+    tag: float
+    seq: int
+    priority: str = field(compare=False)
+    tenant: str = field(compare=False)
+    enqueued: float = field(compare=False)
+    granted: "asyncio.Future" = field(compare=False, repr=False)
+
+
+class PriorityScheduler:
+    """Admission control with priority classes, WFQ across tenants and aging"""
+
+    def __init__(self, max_concurrent: int = 8,
+                 classes: Optional[Dict[str, PriorityClass]] = None,
+                 aging_seconds: float = 300.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_concurrent = max_concurrent
+        self.classes = dict(classes or DEFAULT_CLASSES)
+        self.aging_seconds = aging_seconds
+        self._clock = clock
+        self._queue: List[_Ticket] = []
+        self._running: Dict[str, int] = {name: 0 for name in self.classes}
+        self._last_tag: Dict[Tuple[str, str], float] = {}
+        self._virtual_time = 0.0
+        self._seq = 0
+        self._stats = {name: {"admitted": 0, "aged": 0, "wait_ms": 0} for name in self.classes}
+
+    def _ticket(self, priority: str, tenant: str, cost: float) -> _Ticket:
+        if priority not in self.classes:
+            raise ValueError(f"Unknown priority class '{priority}' (expected one of {sorted(self.classes)})")
+        flow = (priority, tenant)
+        start = max(self._virtual_time, self._last_tag.get(flow, 0.0))
+        tag = start + max(cost, 0.0) / self.classes[priority].weight
+        self._last_tag[flow] = tag
+        self._seq += 1
+        return _Ticket(tag, self._seq, priority, tenant, self._clock(),
+                       asyncio.get_running_loop().create_future())
+
+    def _has_room(self, priority: str) -> bool:
+        cap = self.classes[priority].max_concurrent
+        return cap is None or self._running[priority] < cap
+
+    def _next(self) -> Optional[_Ticket]:
+        # A cancelled waiter's future is done before it leaves the queue
+        eligible = [t for t in self._queue if not t.granted.done() and self._has_room(t.priority)]
+        if not eligible:
+            return None
+        best = min(eligible)
+        now = self._clock()
+        aged = [t for t in eligible
+                if t.priority == best.priority and now - t.enqueued >= self.aging_seconds]
+        if not aged:
+            return best
+        ticket = min(aged, key=lambda t: t.seq)
+        if ticket is not best:
+            # The aged ticket is served in best's place; best inherits its tag
+            ticket.tag, best.tag = best.tag, ticket.tag
+            self._stats[ticket.priority]["aged"] += 1
+        return ticket
+
+    def _dispatch(self) -> None:
+        while sum(self._running.values()) < self.max_concurrent:
+            ticket = self._next()
+            if ticket is None:
+                return
+            self._queue.remove(ticket)
+            self._virtual_time = max(self._virtual_time, ticket.tag)
+            self._running[ticket.priority] += 1
+            stats = self._stats[ticket.priority]
+            stats["admitted"] += 1
+            stats["wait_ms"] += int((self._clock() - ticket.enqueued) * 1000)
+            ticket.granted.set_result(None)
+
+    def _release(self, priority: str) -> None:
+        self._running[priority] -= 1
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, priority: str = "normal", tenant: str = "default",
+                   cost: float = 1.0) -> AsyncIterator[None]:
+        """Hold one extraction slot for the duration of the block"""
+        ticket = self._ticket(priority, tenant, cost)
+        self._queue.append(ticket)
+        self._dispatch()
+        try:
+            await ticket.granted
+        except asyncio.CancelledError:
+            if ticket in self._queue:
+                self._queue.remove(ticket)
+            elif ticket.granted.done() and not ticket.granted.cancelled():
+                # Granted just as we were cancelled: hand the slot back
+                self._release(priority)
+            raise
+        try:
+            yield
+        finally:
+            self._release(priority)
+
+    async def run(self, func: Callable[[], Awaitable[Any]], priority: str = "normal",
+                  tenant: str = "default", cost: float = 1.0) -> Any:
+        """Await `func()` once a slot for its class is granted"""
+        async with self.slot(priority, tenant, cost):
+            return await func()
+
+    def stats(self) -> Dict[str, Any]:
+        queued: Dict[str, int] = {name: 0 for name in self.classes}
+        for ticket in self._queue:
+            queued[ticket.priority] += 1
+        return {
+            "max_concurrent": self.max_concurrent,
+            "running": dict(self._running),
+            "queued": queued,
+            "classes": {
+                name: {
+                    "weight": policy.weight,
+                    "max_concurrent": policy.max_concurrent,
+                    **self._stats[name],
+                }
+                for name, policy in self.classes.items()
+            },
+        }
+
+
+_document_scheduler: Optional[PriorityScheduler] = None
+
+
+def get_document_scheduler() -> PriorityScheduler:
+    """Process-wide scheduler for document analysis (sized from settings)"""
+    global _document_scheduler
+    if _document_scheduler is None:
+        from src.app.config import settings
+        weights, caps = settings.scheduler_class_weights, settings.scheduler_class_caps
+        classes = dict(DEFAULT_CLASSES)
+        for name in set(weights) | set(caps):
+            base = classes.get(name, PriorityClass(weight=1.0))
+            classes[name] = PriorityClass(weights.get(name, base.weight), caps.get(name, base.max_concurrent))
+        _document_scheduler = PriorityScheduler(
+            max_concurrent=settings.scheduler_max_concurrent,
+            classes=classes,
+            aging_seconds=settings.scheduler_aging_seconds,
+        )
+    return _document_scheduler
@@ -0,0 +1,246 @@
+"""
+Schema-change-aware selective re-extraction.
+
+When a slug's `_ss.json`/`_sa.json` changes, its merged `schema_hash` changes
+too. Rather than re-running every stored extraction from scratch, the planner
+diffs the schema each extraction was produced with against the current one and
+re-extracts only the added or changed top-level properties. Removed properties
+are dropped without an LLM call.
+"""
+import os
+import json
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set
+import sys
+
+# Add parent directories to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+from improved_loader import schema_hash
+
+logger = logging.getLogger(__name__)
+
+DEFINITION_KEYS = ("$defs", "definitions")
+
+
+def diff_schemas(old: Dict, new: Dict) -> Dict[str, List[str]]:
+    """
+    Compare two merged schemas by top-level property.
+
+    A property counts as changed when its subschema differs, when it moved in
+    or out of `required`, or when it references a definition that changed.
+    """
+    old_props = old.get("properties", {})
+    new_props = new.get("properties", {})
+
+    changed_defs = set()
+    for key in DEFINITION_KEYS:
+        old_defs, new_defs = old.get(key, {}), new.get(key, {})
+        for name in set(old_defs) | set(new_defs):
+            if old_defs.get(name) != new_defs.get(name):
+                changed_defs.add(f"#/{key}/{name}")
+
+    old_required = set(old.get("required", []))
+    new_required = set(new.get("required", []))
+
+    changed = []
+    for name in sorted(set(old_props) & set(new_props)):
+        if old_props[name] != new_props[name]:
+            changed.append(name)
+        elif (name in old_required) != (name in new_required):
+            changed.append(name)
+        elif changed_defs:
+            body = json.dumps(new_props[name])
+            if any(f'"{ref}"' in body for ref in changed_defs):
+                changed.append(name)
+
+    return {
+        "added": sorted(set(new_props) - set(old_props)),
+        "removed": sorted(set(old_props) - set(new_props)),
+        "changed": changed,
+    }
+
+
+class SchemaSnapshotStore:
+    """Merged schemas kept by hash (<root>/<slug>/<hash>.json) so old versions can be diffed"""
+
+    def __init__(self, root: str = "logs/schema_snapshots"):
+        self.root = Path(root)
+
+    def save(self, slug: str, schema: Dict) -> str:
+        h = schema_hash(schema)
+        path = self.root / slug / f"{h}.json"
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(schema, f, sort_keys=True, indent=2)
+        return h
+
+    def load(self, slug: str, h: str) -> Optional[Dict]:
+        path = self.root / slug / f"{h}.json"
+        if not path.is_file():
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+
+class JsonExtractionStore:
+    """
+    Stored extractions as JSON files of {"meta": {...}, "data": {...}}, the
+    format written by scripts/extract_one_gemini.py. Other backends only need
+    the same three methods.
+    """
+
+    def __init__(self, root: str = "logs", pattern: str = "extraction_*.json"):
+        self.root = Path(root)
+        self.pattern = pattern
+
+    def records(self, slug: str) -> Iterable[str]:
+        for path in sorted(self.root.glob(self.pattern)):
+            try:
+                record = self.load(str(path))
+            except (OSError, json.JSONDecodeError):
+                continue
+            if record.get("meta", {}).get("slug") == slug:
+                yield str(path)
+
+    def load(self, ref: str) -> Dict:
+        with open(ref, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def save(self, ref: str, record: Dict) -> None:
+        tmp = f"{ref}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(record, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, ref)
+
+
+@dataclass
+class BackfillItem:
+    """One stored extraction to bring up to the current schema"""
+    ref: str
+    from_hash: Optional[str]
+    properties: List[str]
+    removed: List[str] = field(default_factory=list)
+
+
+@dataclass
+class BackfillPlan:
+    slug: str
+    target_hash: str
+    schema: Dict
+    items: List[BackfillItem] = field(default_factory=list)
+    diffs: Dict[str, Dict[str, List[str]]] = field(default_factory=dict)
+    unknown_hashes: Set[str] = field(default_factory=set)
+
+    def summary(self) -> Dict:
+        total = len(self.schema.get("properties", {}))
+        return {
+            "slug": self.slug,
+            "target_hash": self.target_hash,
+            "documents": len(self.items),
+            "llm_calls": sum(1 for i in self.items if i.properties),
+            "properties_requested": sum(len(i.properties) for i in self.items),
+            "properties_full_rerun": total * len(self.items),
+            "unknown_hashes": sorted(self.unknown_hashes),
+        }
+
+
+def plan_backfill(slug: str, schema: Dict, store, snapshots: SchemaSnapshotStore) -> BackfillPlan:
+    """
+    Find stored extractions of `slug` made with another schema hash and work out
+    which properties each needs re-extracted. If the old schema snapshot is
+    missing, every property is re-extracted for that document.
+    """
+    plan = BackfillPlan(slug, schema_hash(schema), schema)
+    all_props = sorted(schema.get("properties", {}))
+
+    for ref in store.records(slug):
+        old_hash = store.load(ref).get("meta", {}).get("schema_hash")
+        if old_hash == plan.target_hash:
+            continue
+
+        if old_hash not in plan.diffs:
+            old_schema = snapshots.load(slug, old_hash) if old_hash else None
+            if old_schema is None:
+                plan.unknown_hashes.add(old_hash or "<none>")
+                plan.diffs[old_hash] = {"added": all_props, "removed": [], "changed": []}
+            else:
+                plan.diffs[old_hash] = diff_schemas(old_schema, schema)
+
+        diff = plan.diffs[old_hash]
+        plan.items.append(BackfillItem(
+            ref=ref,
+            from_hash=old_hash,
+            properties=sorted(diff["added"] + diff["changed"]),
+            removed=diff["removed"],
+        ))
+    return plan
+
+
+def _read_checkpoint(path: Optional[str]) -> Set[str]:
+    if not path or not os.path.exists(path):
+        return set()
+    with open(path, "r", encoding="utf-8") as f:
+        return {line.strip() for line in f if line.strip()}
+
+
+async def run_backfill(
+    plan: BackfillPlan,
+    store,
+    extract: Callable[[Dict, List[str]], Dict],
+    concurrency: int = 4,
+    checkpoint_path: Optional[str] = None,
+) -> Dict[str, int]:
+    """
+    Apply a plan: call `extract(record, properties)` for each item (in a worker
+    thread, at most `concurrency` at a time), merge the returned properties into
+    the stored data and stamp it with the target hash.
+
+    Finished items are appended to the checkpoint file as "<ref>@<hash>" so an
+    interrupted run resumes where it stopped.
+    """
+    done = _read_checkpoint(checkpoint_path)
+    semaphore = asyncio.Semaphore(concurrency)
+    stats = {"updated": 0, "skipped": 0, "failed": 0}
+
+    async def apply(item: BackfillItem) -> None:
+        key = f"{item.ref}@{plan.target_hash}"
+        if key in done:
+            stats["skipped"] += 1
+            return
+
+        async with semaphore:
+            record = store.load(item.ref)
+            try:
+                fresh = {}
+                if item.properties:
+                    fresh = await asyncio.to_thread(extract, record, item.properties)
+            except Exception:
+                logger.exception(f"Backfill re-extraction failed for {item.ref} "
+                                 f"(properties: {', '.join(item.properties)})")
+                stats["failed"] += 1
+                return
+
+            data = {k: v for k, v in record.get("data", {}).items() if k not in item.removed}
+            data.update({k: v for k, v in (fresh or {}).items() if k in item.properties})
+            meta = dict(record.get("meta", {}))
+            meta["schema_hash"] = plan.target_hash
+            meta["backfill"] = {
+                "from_schema_hash": item.from_hash,
+                "properties": item.properties,
+                "removed": item.removed,
+                "timestamp": datetime.utcnow().isoformat(),
+            }
+            store.save(item.ref, {**record, "meta": meta, "data": data})
+
+        if checkpoint_path:
+            with open(checkpoint_path, "a", encoding="utf-8") as f:
+                f.write(key + "\n")
+        stats["updated"] += 1
+
+    await asyncio.gather(*(apply(item) for item in plan.items))
+    return stats
@@ -0,0 +1,187 @@
+"""
+Contract structure segmenter.
+
+Real estate contracts follow a predictable layout: a preamble naming the
+parties, recitals, numbered articles or sections, a signature block and
+exhibits. `segment_contract` splits a document into those sections (with char
+offsets into the original text) in one regex pass, and `section_excerpts`
+packs the sections an agent needs into prompt-sized excerpts, so each agent
+sees the signature block or the purchase price article instead of the first
+1500 characters of the document.
+
+Which agents need a section follows from its kind (the preamble and signature
+block name the parties) and from its heading, matched with the same words the
+schema routing table uses ("PURCHASE PRICE" -> FinancialAnalyzer).
+"""
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from .routing_table import agents_for_name
+
+# Section kind -> agents that always receive it
+KIND_AGENTS = {
+    "preamble": ["DocumentClassifier", "PartyExtractor"],
+    "recitals": ["DocumentClassifier", "PartyExtractor", "PropertyExtractor"],
+    "article": [],
+    "signature": ["PartyExtractor"],
+    "exhibit": [],
+}
+
+# Default cap on excerpts per agent; the extraction agents ask for one excerpt
+# (one LLM call each)
+DEFAULT_MAX_EXCERPTS = 4
+
+_HEADING_RE = re.compile(
+    r"^[ \t]*(?:"
+    r"(?P<article>(?:ARTICLE|Article)[ \t]+(?P<article_no>[IVXLC]+|\d+)\b[ \t.:\-]*(?P<article_title>[^\n]{0,80}))"
+    r"|(?P<section>(?:SECTION|Section)[ \t]+(?P<section_no>\d+)(?!\.\d)\b[ \t.:\-]*(?P<section_title>[^\n]{0,80}))"
+    r"|(?P<numbered>(?P<numbered_no>\d{1,2})\.(?!\d)[ \t]+(?P<numbered_title>[A-Z][A-Z0-9 ,&/'\-]{2,60}[A-Z]|[A-Z][a-z]+(?:[ \t]+[A-Za-z&]+){0,5})\.?(?=[ \t]*(?:\n|$)|\.[ \t]))"
+    r"|(?P<exhibit>(?:EXHIBIT|Exhibit|SCHEDULE|Schedule|ATTACHMENT|Attachment|ADDENDUM|Addendum)[ \t]+(?P<exhibit_no>[A-Z0-9][A-Z0-9\-]*)\b[ \t.:\-]*(?P<exhibit_title>[^\n]{0,80}))"
+    r"|(?P<recitals>(?:RECITALS|Recitals|R[ \t]E[ \t]C[ \t]I[ \t]T[ \t]A[ \t]L[ \t]S|WITNESSETH|BACKGROUND)\b[:.]?)"
+    r"|(?P<signature>(?:IN WITNESS WHEREOF|In Witness Whereof)\b)"
+    r")",
+    re.MULTILINE,
+)
+
+_AMOUNT_RE = re.compile(r"\$[ \t]?\d")
+
+
+@dataclass(frozen=True)
+class Section:
+    """One structural section of a document; `start`/`end` are char offsets"""
+    kind: str
+    title: str
+    number: Optional[str]
+    start: int
+    end: int
+
+    @property
+    def label(self) -> str:
+        number = f" {self.number}" if self.number else ""
+        title = f" - {self.title}" if self.title else ""
+        return f"{self.kind.upper()}{number}{title} [chars {self.start}-{self.end}]"
+
+
+class SectionIndex:
+    """Sections of one document plus the agents each one is routed to"""
+
+    def __init__(self, text: str, sections: List[Section]):
+        self.text = text
+        self.sections = sections
+        self.routes: Dict[Section, List[str]] = {s: self._agents_for(s) for s in sections}
+
+    @property
+    def structured(self) -> bool:
+        """False when no headings were found (the whole text is the preamble)"""
+        return any(s.kind != "preamble" for s in self.sections)
+
+    def section_text(self, section: Section) -> str:
+        return self.text[section.start:section.end]
+
+    def _agents_for(self, section: Section) -> List[str]:
+        agents = list(KIND_AGENTS.get(section.kind, []))
+        for agent in agents_for_name(section.title):
+            if agent not in agents:
+                agents.append(agent)
+        if "FinancialAnalyzer" not in agents and _AMOUNT_RE.search(self.section_text(section)):
+            agents.append("FinancialAnalyzer")
+        return agents
+
+    def sections_for(self, agent: str) -> List[Section]:
+        return [s for s in self.sections if agent in self.routes[s]]
+
+    def summary(self) -> List[Dict]:
+        return [
+            {
+                "kind": s.kind, "number": s.number, "title": s.title,
+                "start": s.start, "end": s.end, "agents": self.routes[s],
+            }
+            for s in self.sections
+        ]
+
+
+def _section_at(match: re.Match) -> Tuple[str, Optional[str], str]:
+    """(kind, number, title) for a heading match"""
+    for group in ("article", "section", "numbered", "exhibit"):
+        if match.group(group):
+            kind = "exhibit" if group == "exhibit" else "article"
+            number = match.group(f"{group}_no")
+            title = match.group(f"{group}_title").strip(" \t.:-")
+            return kind, number, title
+    if match.group("recitals"):
+        return "recitals", None, ""
+    return "signature", None, ""
+
+
+def _headings(text: str) -> List[re.Match]:
+    matches = list(_HEADING_RE.finditer(text))
+    # With ARTICLE/Section headings, "1. ..." lines are subsections or list items
+    if any(m.group("article") or m.group("section") for m in matches):
+        return [m for m in matches if not m.group("numbered")]
+    # Otherwise numbered headings must count up (1, 2, 3, ...); a "1." that
+    # restarts the count is a list item inside the current section
+    kept, last = [], 0
+    for m in matches:
+        if m.group("numbered"):
+            if int(m.group("numbered_no")) != last + 1:
+                continue
+            last += 1
+        kept.append(m)
+    return kept
+
+
+@lru_cache(maxsize=32)
+def segment_contract(text: str) -> SectionIndex:
+    """Section index of a contract (cached, so agents sharing a document share it)"""
+    boundaries = []
+    for match in _headings(text):
+        kind, number, title = _section_at(match)
+        if kind == "exhibit" and not title:
+            # "EXHIBIT A" on its own line, title on the next one
+            following = text[match.end():match.end() + 200].strip().split("\n", 1)[0]
+            title = following.strip()[:80]
+        # Headings inside exhibits are parts of the exhibit, not new articles
+        if boundaries and boundaries[-1][1] == "exhibit" and kind != "exhibit":
+            continue
+        boundaries.append((match.start(), kind, number, title))
+
+    sections = []
+    if not boundaries or boundaries[0][0] > 0:
+        first = boundaries[0][0] if boundaries else len(text)
+        if text[:first].strip():
+            sections.append(Section("preamble", "", None, 0, first))
+    for i, (start, kind, number, title) in enumerate(boundaries):
+        end = boundaries[i + 1][0] if i + 1 < len(boundaries) else len(text)
+        sections.append(Section(kind, title, number, start, end))
+    return SectionIndex(text, sections)
+
+
+def section_excerpts(text: str, agent: str, budget: int,
+                     max_excerpts: int = DEFAULT_MAX_EXCERPTS) -> List[str]:
+    """
+    Prompt excerpts (each at most `budget` chars) with the sections routed to
+    `agent`, in document order and labelled with their offsets. Documents
+    without structure, or without a section for the agent, fall back to the
+    first `budget` characters as before.
+    """
+    index = segment_contract(text)
+    sections = index.sections_for(agent) if index.structured else []
+    if not sections:
+        return [text[:budget]]
+
+    excerpts: List[str] = []
+    current = ""
+    for section in sections:
+        body = index.section_text(section).strip()
+        piece = f"[{section.label}]\n{body[:max(budget - len(section.label) - 3, 0)]}"
+        if current and len(current) + len(piece) + 2 > budget:
+            excerpts.append(current)
+            current = ""
+        current = f"{current}\n\n{piece}" if current else piece
+        if len(excerpts) == max_excerpts:
+            break
+    if current and len(excerpts) < max_excerpts:
+        excerpts.append(current)
+    return excerpts
@@ -0,0 +1,91 @@
+"""
+Page text, confidence and word boxes from one Tesseract pass.
+
+`image_to_string` and `image_to_data` run the same recognition; calling both
+OCRs every page twice. `image_to_data` alone carries everything: each word
+row has its text, confidence, box and its block/paragraph/line numbers, so
+the plain text can be rebuilt the way `image_to_string` lays it out (words
+of a line joined by spaces, lines by newlines, paragraphs and blocks by a
+blank line).
+"""
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Sequence, Tuple
+
+# Tesseract TSV level of word rows
+WORD_LEVEL = 5
+
+
+@dataclass(frozen=True)
+class OcrWord:
+    """One recognized word; the box is in pixels of the rendered page"""
+    text: str
+    confidence: float  # 0-100
+    left: int
+    top: int
+    width: int
+    height: int
+    block: int
+    paragraph: int
+    line: int
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+@dataclass
+class PageLayout:
+    text: str
+    confidence: float  # mean of positive word confidences, 0-100
+    words: List[OcrWord]
+
+
+def _conf(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return -1.0
+
+
+def layout_from_data(data: Dict[str, Sequence]) -> PageLayout:
+    """Rebuild a page from `image_to_data(..., output_type=Output.DICT)`"""
+    words: List[OcrWord] = []
+    confidences: List[int] = []
+    for i, level in enumerate(data.get("level", ())):
+        conf = _conf(data["conf"][i])
+        if int(conf) > 0:
+            confidences.append(int(conf))
+        text = str(data["text"][i] or "").strip()
+        if int(level) != WORD_LEVEL or not text:
+            continue
+        words.append(OcrWord(
+            text=text,
+            confidence=conf,
+            left=int(data["left"][i]),
+            top=int(data["top"][i]),
+            width=int(data["width"][i]),
+            height=int(data["height"][i]),
+            block=int(data["block_num"][i]),
+            paragraph=int(data["par_num"][i]),
+            line=int(data["line_num"][i]),
+        ))
+
+    # Words arrive in reading order; group them into lines within paragraphs
+    paragraphs: List[List[Tuple[int, int, int]]] = []
+    lines: Dict[Tuple[int, int, int], List[str]] = {}
+    current_par = None
+    for word in words:
+        par = (word.block, word.paragraph)
+        key = (word.block, word.paragraph, word.line)
+        if par != current_par:
+            paragraphs.append([])
+            current_par = par
+        if key not in lines:
+            lines[key] = []
+            paragraphs[-1].append(key)
+        lines[key].append(word.text)
+
+    text = "\n\n".join(
+        "\n".join(" ".join(lines[key]) for key in paragraph) for paragraph in paragraphs
+    )
+    confidence = sum(confidences) / len(confidences) if confidences else 0
+    return PageLayout(text=text, confidence=confidence, words=words)
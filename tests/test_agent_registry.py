@@ -0,0 +1,68 @@
+"""
+Tests for the shared agent/LLM registry
+"""
+import threading
+
+from src.app.agents.registry import AgentRegistry
+
+
+def make_registry(built):
+    def llm_factory(model, temperature, api_key):
+        built.append(("llm", model))
+        return {"model": model, "temperature": temperature}
+
+    def agent_factory(llm, **definition):
+        built.append(("agent", definition["role"]))
+        return {"llm": llm, **definition}
+
+    return AgentRegistry(llm_factory=llm_factory, agent_factory=agent_factory)
+
+
+def test_llm_and_agents_built_once():
+    built = []
+    registry = make_registry(built)
+
+    a = registry.crew_agent("Classifier", model="flash", role="Classifier")
+    b = registry.crew_agent("Classifier", model="flash", role="Classifier")
+    c = registry.crew_agent("Router", model="flash", role="Router")
+
+    assert a is b
+    assert a["llm"] is c["llm"]
+    assert built == [("llm", "flash"), ("agent", "Classifier"), ("agent", "Router")]
+    assert registry.llm("pro") is not a["llm"]
+
+    stats = registry.stats()
+    assert stats["crew_agents"] == {"cached": 2, "cold": 2, "warm": 1, "build_ms": stats["crew_agents"]["build_ms"]}
+    assert stats["llms"]["cold"] == 2
+    assert stats["llms"]["warm"] == 1
+
+
+def test_instances_shared_across_threads():
+    registry = make_registry([])
+    constructed = []
+
+    class Agent:
+        def __init__(self):
+            constructed.append(self)
+            # Nested registry use from a constructor must not deadlock
+            self.crew_agent = registry.crew_agent("Nested", model="flash", role="Nested")
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.instance(Agent))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(constructed) == 1
+    assert all(r is constructed[0] for r in results)
+    assert registry.stats()["instances"]["warm"] == 7
+
+
+def test_clear_forces_rebuild():
+    built = []
+    registry = make_registry(built)
+    registry.llm("flash")
+    registry.clear()
+    registry.llm("flash")
+    assert built == [("llm", "flash"), ("llm", "flash")]
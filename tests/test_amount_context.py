@@ -0,0 +1,38 @@
+"""
+Tests for offset-based amount context and labels
+"""
+from src.app.services.amount_context import amount_contexts
+
+TEXT = (
+    "The Purchase Price for the Property is $1,500,000. "
+    "Buyer shall deliver an earnest money deposit of $50,000 within 3 days.\n\n"
+    "Seller shall maintain general liability insurance of $50,000 per occurrence. "
+    "A broker fee of $45,000 is due at closing."
+)
+
+
+def test_repeated_amounts_get_their_own_context_and_label():
+    contexts = amount_contexts(TEXT)
+    assert [c.span.text for c in contexts] == ["$1,500,000", "$50,000", "$50,000", "$45,000"]
+
+    deposit, insurance = contexts[1], contexts[2]
+    assert deposit.span.start != insurance.span.start
+    assert deposit.category == "deposit"
+    assert insurance.category == "insurance"
+    assert "earnest money" in deposit.sentence
+    assert "insurance" in insurance.sentence and "earnest" not in insurance.sentence
+    assert insurance.context == insurance.span.context(TEXT, 50)
+
+
+def test_labels_stay_within_the_sentence():
+    contexts = amount_contexts(TEXT)
+    assert contexts[0].label == "purchase price"
+    assert contexts[0].category == "purchase_price"
+    assert contexts[3].label == "fee"
+
+
+def test_unlabeled_amount_and_empty_text():
+    [ctx] = amount_contexts("Pay $1,000 now.")
+    assert ctx.label is None and ctx.category is None
+    assert ctx.sentence == "Pay $1,000 now."
+    assert amount_contexts("") == []
@@ -0,0 +1,82 @@
+"""
+Tests for the bounded blocking-call executor
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.app.services.blocking_executor import BlockingCallTimeout, BlockingExecutor
+
+
+def test_blocking_calls_overlap():
+    executor = BlockingExecutor(max_workers=3)
+
+    async def main():
+        start = time.perf_counter()
+        results = await asyncio.gather(*(executor.run(time.sleep, 0.1) for _ in range(3)))
+        return results, time.perf_counter() - start
+
+    results, elapsed = asyncio.run(main())
+    assert results == [None, None, None]
+    assert elapsed < 0.25
+    assert executor.stats()["completed"] == 3
+    executor.shutdown()
+
+
+def test_pool_size_bounds_concurrency():
+    executor = BlockingExecutor(max_workers=2)
+    lock = threading.Lock()
+    active, peak = [0], [0]
+
+    def work():
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.03)
+        with lock:
+            active[0] -= 1
+
+    async def main():
+        await asyncio.gather(*(executor.run(work) for _ in range(6)))
+
+    asyncio.run(main())
+    assert peak[0] == 2
+    executor.shutdown()
+
+
+def test_event_loop_stays_responsive():
+    executor = BlockingExecutor(max_workers=1)
+    ticks = []
+
+    async def ticker():
+        for _ in range(5):
+            ticks.append(time.perf_counter())
+            await asyncio.sleep(0.01)
+
+    async def main():
+        await asyncio.gather(executor.run(time.sleep, 0.1), ticker())
+
+    asyncio.run(main())
+    assert ticks[-1] - ticks[0] < 0.09
+    executor.shutdown()
+
+
+def test_timeout_and_errors():
+    executor = BlockingExecutor(max_workers=1, default_timeout=0.05)
+
+    def fail():
+        raise ValueError("boom")
+
+    async def main():
+        with pytest.raises(BlockingCallTimeout):
+            await executor.run(time.sleep, 0.2)
+        with pytest.raises(ValueError, match="boom"):
+            await executor.run(fail, timeout=1)
+        assert await executor.run(lambda x, y=0: x + y, 1, y=2, timeout=1) == 3
+
+    asyncio.run(main())
+    stats = executor.stats()
+    assert (stats["timed_out"], stats["failed"], stats["completed"]) == (1, 1, 1)
+    executor.shutdown(wait=True)
@@ -0,0 +1,147 @@
+"""
+Tests for dependency circuit breakers
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.app.services.circuit_breaker import (
+    BreakerRegistry,
+    CircuitBreaker,
+    CircuitOpenError,
+)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+async def _fail():
+    raise ConnectionError("down")
+
+
+async def _ok():
+    return "ok"
+
+
+def test_opens_after_consecutive_failures_and_fails_fast():
+    breaker = CircuitBreaker("llm:test", failure_threshold=3, recovery_timeout=30, clock=Clock())
+
+    async def scenario():
+        for _ in range(3):
+            with pytest.raises(ConnectionError):
+                await breaker.call(_fail)
+        assert breaker.state == "open"
+        with pytest.raises(CircuitOpenError) as info:
+            await breaker.call(_ok)
+        assert info.value.name == "llm:test"
+        assert info.value.retry_after == 30
+
+    asyncio.run(scenario())
+    snapshot = breaker.snapshot()
+    assert snapshot["failures"] == 3 and snapshot["rejected"] == 1 and snapshot["opened"] == 1
+    assert snapshot["last_error"] == "ConnectionError: down"
+
+
+def test_success_resets_the_failure_count():
+    breaker = CircuitBreaker("db:a", failure_threshold=2, clock=Clock())
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+
+
+def test_half_open_probe_closes_or_reopens():
+    clock = Clock()
+    breaker = CircuitBreaker("db:a", failure_threshold=1, recovery_timeout=10, clock=clock)
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    clock.now = 10
+    assert breaker.state == "half_open"
+    assert breaker.allow()          # the single probe
+    assert not breaker.allow()      # everyone else still fails fast
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert breaker.retry_after() == 10
+
+    clock.now = 20
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.allow() and breaker.allow()
+
+
+def test_cancelled_probe_is_released():
+    clock = Clock()
+    breaker = CircuitBreaker("db:a", failure_threshold=1, recovery_timeout=1, clock=clock)
+    breaker.record_failure()
+    clock.now = 1
+
+    async def scenario():
+        task = asyncio.create_task(breaker.call(asyncio.sleep, 10))
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(scenario())
+    assert breaker.allow()
+
+
+def test_registry_shares_breakers_by_name():
+    registry = BreakerRegistry(failure_threshold=1)
+    registry.get("db:a").record_failure()
+    assert registry.get("db:a").state == "open"
+    registry.get("llm:x")
+    assert list(registry.snapshot("db:")) == ["db:a"]
+    assert set(registry.snapshot()) == {"db:a", "llm:x"}
+
+
+class FakeTask:
+    """A CrewAI-like task whose execute() fails while its model is down"""
+
+    def __init__(self, model, down):
+        self.model = model
+        self.down = down
+        self.agent = SimpleNamespace(llm=SimpleNamespace(model=f"gemini/{model}"))
+
+    def execute(self):
+        if self.model in self.down:
+            raise ConnectionError(f"{self.model} unavailable")
+        return f"answer from {self.model}"
+
+
+def test_run_task_falls_back_to_the_next_model(monkeypatch):
+    from src.app import config
+    from src.app.services import blocking_executor, circuit_breaker
+    from src.app.services.blocking_executor import BlockingExecutor, run_task
+
+    down = {"primary"}
+    monkeypatch.setattr(config, "settings", SimpleNamespace(llm_fallback_models=["backup"]), raising=False)
+    monkeypatch.setattr(circuit_breaker, "_breakers", BreakerRegistry(failure_threshold=1, recovery_timeout=60))
+    monkeypatch.setattr(blocking_executor, "_crew_executor", BlockingExecutor(max_workers=1))
+    monkeypatch.setattr(blocking_executor, "_task_with_model", lambda task, model: FakeTask(model, down))
+
+    async def scenario():
+        task = FakeTask("primary", down)
+        with pytest.raises(ConnectionError):
+            await run_task(task)
+        # Primary breaker open: the fallback model answers
+        assert await run_task(task) == "answer from backup"
+        down.add("backup")
+        with pytest.raises(ConnectionError):
+            await run_task(task)
+        # Every breaker open: fail fast so the agent takes its rule-based lane
+        with pytest.raises(CircuitOpenError) as info:
+            await run_task(task)
+        assert info.value.name == "llm:primary"
+
+    asyncio.run(scenario())
+    states = {name: b["state"] for name, b in circuit_breaker._breakers.snapshot().items()}
+    assert states == {"llm:primary": "open", "llm:backup": "open"}
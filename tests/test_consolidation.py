@@ -0,0 +1,111 @@
+"""
+Tests for deterministic consolidation of agent outputs
+"""
+from src.app.services.consolidation import MergeEngine
+
+
+def test_disjoint_outputs_merge_without_conflicts():
+    result = MergeEngine().merge({
+        "PartyExtractor": {"parties": [{"name": "Acme LLC"}], "extraction_method": "ai"},
+        "FinancialAnalyzer": {"financial_terms": [{"amount": 5000}], "currency": "USD",
+                              "extraction_method": "rules"},
+    })
+    assert result.conflicts == []
+    assert result.merged == {
+        "parties": [{"name": "Acme LLC"}],
+        "financial_terms": [{"amount": 5000}],
+        "currency": "USD",
+    }
+
+
+def test_equivalent_values_collapse():
+    result = MergeEngine().merge({
+        "a": {"total": 1000, "city": "San Francisco", "contact": {"email": "x@y.com"}},
+        "b": {"total": "$1,000", "city": "san francisco", "contact": {"phone": "555"}},
+        "c": {"city": None, "notes": ""},
+    })
+    assert result.conflicts == []
+    assert result.merged == {
+        "total": 1000, "city": "San Francisco", "contact": {"email": "x@y.com", "phone": "555"}
+    }
+
+
+def test_more_complete_string_wins():
+    result = MergeEngine().merge({"a": {"buyer": "Acme"}, "b": {"buyer": "Acme Holdings, LLC"}})
+    assert result.conflicts == []
+    assert result.merged["buyer"] == "Acme Holdings, LLC"
+
+
+def test_entity_lists_union_by_identity():
+    result = MergeEngine().merge({
+        "a": {"parties": [{"name": "Acme LLC", "role": "buyer"}]},
+        "b": {"parties": [{"name": "ACME LLC", "contact": {"email": "a@acme.com"}}, {"name": "Bob Smith"}],
+              "tags": ["x", "y"]},
+        "c": {"tags": ["y", "z"]},
+    })
+    assert result.conflicts == []
+    assert result.merged["parties"] == [
+        {"name": "Acme LLC", "role": "buyer", "contact": {"email": "a@acme.com"}},
+        {"name": "Bob Smith"},
+    ]
+    assert result.merged["tags"] == ["x", "y", "z"]
+
+
+def test_conflicts_keep_priority_value_until_resolved():
+    result = MergeEngine().merge(
+        {
+            "reviewer": {"parties": [{"name": "Acme LLC", "role": "seller"}], "price": 900},
+            "agent": {"parties": [{"name": "Acme LLC", "role": "buyer"}], "price": 1000},
+        },
+        priorities={"agent": 0.9, "reviewer": 0.6},
+    )
+    conflicts = {c.path: c.to_dict() for c in result.conflicts}
+    assert set(conflicts) == {"parties[name=Acme LLC].role", "price"}
+    assert conflicts["price"]["candidates"] == {"agent": 1000, "reviewer": 900}
+    assert conflicts["price"]["chosen"] == "agent"
+    assert result.merged["price"] == 1000
+
+    assert result.resolve({"parties[name=Acme LLC].role": "seller", "unrelated": 1}) == 1
+    assert result.merged["parties"][0]["role"] == "seller"
+    assert result.resolved == 1
+
+
+def test_gap_filling_source_never_conflicts():
+    result = MergeEngine().merge(
+        {
+            "rules": {"parties": [{"name": "Bayview Partners LLC", "role": "client", "type": "company"}],
+                      "price": 900},
+            "agent": {"parties": [{"name": "Bayview Partners LLC", "role": "buyer"}], "price": 1000},
+        },
+        priorities={"agent": 0.9, "rules": -1.0},
+    )
+    assert result.conflicts == []
+    assert result.merged == {
+        "parties": [{"name": "Bayview Partners LLC", "role": "buyer", "type": "company"}],
+        "price": 1000,
+    }
+
+
+def test_value_items_from_different_sources_merge():
+    result = MergeEngine().merge(
+        {
+            "agent": {"financial_terms": [
+                {"amount": 12500000, "type": "contract_value"},
+                {"amount": 250000, "type": "deposit"},
+            ]},
+            "rules": {"financial_terms": [
+                {"amount": 12500000.0, "type": "payment", "context": "price of $12,500,000",
+                 "span": {"start": 10, "end": 21}},
+                {"amount": 250000.0, "type": "payment", "context": "deposit of $250,000"},
+                {"amount": 250000.0, "type": "payment", "context": "insurance of $250,000"},
+            ]},
+        },
+        priorities={"agent": 0.9, "rules": -1.0},
+    )
+    assert result.conflicts == []
+    terms = result.merged["financial_terms"]
+    assert [(t["amount"], t["type"]) for t in terms] == [
+        (12500000, "contract_value"), (250000, "deposit"), (250000.0, "payment"),
+    ]
+    assert terms[0]["span"] == {"start": 10, "end": 21}
+    assert terms[1]["context"] == "deposit of $250,000"
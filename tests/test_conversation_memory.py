@@ -0,0 +1,92 @@
+import re
+
+from src.app.services.conversation_memory import TurnAnalyzer, memory_id
+
+DECISION = [
+    r'(decided|agreed|concluded) (that|to)',
+    r'(we will|shall|must|need to)',
+    r'(action item|todo|task)',
+    r'(deadline|due by|completion)',
+    r'(approved|rejected|declined)',
+]
+DOCUMENT = [
+    r'(document|contract|agreement) (id|number|reference)',
+    r'(uploaded|analyzed|processed)',
+    r'(signed|executed|finalized)',
+    r'(amendment|addendum|modification)',
+]
+BUSINESS = [
+    r'(client|vendor|party|company) (.+)',
+    r'(\$[\d,]+|\d+\s*(dollars|USD))',
+    r'(contract value|total amount|payment)',
+    r'(legal terms|governing law|jurisdiction)',
+]
+
+CONVERSATION = (
+    "User: I want to upload this contract for Acme Corp. The total value is $500,000. "
+    "Agent: Document uploaded successfully, see acme_psa.pdf and document ID: 3f2a9c1e-77aa. "
+    "User: Great! We decided to approve this contract. Set the deadline for signature to next Friday. "
+    "Agent: Noted. Contract approved with signature deadline of next Friday."
+)
+
+
+def analyzer():
+    return TurnAnalyzer({"decision": DECISION, "document": DOCUMENT, "business": BUSINESS})
+
+
+def naive_importance(text):
+    lowered = text.lower()
+    importance = 0.0
+    for patterns, weight in ((DECISION, 0.3), (DOCUMENT, 0.2), (BUSINESS, 0.1)):
+        importance += weight * sum(1 for p in patterns if re.search(p, lowered))
+    return min(importance + min(len(text) / 500, 0.2), 1.0)
+
+
+def test_importance_matches_per_pattern_search():
+    texts = [
+        CONVERSATION,
+        "The client payment is due.",
+        "Nothing notable here",
+        "We executed the amendment; governing law is Texas.",
+    ]
+    for text in texts:
+        assert analyzer().analyze(text).importance == naive_importance(text)
+
+
+def naive_summary(text):
+    scored = []
+    for sentence in text.split(".")[:10]:
+        sentence = sentence.strip()
+        if len(sentence) < 10:
+            continue
+        lowered = sentence.lower()
+        score = 2 * sum(1 for p in DECISION if re.search(p, lowered))
+        score += sum(1 for p in DOCUMENT + BUSINESS if re.search(p, lowered))
+        if score > 0:
+            scored.append((sentence, score))
+    scored.sort(key=lambda item: item[1], reverse=True)
+    top = [sentence for sentence, _ in scored[:3]]
+    return ". ".join(top) + "." if top else text[:200] + "..."
+
+
+def test_summary_matches_per_sentence_search():
+    summary = analyzer().analyze(CONVERSATION).summary
+    assert summary == naive_summary(CONVERSATION)
+    assert summary.startswith("Contract approved with signature deadline")
+
+
+def test_summary_falls_back_to_prefix():
+    assert analyzer().analyze("just chatting about lunch").summary == "just chatting about lunch..."
+
+
+def test_tags_and_pointers():
+    analysis = analyzer().analyze(CONVERSATION)
+    assert analysis.tags == ["contract", "financial", "decision"]
+    # The id pattern's greedy gap trims the id's head, as the per-pattern version did
+    assert analysis.document_pointers == ["c1e-77aa", "filename:acme_psa.pdf"]
+
+
+def test_memory_id_is_content_hash():
+    assert memory_id("We decided to sign.") == memory_id("  we decided   to SIGN. ")
+    assert memory_id("We decided to sign.") != memory_id("We decided to sign.", context="deal-2")
+    assert len(memory_id("x")) == 32
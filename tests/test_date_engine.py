@@ -0,0 +1,98 @@
+"""
+Tests for the date and deadline engine
+"""
+from datetime import date
+
+from src.app.services.date_engine import (
+    DateEngine,
+    add_business_days,
+    add_months,
+    extract_dates_batch,
+    get_date_engine,
+)
+
+PSA = (
+    'This Purchase Agreement is dated as of January 15, 2025 (the "Effective Date").\n'
+    "Buyer shall deposit funds within three (3) business days after the Effective Date. "
+    "The Inspection Period ends thirty (30) days after the Effective Date. Closing shall occur "
+    'on the 1st day of March, 2025 (the "Closing Date"). Seller shall deliver estoppels '
+    "5 business days prior to Closing. Notices are due by 4/1/2025 and 2025-05-01."
+)
+
+
+def test_absolute_dates_and_anchor_definitions():
+    extraction = get_date_engine().extract(PSA)
+    assert extraction.anchors == {"effective date": date(2025, 1, 15), "closing": date(2025, 3, 1)}
+    absolute = [m.iso for m in extraction.mentions if m.kind == "absolute"]
+    assert absolute == ["2025-04-01", "2025-05-01"]
+    for mention in extraction.mentions:
+        assert PSA[mention.start:mention.end] == mention.text
+
+
+def test_relative_deadlines_resolve_against_anchors():
+    deadlines = get_date_engine().extract(PSA).deadlines
+    assert [(d.amount, d.unit, d.business, d.direction, d.anchor) for d in deadlines] == [
+        (3, "day", True, "after", "effective date"),
+        (30, "day", False, "after", "effective date"),
+        (5, "day", True, "before", "closing"),
+    ]
+    # Jan 15 2025 is a Wednesday; Mar 1 2025 a Saturday
+    assert [d.iso for d in deadlines] == ["2025-01-20", "2025-02-14", "2025-02-24"]
+
+
+def test_anchor_stops_before_following_capitalized_words():
+    text = (
+        'Dated as of January 15, 2025 (the "Effective Date"). Within 10 days after the Effective Date '
+        "Buyer shall deliver notice, and 5 days after the Inspection Date Seller shall respond."
+    )
+    deadlines = get_date_engine().extract(text).deadlines
+    assert [d.anchor for d in deadlines] == ["effective date", "inspection date"]
+    assert deadlines[0].iso == "2025-01-25"
+
+
+def test_within_days_of_an_anchor_means_after_it():
+    [deadline] = get_date_engine().extract(
+        'Dated as of January 15, 2025 (the "Effective Date"). Buyer shall object within '
+        "ten (10) business days of the Effective Date."
+    ).deadlines
+    assert (deadline.amount, deadline.business, deadline.direction, deadline.anchor) == (
+        10, True, "after", "effective date"
+    )
+    assert deadline.iso == "2025-01-29"
+
+
+def test_unknown_anchor_stays_unresolved():
+    [deadline] = get_date_engine().extract("Payment is due 10 days after Substantial Completion.").deadlines
+    assert deadline.anchor == "substantial completion"
+    assert deadline.date is None
+
+
+def test_due_date_for_free_form_values():
+    engine = get_date_engine()
+    anchors = {"effective date": date(2025, 1, 15)}
+    assert engine.due_date("March 3, 2025") == "2025-03-03"
+    assert engine.due_date("within 10 business days after the Effective Date", anchors) == "2025-01-29"
+    assert engine.due_date("2 months after the date hereof", anchors) == "2025-03-15"
+    assert engine.due_date("within 10 days of the Effective Date", anchors) == "2025-01-25"
+    assert engine.due_date("upon closing", anchors) is None
+
+
+def test_business_days_and_month_arithmetic():
+    friday = date(2025, 1, 17)
+    assert add_business_days(friday, 1) == date(2025, 1, 20)
+    assert add_business_days(friday, 1, frozenset({date(2025, 1, 20)})) == date(2025, 1, 21)
+    assert add_business_days(date(2025, 1, 20), -1) == friday
+    assert add_months(date(2025, 1, 31), 1) == date(2025, 2, 28)
+
+    holidays = DateEngine(holidays=[date(2025, 1, 20)])
+    [deadline] = holidays.extract("within 1 business day after the Effective Date",
+                                  anchors={"Effective Date": "January 17, 2025"}).deadlines
+    assert deadline.iso == "2025-01-21"
+
+
+def test_batch_keeps_input_order():
+    docs = [("a", PSA), ("b", "Signed on 2024-12-31."), ("c", "")]
+    results = list(extract_dates_batch(docs))
+    assert [key for key, _ in results] == ["a", "b", "c"]
+    assert results[1][1]["mentions"][0]["date"] == "2024-12-31"
+    assert results[2][1] == {"anchors": {}, "mentions": []}
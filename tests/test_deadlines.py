@@ -0,0 +1,53 @@
+"""
+Tests for per-coroutine deadlines
+"""
+import asyncio
+
+from src.app.services.deadlines import DeadlineExceeded, run_with_deadlines
+
+
+async def _sleep(seconds, value):
+    await asyncio.sleep(seconds)
+    return value
+
+
+async def _fail():
+    raise ValueError("boom")
+
+
+def test_straggler_does_not_discard_finished_results():
+    cancelled = []
+
+    async def straggler():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    outcomes = asyncio.run(run_with_deadlines(
+        {"fast": _sleep(0.01, "a"), "slow": straggler(), "bad": _fail()},
+        {"fast": 1, "slow": 0.05, "bad": 1},
+    ))
+    assert list(outcomes) == ["fast", "slow", "bad"]
+    assert outcomes["fast"] == "a"
+    assert isinstance(outcomes["slow"], DeadlineExceeded)
+    assert outcomes["slow"].seconds == 0.05
+    assert isinstance(outcomes["bad"], ValueError)
+    assert cancelled == [True]
+
+
+def test_deadlines_are_independent_and_results_stream():
+    order = []
+
+    async def collect(name, outcome):
+        order.append(name)
+
+    outcomes = asyncio.run(run_with_deadlines(
+        {"short": _sleep(0.2, "x"), "long": _sleep(0.1, "y"), "quick": _sleep(0.01, "z")},
+        {"short": 0.05, "long": 1, "quick": 1},
+        on_result=collect,
+    ))
+    assert order == ["quick", "short", "long"]
+    assert isinstance(outcomes["short"], DeadlineExceeded)
+    assert outcomes["long"] == "y"
@@ -0,0 +1,83 @@
+"""
+Tests for writes deferred while their dependency is unavailable
+"""
+import asyncio
+
+import pytest
+
+from src.app.services.deferred_writes import DeferredQueueFull, DeferredWrites
+
+
+class Store:
+    def __init__(self):
+        self.available = False
+        self.stored = []
+
+    async def write(self, item):
+        if not self.available:
+            return False
+        self.stored.append(item)
+        return True
+
+
+def test_flush_keeps_order_and_stops_at_the_first_refusal():
+    store = Store()
+    writes = DeferredWrites(store.write, min_interval=60)
+
+    async def scenario():
+        for item in ("a", "b", "c"):
+            writes.defer(item)
+        assert await writes.flush() == 0
+        assert len(writes) == 3
+        store.available = True
+        assert await writes.flush() == 3
+        await writes.close()
+
+    asyncio.run(scenario())
+    assert store.stored == ["a", "b", "c"]
+    assert writes.stats() == {"queued": 0, "flushing": False, "deferred": 3, "flushed": 3}
+
+
+def test_background_task_flushes_once_the_dependency_recovers():
+    store = Store()
+    waits = []
+
+    def retry_after():
+        # The breaker goes half-open after the first wait
+        waits.append(len(waits))
+        store.available = len(waits) > 1
+        return 0.0
+
+    writes = DeferredWrites(store.write, retry_after=retry_after, min_interval=0.01)
+
+    async def scenario():
+        assert writes.defer("doc-1") == 1
+        assert writes.defer("doc-2") == 2
+        assert writes.stats()["flushing"]
+        for _ in range(100):
+            if not len(writes):
+                break
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.02)
+        assert not writes.stats()["flushing"]
+
+    asyncio.run(scenario())
+    assert store.stored == ["doc-1", "doc-2"]
+    assert len(waits) == 2
+
+
+def test_write_errors_keep_the_item_and_full_queue_raises():
+    async def broken(item):
+        raise ConnectionError("database down")
+
+    writes = DeferredWrites(broken, max_items=1, min_interval=60)
+
+    async def scenario():
+        writes.defer("doc-1")
+        with pytest.raises(DeferredQueueFull):
+            writes.defer("doc-2")
+        assert await writes.flush() == 0
+        assert len(writes) == 1
+        await writes.close()
+
+    asyncio.run(scenario())
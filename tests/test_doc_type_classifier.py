@@ -0,0 +1,70 @@
+"""
+Tests for the local document-type classifier
+"""
+import json
+
+import pytest
+
+from src.app.services.doc_type_classifier import (
+    DocTypeClassifier,
+    HashedTfidfVectorizer,
+    split_fse_inputs,
+)
+
+SAMPLES = [
+    ("grant-deed", "grant deed for valuable consideration grantor hereby grants to grantee real property"),
+    ("grant-deed", "recording requested by grant deed documentary transfer tax grantor grants"),
+    ("lease-agreement", "lease agreement landlord tenant monthly rent premises term security deposit"),
+    ("lease-agreement", "commercial lease tenant shall pay base rent to landlord premises"),
+    ("promissory-note", "promissory note borrower promises to pay lender principal interest maturity"),
+]
+
+
+def test_split_fse_inputs():
+    text = "**INPUT DOCUMENT TEXT:**\nFirst doc\n**JSON OUTPUT:**\n{}\n**INPUT DOCUMENT TEXT:**\nSecond\n**JSON OUTPUT:**\n{}"
+    assert split_fse_inputs(text) == ["First doc", "Second"]
+
+
+def test_vectorizer_is_normalized_and_stable():
+    vec = HashedTfidfVectorizer().fit(t for _, t in SAMPLES)
+    a = vec.transform("tenant pays rent")
+    assert sum(v * v for v in a.values()) == pytest.approx(1.0)
+    assert a == vec.transform("tenant pays rent")
+
+
+def test_predict_ranks_and_probabilities():
+    clf = DocTypeClassifier().fit(SAMPLES)
+    top = clf.predict("the tenant shall pay rent to the landlord", top_k=3)
+    assert top[0][0] == "lease-agreement"
+    assert [p for _, p in top] == sorted((p for _, p in top), reverse=True)
+    assert sum(p for _, p in clf.predict("anything", top_k=10)) == pytest.approx(1.0)
+
+
+def test_calibrate_picks_temperature_from_grid():
+    clf = DocTypeClassifier().fit(SAMPLES)
+    t = clf.calibrate([("grant-deed", "grantor grants deed"), ("promissory-note", "borrower promises to pay")],
+                      grid=(1, 50))
+    assert t == 50
+
+
+def test_save_load_roundtrip(tmp_path):
+    clf = DocTypeClassifier().fit(SAMPLES)
+    path = tmp_path / "model.json"
+    clf.save(str(path))
+    loaded = DocTypeClassifier.load(str(path))
+    text = "borrower promises to pay principal"
+    assert loaded.predict(text) == clf.predict(text)
+
+
+def test_from_document_types_with_history(tmp_path):
+    for slug, text in [("grant-deed", "Grantor grants the property"), ("lease-agreement", "Tenant pays rent")]:
+        d = tmp_path / slug
+        d.mkdir()
+        (d / f"{slug}_ss.json").write_text(json.dumps({"title": slug}))
+        (d / f"{slug}_fse.txt").write_text(f"**INPUT DOCUMENT TEXT:**\n{text}\n**JSON OUTPUT:**\n{{}}")
+    history = tmp_path / "history.jsonl"
+    history.write_text("\n".join(json.dumps({"slug": s, "text": t}) for s, t in SAMPLES[:4]))
+
+    clf = DocTypeClassifier.from_document_types(str(tmp_path), str(history))
+    assert clf.classes == ["grant-deed", "lease-agreement"]
+    assert clf.predict("landlord and tenant rent", top_k=1)[0][0] == "lease-agreement"
@@ -0,0 +1,66 @@
+"""
+Tests for retrieval-based few-shot example selection
+"""
+from src.app.services.doc_type_classifier import split_fse_examples
+from src.app.services.example_selector import ExampleIndex, estimate_tokens, select_few_shot
+
+FSE = """Examples for lease documents
+
+**INPUT DOCUMENT TEXT:**
+Residential lease. Tenant pays monthly rent of $2,000 to landlord.
+**JSON OUTPUT:**
+{"rent": 2000}
+
+INPUT DOCUMENT TEXT:
+Ground lease for 99 years. Ground rent escalates with CPI.
+JSON OUTPUT:
+{"term_years": 99}
+
+**INPUT DOCUMENT TEXT:**
+Parking license for two spaces in the garage.
+**JSON OUTPUT:**
+{"spaces": 2}
+"""
+
+
+def test_split_handles_plain_and_bold_markers():
+    preamble, examples = split_fse_examples(FSE)
+    assert preamble == "Examples for lease documents"
+    assert [inp.split(".")[0] for _, inp in examples] == [
+        "Residential lease", "Ground lease for 99 years", "Parking license for two spaces in the garage"
+    ]
+    assert examples[1][0].endswith('{"term_years": 99}')
+
+
+def test_split_without_markers_is_single_example():
+    assert split_fse_examples("DEVELOPMENT AGREEMENT\nTerm: 20 years") == (
+        "", [("DEVELOPMENT AGREEMENT\nTerm: 20 years",) * 2]
+    )
+
+
+def test_select_most_similar_first():
+    index = ExampleIndex(FSE)
+    selected = index.select("ninety-nine year ground lease with CPI escalation of ground rent", top_k=1)
+    assert [e.position for e, _ in selected] == [1]
+
+
+def test_select_respects_token_budget():
+    index = ExampleIndex(FSE)
+    preamble = estimate_tokens(index.preamble)
+    smallest = min(e.tokens for e in index.examples)
+    selected = index.select("ground lease", top_k=3, token_budget=preamble + smallest)
+    assert len(selected) == 1
+    assert selected[0][0].tokens == smallest
+
+
+def test_select_few_shot_stats_and_text():
+    text, stats = select_few_shot(FSE, "garage parking spaces", top_k=2)
+    assert stats["few_shot_available"] == 3
+    assert stats["few_shot_selected"] == 2
+    assert text.startswith("Examples for lease documents")
+    assert text.split("\n\n")[1].startswith("**INPUT DOCUMENT TEXT:**\nParking license")
+    assert stats["few_shot_tokens"] == estimate_tokens(text)
+
+
+def test_select_few_shot_empty():
+    assert select_few_shot("", "anything")[0] == ""
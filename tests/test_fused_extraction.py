@@ -0,0 +1,78 @@
+"""
+Tests for fused single-call extraction parsing and fan-out
+"""
+import pytest
+
+from src.app.services.fused_extraction import (
+    FUSED_AGENTS,
+    build_fused_prompt,
+    fused_excerpt,
+    parse_fused_response,
+    split_fused_output,
+)
+
+RESPONSE = """```json
+{
+  "classification": {"document_type": "agreement", "sub_type": "purchase_agreement",
+                     "structure": "formal", "complexity": "legal_heavy", "confidence": 0.92},
+  "parties": [
+    {"name": "Coyne Development LLC", "role": "Buyer", "entity_type": "LLC"},
+    {"name": "Jane Doe", "role": "signatory", "entity_type": "individual", "email": "jane@x.com"},
+    {"role": "Escrow Holder"}
+  ],
+  "financial_terms": [
+    {"amount": "$3,500,000", "type": "purchase_price", "description": "Total purchase price"},
+    {"amount": 50000, "type": "deposit"},
+    {"amount": "TBD"},
+  ],
+  "total_contract_value": null
+}
+```"""
+
+
+def test_parse_tolerates_fences_and_trailing_commas():
+    data = parse_fused_response(RESPONSE)
+    assert data["classification"]["confidence"] == 0.92
+    with pytest.raises(ValueError):
+        parse_fused_response("no json here")
+
+
+def test_split_matches_agent_data_shapes():
+    aspects = split_fused_output(parse_fused_response(RESPONSE))
+    assert tuple(aspects) == FUSED_AGENTS
+
+    classification = aspects["DocumentClassifier"]
+    assert classification["document_type"]["primary"] == "agreement"
+    assert classification["ai_confidence"] == 0.92
+
+    parties = aspects["PartyExtractor"]["parties"]
+    assert [p["name"] for p in parties] == ["Coyne Development LLC", "Jane Doe"]
+    assert parties[1]["type"] == "individual"
+    assert parties[1]["contact"] == {"email": "jane@x.com"}
+
+    financial = aspects["FinancialAnalyzer"]
+    assert [t["amount"] for t in financial["financial_terms"]] == [3500000, 50000]
+    assert financial["total_contract_value"] == 3500000
+    assert financial["currency"] == "USD"
+
+
+def test_missing_aspects_get_defaults():
+    aspects = split_fused_output({})
+    assert aspects["DocumentClassifier"]["document_type"]["primary"] == "other"
+    assert aspects["DocumentClassifier"]["ai_confidence"] == 0.7
+    assert aspects["PartyExtractor"]["parties"] == []
+    assert aspects["FinancialAnalyzer"]["total_contract_value"] is None
+
+
+def test_prompt_uses_sections_needed_by_fused_agents():
+    text = (
+        "LEASE between Acme LLC and Bob Smith.\n"
+        "1. RENT. Tenant pays $5,000 per month.\n"
+        "2. MAINTENANCE. Tenant keeps the premises clean.\n"
+        "IN WITNESS WHEREOF the parties sign.\n"
+    )
+    excerpt = fused_excerpt(text)
+    assert "RENT" in excerpt and "IN WITNESS WHEREOF" in excerpt
+    assert "MAINTENANCE" not in excerpt
+    assert excerpt in build_fused_prompt(text)
+    assert fused_excerpt("plain text " * 1000, budget=100) == ("plain text " * 1000)[:100]
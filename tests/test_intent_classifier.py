@@ -0,0 +1,72 @@
+"""
+Tests for the precompiled intent classifier
+"""
+import random
+import timeit
+import re
+
+from src.app.services.intent_classifier import IntentClassifier
+
+PATTERNS = {
+    "conversational": [r"what did we (talk|discuss|say)", r"(yesterday|last time|before|previous)",
+                       r"(context|history|background)"],
+    "document": [r"analyze (this|the) (document|contract)", r"extract (from|data from)"],
+    "business": [r"find (contracts|documents|agreements)", r"(acme|company|client|vendor)",
+                 r"show (me )?(recent|all|latest)"],
+    "system": [r"(status|health|working)", r"system (status|check|health)",
+               r"is .* (working|operational|running)"],
+}
+
+
+def naive(query):
+    """The per-pattern re.search scoring the classifier replaces"""
+    scores = {intent: sum(bool(re.search(p, query.lower())) for p in pats)
+              for intent, pats in PATTERNS.items()}
+    return "business" if max(scores.values()) == 0 else max(scores, key=scores.get), scores
+
+
+def test_scores_match_per_pattern_search():
+    classifier = IntentClassifier(PATTERNS, default="business")
+    words = ["what", "did", "we", "talk", "system", "status", "is", "the", "db", "working",
+             "find", "contracts", "acme", "analyze", "this", "document", "history", "show", "me", "all"]
+    rng = random.Random(3)
+    for _ in range(300):
+        query = " ".join(rng.choice(words) for _ in range(rng.randint(0, 8)))
+        result = classifier.classify(query)
+        intent, scores = naive(query)
+        assert result.intent == intent
+        assert dict(result.scores) == scores
+
+
+def test_confidence_is_share_of_matched_patterns():
+    classifier = IntentClassifier(PATTERNS, default="business")
+    result = classifier.classify("Is the system status check working?")
+    assert result.intent == "system"
+    assert result.score("system") == 3
+    assert result.confidence == 1.0
+    assert "system (status|check|health)" in result.matched
+
+    mixed = classifier.classify("What did we discuss about the Acme status?")
+    assert mixed.intent == "conversational"
+    assert mixed.confidence == round(1 / 3, 3)
+
+    unclear = classifier.classify("hello")
+    assert (unclear.intent, unclear.confidence, unclear.matched) == ("business", 0.0, ())
+
+
+def test_batch_and_cache():
+    classifier = IntentClassifier(PATTERNS, default="business", cache_size=8)
+    results = classifier.classify_batch(["Find contracts", "find CONTRACTS", "system health"])
+    assert [r.intent for r in results] == ["business", "business", "system"]
+    assert classifier.cache_info().hits == 1
+
+
+def test_uncached_classification_is_no_slower_than_per_pattern_search():
+    classifier = IntentClassifier(PATTERNS, default="business", cache_size=0)
+    query = "Is the system status check working for the Acme contracts we discussed? " * 7
+    assert classifier.classify(query).intent == naive(query)[0]
+
+    def best_of(func):
+        return min(timeit.repeat(lambda: func(query), number=200, repeat=5))
+
+    assert best_of(classifier.classify) <= best_of(naive) * 1.5
@@ -0,0 +1,58 @@
+"""
+Tests for the shared Aho-Corasick keyword matcher
+"""
+import random
+
+from src.app.services.keyword_matcher import (
+    DOC_TYPE_KEYWORDS,
+    TAG_KEYWORDS,
+    KeywordMatcher,
+)
+
+REVIEW = ["termination", "breach", "penalty", "liquidated damages", "liability", "force majeure"]
+
+
+def test_hits_carry_offsets_and_overlaps():
+    matcher = KeywordMatcher({"review": REVIEW, "short": ["damages", "he", "she", "hers"]})
+    text = "Seller's Liquidated Damages are hers alone."
+    hits = matcher.scan(text).hits
+    assert [(h.keyword, text[h.start:h.end]) for h in hits if h.keyword in REVIEW] == [
+        ("liquidated damages", "Liquidated Damages"),
+    ]
+    # Overlapping and nested keywords are all reported
+    assert {h.keyword for h in hits} == {"liquidated damages", "damages", "he", "hers"}
+
+
+def test_sets_are_queried_separately():
+    text = "Payment of $500 is due; breach of this clause, or a further breach, ends it."
+    scan = KeywordMatcher({"review": REVIEW, "tag": ["payment", "$"]}).scan(text)
+    assert scan.any("review") and scan.any("tag")
+    assert scan.found("review") == ["breach"]
+    assert len(scan.hits_for("review")) == 2
+    assert not scan.any("missing")
+    [first, _] = scan.citations("review", text, 5)
+    assert first["keyword"] == "breach" and "breach" in first["context"]
+    assert text[first["start"]:first["end"]] == "breach"
+
+
+def test_matches_substring_semantics_of_in_checks():
+    keywords = [k for _, ks in DOC_TYPE_KEYWORDS for k in ks] + [k for ks in TAG_KEYWORDS.values() for k in ks]
+    matcher = KeywordMatcher({"all": keywords})
+    rng = random.Random(7)
+    alphabet = "abcdefghilmnoprstuv $-"
+    for _ in range(200):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 80)))
+        text += " " + rng.choice(keywords).upper()
+        expected = {k for k in keywords if k in text.lower()}
+        assert set(matcher.scan(text).found("all")) == expected
+
+
+def test_offsets_survive_case_folding_that_changes_length():
+    text = "İ breach"
+    [hit] = KeywordMatcher({"review": ["breach"]}).scan(text).hits
+    assert text[hit.start:hit.end] == "breach"
+
+
+def test_empty_matcher_and_text():
+    assert KeywordMatcher({}).scan("anything").hits == []
+    assert KeywordMatcher({"review": REVIEW}).scan("").hits == []
@@ -0,0 +1,55 @@
+"""
+Tests for parallel / incremental schema linting
+"""
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from lint_slug_schemas import SchemaLinter
+
+
+def _make_slug(root: Path, slug: str, title: str = "Test"):
+    d = root / slug
+    d.mkdir(parents=True, exist_ok=True)
+    (d / f"{slug}_ss.json").write_text(json.dumps({
+        "title": title,
+        "type": "object",
+        "properties": {"contract_name": {}, "effective_date": {}, "parties": {}}
+    }))
+
+
+@pytest.fixture
+def doc_dir(tmp_path):
+    for slug in ["alpha", "beta", "gamma"]:
+        _make_slug(tmp_path / "types", slug)
+    return tmp_path / "types"
+
+
+def test_incremental_matches_full_run(doc_dir, tmp_path):
+    manifest = tmp_path / "manifest.json"
+    full_issues, full_registry = SchemaLinter(str(doc_dir)).run()
+
+    SchemaLinter(str(doc_dir)).run(incremental=True, manifest_path=str(manifest))
+    issues, registry = SchemaLinter(str(doc_dir)).run(incremental=True, manifest_path=str(manifest))
+
+    assert registry == full_registry
+    assert issues == full_issues
+
+
+def test_incremental_relints_only_changed_slug(doc_dir, tmp_path, capsys):
+    manifest = tmp_path / "manifest.json"
+    SchemaLinter(str(doc_dir)).run(incremental=True, manifest_path=str(manifest))
+
+    _make_slug(doc_dir, "beta", title="Changed")
+    _, registry = SchemaLinter(str(doc_dir)).run(incremental=True, manifest_path=str(manifest))
+
+    assert "Incremental: 1 re-linted, 2 unchanged" in capsys.readouterr().out
+    assert registry["beta"]["hash"] == SchemaLinter(str(doc_dir)).run()[1]["beta"]["hash"]
+
+
+def test_parallel_matches_sequential(doc_dir):
+    assert SchemaLinter(str(doc_dir)).run(jobs=2) == SchemaLinter(str(doc_dir)).run()
@@ -0,0 +1,62 @@
+from src.app.agents.ocr_agent import DocumentPage, OCRAgent, merge_pages, select_page
+
+DIGITAL_PAGE = (
+    "This Purchase and Sale Agreement is made between the parties named below. "
+    "The purchase price shall be paid at closing."
+)
+
+SIGNATURE_PAGE = (
+    "IN WITNESS WHEREOF\n\nBUYER:\nBayview Partners LLC\n\nBy: ______________________\n"
+    "Name: ____________________\nTitle: ___________________\nDate: ____________"
+)
+
+TABLE_PAGE = (
+    "Exhibit B – Payment Schedule\n"
+    "Installment   Due        Amount\n"
+    "1             03/01/2025 $1,250,000.00\n"
+    "2             06/01/2025 $1,250,000.00\n"
+    "3             09/01/2025 $1,250,000.00\n"
+)
+
+
+def test_digital_pages_keep_their_text_layer():
+    agent = OCRAgent()
+    assert agent._page_has_text_layer(DIGITAL_PAGE)
+    assert agent._page_has_text_layer("This page intentionally left blank.")
+    assert agent._page_has_text_layer(SIGNATURE_PAGE)
+    assert agent._page_has_text_layer(TABLE_PAGE)
+
+
+def test_empty_or_garbled_pages_go_to_ocr():
+    agent = OCRAgent()
+    assert not agent._page_has_text_layer("")
+    assert not agent._page_has_text_layer("  \n \f ")
+    assert not agent._page_has_text_layer("(cid:3)(cid:17)(cid:42) (cid:5)(cid:9)(cid:11)(cid:8)")
+    assert not agent._page_has_text_layer("��� �� a")
+    assert not agent._page_has_text_layer("#$%& *+<= >@[] ^{|}~ ## @@ %% && ** ++")
+
+
+def test_select_page_falls_back_to_embedded_text():
+    ocr = DocumentPage(2, "Signed exhibit with recording stamp", 0.8)
+    assert select_page(2, "", ocr) is ocr
+    # OCR failed, or read less than the legible part of the embedded text
+    failed = DocumentPage(2, "", 0.0, status="failed")
+    assert select_page(2, "(cid:3) partial text layer", failed).method == "digital"
+    assert select_page(2, "a much longer embedded text layer than OCR", ocr).text.startswith("a much")
+    # Undecodable glyphs don't count: a "(cid:N)" layer is far longer than its OCR text
+    assert select_page(2, "(cid:3)(cid:17)(cid:42)" * 20 + " exhibit", ocr) is ocr
+    assert select_page(2, "(cid:3)(cid:17)(cid:42)", failed) is failed
+    # Nothing to fall back to
+    assert select_page(2, "", failed) is failed
+    assert select_page(2, "", None).status == "failed"
+
+
+def test_merge_pages_in_page_order():
+    pages = [
+        DocumentPage(3, "signed exhibit", 0.8),
+        DocumentPage(1, DIGITAL_PAGE, 0.95, method="digital"),
+        DocumentPage(2, "", 0.0, status="failed"),
+    ]
+    assert merge_pages(pages) == (
+        f"--- Page 1 ---\n{DIGITAL_PAGE}\n\n--- Page 2 ---\n\n\n--- Page 3 ---\nsigned exhibit"
+    )
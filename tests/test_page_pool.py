@@ -0,0 +1,94 @@
+import time
+
+import pytest
+
+from src.app.services import page_pool
+from src.app.services.page_pool import iter_pages, prefetch, run_pages
+
+
+def slow_square(page, timeout):
+    # Earlier pages finish last
+    time.sleep(0.05 * (4 - page))
+    return page * page
+
+
+def flaky(page, timeout):
+    if page == 2:
+        raise ValueError("unreadable page")
+    if page == 3:
+        raise TimeoutError(f"exceeded {timeout}s")
+    return page
+
+
+def stuck(page, timeout):
+    time.sleep(2 if page == 1 else 0)
+    return page
+
+
+def test_results_keep_page_order():
+    runs = run_pages(slow_square, [1, 2, 3], max_workers=3)
+    assert [run.result for run in runs] == [1, 4, 9]
+    assert [run.page_number for run in runs] == [1, 2, 3]
+    assert all(run.status == "ok" and run.seconds > 0 for run in runs)
+
+
+def test_sequential_matches_pool():
+    assert [r.result for r in run_pages(slow_square, [1, 2, 3], max_workers=1)] == [1, 4, 9]
+
+
+def test_failures_and_worker_timeouts_are_per_page():
+    for workers in (1, 2):
+        runs = run_pages(flaky, [1, 2, 3], max_workers=workers, timeout=5)
+        assert [run.status for run in runs] == ["ok", "failed", "timeout"]
+        assert runs[1].error == "unreadable page"
+        assert runs[2].timing()["status"] == "timeout"
+
+
+def test_backstop_reports_stuck_pages(monkeypatch):
+    monkeypatch.setattr(page_pool, "BACKSTOP_GRACE", 0.0)
+    runs = run_pages(stuck, [1, 2], max_workers=2, timeout=0.5)
+    assert [run.status for run in runs] == ["timeout", "ok"]
+    assert runs[1].result == 2
+
+
+def test_iter_pages_streams_in_order_within_window():
+    drawn = []
+
+    def source():
+        for page in (1, 2, 3, 1, 2, 3):
+            drawn.append(page)
+            yield page
+
+    stream = iter_pages(slow_square, source(), max_workers=2, window=2)
+    first = next(stream)
+    assert first.result == 1
+    assert len(drawn) == 2
+    assert [first.result] + [run.result for run in stream] == [1, 4, 9, 1, 4, 9]
+
+
+def test_iter_pages_sequential_and_backstop(monkeypatch):
+    assert [run.status for run in iter_pages(flaky, [1, 2, 3], max_workers=1)] == ["ok", "failed", "timeout"]
+    monkeypatch.setattr(page_pool, "BACKSTOP_GRACE", 0.0)
+    runs = list(iter_pages(stuck, [1, 2], max_workers=2, timeout=0.5))
+    assert [(run.page_number, run.status) for run in runs] == [(1, "timeout"), (2, "ok")]
+
+
+def test_prefetch_stays_bounded_and_raises_producer_errors():
+    produced = []
+
+    def source():
+        for i in range(10):
+            produced.append(i)
+            yield i
+        raise RuntimeError("render failed")
+
+    items = prefetch(source(), size=2)
+    assert next(items) == 0
+    time.sleep(0.3)
+    # One handed out, two buffered, one waiting to be put
+    assert len(produced) <= 4
+    rest = []
+    with pytest.raises(RuntimeError, match="render failed"):
+        for item in items:
+            rest.append(item)
+    assert rest == list(range(1, 10))
@@ -0,0 +1,168 @@
+"""
+Tests for the DAG pipeline executor
+"""
+import asyncio
+import json
+
+import pytest
+
+from src.app.services.pipeline import (
+    PipelineError,
+    PipelineExecutor,
+    PipelineRegistry,
+    Stage,
+    build_executor,
+    text_statistics,
+)
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_independent_stages_run_concurrently():
+    async def slow(ctx):
+        await asyncio.sleep(0.1)
+        return 1
+
+    executor = PipelineExecutor([
+        Stage("a", slow),
+        Stage("b", slow),
+        Stage("c", slow),
+        Stage("total", lambda ctx: ctx["a"] + ctx["b"] + ctx["c"], depends_on=["a", "b", "c"]),
+    ])
+    result = run(executor.run())
+    assert result.output("total") == 3
+    assert result.ok
+    assert result.duration_ms < 250
+    timings = result.timings()
+    assert timings["total"]["started_ms"] >= timings["a"]["duration_ms"]
+
+
+def test_context_carries_inputs_and_outputs():
+    executor = PipelineExecutor([
+        Stage("upper", lambda ctx: ctx["text"].upper()),
+        Stage("count", lambda ctx: len(ctx["upper"]), depends_on=["upper"]),
+    ])
+    assert run(executor.run({"text": "abc"})).output("count") == 3
+
+
+def test_retries_then_succeeds():
+    calls = []
+
+    def flaky(ctx):
+        calls.append(1)
+        if len(calls) < 3:
+            raise RuntimeError("transient")
+        return "ok"
+
+    result = run(PipelineExecutor([Stage("s", flaky, retries=2, retry_delay=0)]).run())
+    assert result.output("s") == "ok"
+    assert result.results["s"].attempts == 3
+
+
+def test_timeout_fails_pipeline_and_skips_dependents():
+    async def hang(ctx):
+        await asyncio.sleep(1)
+
+    executor = PipelineExecutor([
+        Stage("hang", hang, timeout=0.05),
+        Stage("after", lambda ctx: 1, depends_on=["hang"]),
+    ])
+    with pytest.raises(PipelineError) as exc:
+        run(executor.run())
+    assert exc.value.stage == "hang"
+    statuses = {n: r.status for n, r in exc.value.run.results.items()}
+    assert statuses == {"hang": "timeout", "after": "skipped"}
+
+
+def test_failure_cancels_running_stages():
+    cancelled = []
+
+    async def long(ctx):
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    def boom(ctx):
+        raise ValueError("bad input")
+
+    executor = PipelineExecutor([Stage("long", long), Stage("boom", boom)])
+    with pytest.raises(PipelineError, match="bad input") as exc:
+        run(executor.run())
+    assert cancelled == [True]
+    assert exc.value.run.results["long"].status == "cancelled"
+
+
+def test_optional_stage_failure_passes_none():
+    def boom(ctx):
+        raise ValueError("nope")
+
+    executor = PipelineExecutor([
+        Stage("extra", boom, optional=True),
+        Stage("main", lambda ctx: ctx["extra"], depends_on=["extra"]),
+    ])
+    result = run(executor.run())
+    assert result.output("main") is None
+    assert result.results["extra"].status == "failed"
+    assert not result.ok
+
+
+def test_concurrency_limit_shared_across_runs():
+    active = []
+    peak = []
+
+    async def work(ctx):
+        active.append(1)
+        peak.append(len(active))
+        await asyncio.sleep(0.02)
+        active.pop()
+
+    executor = PipelineExecutor([Stage("work", work, concurrency=2)])
+
+    async def many():
+        await asyncio.gather(*(executor.run() for _ in range(6)))
+
+    run(many())
+    assert max(peak) == 2
+
+
+def test_invalid_graphs_rejected():
+    with pytest.raises(ValueError, match="unknown"):
+        PipelineExecutor([Stage("a", len, depends_on=["missing"])])
+    with pytest.raises(ValueError, match="cycle"):
+        PipelineExecutor([Stage("a", len, depends_on=["b"]), Stage("b", len, depends_on=["a"])])
+
+
+def test_registry_doc_type_override(tmp_path):
+    path = tmp_path / "pipelines.json"
+    path.write_text(json.dumps({
+        "pipelines": {"short": {"stages": [{"name": "one"}]}},
+        "doc_types": {"notice": {"extraction": "short"}},
+    }))
+    registry = PipelineRegistry.load(str(path))
+    functions = {"one": lambda ctx: 1, "two": lambda ctx: ctx["one"] + 1}
+    default = [{"name": "one"}, {"name": "two", "depends_on": ["one"]}]
+
+    assert registry.executor("extraction", functions, default).order == ["one", "two"]
+    assert registry.executor("extraction", functions, default, doc_type="notice").order == ["one"]
+    assert registry.executor("extraction", functions, default) is registry.executor("extraction", functions, default)
+    with pytest.raises(ValueError, match="Unknown pipeline stage"):
+        build_executor([{"name": "three"}], functions)
+
+
+def test_repo_pipeline_config_is_valid():
+    registry = PipelineRegistry.load("config/pipelines.json")
+    for name, spec in registry.config["pipelines"].items():
+        functions = {s["name"]: len for s in spec["stages"]}
+        build_executor(spec["stages"], functions)
+    for overrides in registry.config["doc_types"].values():
+        assert set(overrides.values()) <= set(registry.config["pipelines"])
+
+
+def test_text_statistics():
+    assert text_statistics("one two\nthree\fpage") == {
+        "characters": 18, "words": 4, "lines": 2, "pages": 2
+    }
@@ -0,0 +1,71 @@
+"""
+Tests for the schema-compiled routing table
+"""
+import json
+from pathlib import Path
+
+from src.app.services.routing_table import (
+    DEFAULT_AGENTS,
+    RoutingTable,
+    compile_route,
+    schema_property_names,
+)
+
+SS = {
+    "properties": {
+        "contract_name": {"type": "string"},
+        "parties": {"type": "array", "items": {"properties": {"name": {}, "role": {}}}},
+        "summary": {"type": "string"},
+    }
+}
+SA = {
+    "properties": {
+        "loan_details": {
+            "type": "object",
+            "properties": {
+                "loan_amount": {"type": "number"},
+                "key_covenants": {"type": "array"},
+                "collateral_property_address": {"type": "string"},
+            },
+        }
+    }
+}
+
+
+def test_property_names_include_nested_levels():
+    names = schema_property_names(SS, SA)
+    assert {"parties", "name", "loan_details", "loan_amount", "key_covenants"} <= names
+    assert "loan_amount" not in schema_property_names(SA, depth=1)
+
+
+def test_compile_route_from_ss_and_sa():
+    route = compile_route(SS, SA)
+    assert list(route) == ["PartyExtractor", "FinancialAnalyzer", "ObligationExtractor", "PropertyExtractor"]
+    assert route["FinancialAnalyzer"] == ["loan_amount"]
+    assert route["PropertyExtractor"] == ["collateral_property_address"]
+
+
+def test_token_matching_avoids_substrings():
+    # "summary" must not match "sum", "entity_name" must not match "entity_type"
+    route = compile_route({"properties": {"summary": {}, "entity_name": {}, "consideration": {}}})
+    assert route == {"FinancialAnalyzer": ["consideration"]}
+
+
+def test_lookup_known_and_unknown():
+    table = RoutingTable()
+    table.add("loan-agreement", SS, SA)
+    table.add("bare", {"properties": {"notes": {}}})
+
+    routing = table.lookup("loan-agreement")
+    assert routing["agents"][0] == "PartyExtractor"
+    assert routing["method"] == "routing_table"
+    assert table.lookup("bare")["agents"] == DEFAULT_AGENTS
+    assert table.lookup("missing") is None
+    assert "loan-agreement" in table
+
+
+def test_repo_registry_routes_match_schemas():
+    registry = json.loads(Path("config/prompts/document_types/registry.json").read_text())
+    table = RoutingTable.from_registry(registry)
+    routing = table.lookup("purchase-sale-agreement-psa")
+    assert {"PartyExtractor", "FinancialAnalyzer"} <= set(routing["agents"])
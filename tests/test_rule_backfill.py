@@ -0,0 +1,80 @@
+"""
+Tests for vectorized rule extraction backfills
+"""
+import json
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+from src.app.services.rule_backfill import (  # noqa: E402
+    RULES_DIGEST,
+    RULES_VERSION,
+    backfill_records,
+    financial_frame,
+    party_frame,
+    rules_digest,
+)
+
+DOCS = pd.DataFrame({
+    "document_id": ["a", "b", "c"],
+    "content": [
+        "Parties: Acme Holdings LLC (buyer@acme.com), Bayview Partners LP "
+        "(seller@bayview.com). The purchase price is $1,500,000. An earnest money deposit of "
+        "$50,000 is due at signing. Seller keeps liability insurance of $50,000.",
+        "Invoice for $5,000 and a late charge of $250. Signed by Jane Doe.",
+        "No amounts or parties here.",
+    ],
+})
+
+
+def test_financial_terms_are_labeled_per_occurrence():
+    terms = financial_frame(DOCS)
+    a = terms[terms["document_id"] == "a"]
+    assert a["amount"].tolist() == [1500000.0, 50000.0, 50000.0]
+    assert a["category"].tolist() == ["purchase_price", "deposit", "insurance"]
+    assert a["type"].tolist() == ["contract_value", "deposit", "insurance"]
+
+    b = terms[terms["document_id"] == "b"]
+    assert b["type"].tolist() == ["contract_value", "penalty"]
+    assert "c" not in set(terms["document_id"])
+
+
+def test_parties_pair_companies_with_emails_and_fill_individuals():
+    parties = party_frame(DOCS)
+    a = parties[parties["document_id"] == "a"].to_dict("records")
+    assert [(p["name"], p["role"], p["email"]) for p in a] == [
+        ("Acme Holdings LLC", "client", "buyer@acme.com"),
+        ("Bayview Partners LP", "vendor", "seller@bayview.com"),
+    ]
+    b = parties[parties["document_id"] == "b"]
+    assert b["name"].tolist() == ["Jane Doe"]
+    assert b["role"].tolist() == ["signatory"]
+
+
+def test_backfill_records_cover_every_document():
+    records = {r["document_id"]: r for r in backfill_records(DOCS)}
+    assert set(records) == {"a", "b", "c"}
+    assert records["a"]["contract_value"] == 1500000.0
+    metadata = json.loads(records["a"]["extracted_metadata"])
+    assert metadata["rules_version"] == RULES_VERSION
+    assert len(metadata["financial_terms"]) == 3
+    assert records["c"]["contract_value"] is None
+    assert json.loads(records["c"]["parties"]) == []
+
+
+def test_company_names_ending_in_a_period():
+    docs = pd.DataFrame({
+        "document_id": ["d"],
+        "content": ["Global Architects Inc. and BuildRight Corp. sign here: x@y.com"],
+    })
+    parties = party_frame(docs).to_dict("records")
+    assert [(p["name"], p["type"], p["role"], p["email"]) for p in parties] == [
+        ("Global Architects Inc.", "company", "client", "x@y.com"),
+        ("BuildRight Corp.", "company", "vendor", None),
+    ]
+
+
+def test_rules_version_tracks_the_rules():
+    # Changing DEFAULT_RULES or LABEL_PHRASES needs a new RULES_VERSION (and digest)
+    assert rules_digest() == RULES_DIGEST
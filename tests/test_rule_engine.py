@@ -0,0 +1,65 @@
+"""
+Tests for the single-pass rule engine
+"""
+from src.app.services.rule_engine import RuleEngine, evidence, get_rule_engine, scan_document
+
+TEXT = (
+    "This Agreement is made on January 5, 2024 between Acme Holdings LLC "
+    "(buyer@acme.com) and John Smith.\n"
+    "Purchase price $1,500,000. Deposit of $50,000 within 5 business days.\n"
+    "APN 123-456-789. Broker fee $50,000 due 02/01/2024."
+)
+
+
+def test_one_pass_yields_typed_spans_with_offsets():
+    spans = list(get_rule_engine().scan(TEXT))
+    assert [s.start for s in spans] == sorted(s.start for s in spans)
+    for span in spans:
+        assert TEXT[span.start:span.end] == span.text
+
+    kinds = {(s.kind, s.text) for s in spans}
+    assert ("company", "Acme Holdings LLC") in kinds
+    assert ("email", "buyer@acme.com") in kinds
+    assert ("person", "John Smith") in kinds
+    assert ("date", "January 5, 2024") in kinds
+    assert ("date", "02/01/2024") in kinds
+    assert ("duration", "5 business days") in kinds
+
+
+def test_values_are_normalized():
+    grouped = get_rule_engine().extract(TEXT)
+    assert [s.value for s in grouped["amount"]] == [1500000.0, 50000.0, 50000.0]
+    assert grouped["apn"][0].value == "123456789"
+
+
+def test_repeated_values_keep_distinct_offsets():
+    deposits = [s for s in scan_document(TEXT) if s.kind == "amount" and s.value == 50000.0]
+    assert len(deposits) == 2
+    assert deposits[0].start != deposits[1].start
+    assert "Deposit" in deposits[0].context(TEXT, 20)
+    assert "Broker" in deposits[1].context(TEXT, 20)
+
+
+def test_kind_filter_and_extra_fields():
+    engine = RuleEngine([
+        ("party", r"(?P<party_role>Buyer|Seller):[ \t]*(?P<party_value>[A-Z][A-Za-z ]+)"),
+        ("amount", r"\$(?P<amount_value>[0-9,]+)"),
+    ])
+    spans = list(engine.scan("Buyer: Jane Doe\nPrice $10,000", kinds=["party"]))
+    assert len(spans) == 1
+    assert spans[0].value == "Jane Doe"
+    assert spans[0].fields == {"role": "Buyer"}
+
+
+def test_evidence_locates_llm_values():
+    span = evidence(TEXT, "amount", "1500000")
+    assert span is not None and span.text == "$1,500,000"
+    assert evidence(TEXT, "company", "acme holdings llc").start == TEXT.index("Acme")
+    assert evidence(TEXT, "amount", 999) is None
+
+
+def test_company_suffixes_ending_in_a_period():
+    text = "Global Architects Inc. and BuildRight Corp. retain Downtown Tower LLC, assigned to Apex Corp."
+    companies = [s.text for s in get_rule_engine().scan(text, kinds=["company"])]
+    assert companies == ["Global Architects Inc.", "BuildRight Corp.", "Downtown Tower LLC", "Apex Corp."]
+    assert all(s.kind != "person" for s in get_rule_engine().scan(text) if "Architects" in s.text)
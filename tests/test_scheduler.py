@@ -0,0 +1,124 @@
+"""
+Tests for the priority-aware document scheduler
+"""
+import asyncio
+
+from src.app.services.scheduler import (
+    PriorityClass,
+    PriorityScheduler,
+    classify_priority,
+    largest_amount,
+)
+
+
+async def _admission_order(scheduler, jobs):
+    """Queue jobs (priority, tenant, name) behind a held slot; return admission order"""
+    order = []
+
+    async def job(priority, tenant, name):
+        async with scheduler.slot(priority, tenant):
+            order.append(name)
+
+    async with scheduler.slot("normal", "blocker"):
+        tasks = [asyncio.create_task(job(*spec)) for spec in jobs]
+        await asyncio.sleep(0)
+    await asyncio.gather(*tasks)
+    return order
+
+
+def test_urgent_jumps_a_bulk_backlog():
+    scheduler = PriorityScheduler(max_concurrent=1)
+    jobs = [("bulk", "backfill", f"b{i}") for i in range(5)] + [("urgent", "deals", "u")]
+    order = asyncio.run(_admission_order(scheduler, jobs))
+    assert order[0] == "u"
+
+
+def test_tenants_share_a_class_fairly():
+    scheduler = PriorityScheduler(max_concurrent=1)
+    jobs = [("bulk", "a", f"a{i}") for i in range(3)] + [("bulk", "b", f"b{i}") for i in range(3)]
+    order = asyncio.run(_admission_order(scheduler, jobs))
+    assert order == ["a0", "b0", "a1", "b1", "a2", "b2"]
+
+
+def _aged_scenario(scheduler, now, old_jobs, new_jobs):
+    """Queue old_jobs (priority, tenant, name), age them past the limit, then queue new_jobs"""
+    order = []
+
+    async def job(priority, tenant, name):
+        async with scheduler.slot(priority, tenant):
+            order.append(name)
+
+    async def scenario():
+        async with scheduler.slot("normal", "blocker"):
+            old = [asyncio.create_task(job(*spec)) for spec in old_jobs]
+            await asyncio.sleep(0)
+            now[0] = 60.0
+            new = [asyncio.create_task(job(*spec)) for spec in new_jobs]
+            await asyncio.sleep(0)
+        await asyncio.gather(*old, *new)
+
+    asyncio.run(scenario())
+    return order
+
+
+def test_aged_jobs_go_first_within_their_class():
+    now = [0.0]
+    scheduler = PriorityScheduler(max_concurrent=1, aging_seconds=10, clock=lambda: now[0])
+    old = [("bulk", "a", f"a{i}") for i in range(3)]
+    new = [("bulk", "b", "b0"), ("urgent", "deals", "u")]
+    order = _aged_scenario(scheduler, now, old, new)
+    # Without aging b0 would share the class with a1 and a2
+    assert order == ["u", "a0", "a1", "a2", "b0"]
+    assert scheduler.stats()["classes"]["bulk"]["aged"] == 2
+
+
+def test_aged_backlog_never_delays_urgent():
+    now = [0.0]
+    scheduler = PriorityScheduler(max_concurrent=1, aging_seconds=10, clock=lambda: now[0])
+    old = [("normal", "backfill", f"n{i}") for i in range(200)]
+    old += [("bulk", "backfill", f"b{i}") for i in range(200)]
+    order = _aged_scenario(scheduler, now, old, [("urgent", "deals", "u")])
+    assert order[0] == "u"
+
+
+def test_class_caps_and_cancellation():
+    scheduler = PriorityScheduler(
+        max_concurrent=3, classes={"bulk": PriorityClass(1.0, max_concurrent=1), "urgent": PriorityClass(16.0)}
+    )
+
+    async def scenario():
+        release = asyncio.Event()
+
+        async def hold(priority):
+            async with scheduler.slot(priority):
+                await release.wait()
+
+        tasks = [asyncio.create_task(hold("bulk")) for _ in range(3)]
+        await asyncio.sleep(0)
+        stats = scheduler.stats()
+        assert stats["running"] == {"bulk": 1, "urgent": 0}
+        assert stats["queued"]["bulk"] == 2
+
+        tasks[2].cancel()
+        await asyncio.sleep(0)
+        assert scheduler.stats()["queued"]["bulk"] == 1
+
+        urgent = asyncio.create_task(hold("urgent"))
+        await asyncio.sleep(0)
+        assert scheduler.stats()["running"] == {"bulk": 1, "urgent": 1}
+
+        release.set()
+        await asyncio.gather(tasks[0], tasks[1], urgent)
+        assert scheduler.stats()["running"] == {"bulk": 0, "urgent": 0}
+
+    asyncio.run(scenario())
+
+
+def test_high_value_documents_are_raised():
+    assert largest_amount("Price: $12,500,000.00; deposit $250,000") == 12_500_000
+    assert largest_amount("a fee of $2.5 million") == 2_500_000
+    assert classify_priority("normal", "Purchase price $15 million", 10_000_000) == "high"
+    assert classify_priority("bulk", "Purchase price $15,000", 10_000_000) == "bulk"
+    assert classify_priority("bulk", "Purchase price $15 million", 10_000_000) == "bulk"
+    assert classify_priority("urgent", "Purchase price $15 million", 10_000_000) == "urgent"
+    assert classify_priority("whenever", "", 10_000_000) == "normal"
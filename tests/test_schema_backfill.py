@@ -0,0 +1,139 @@
+"""
+Tests for schema-change-aware selective re-extraction
+"""
+import asyncio
+
+from improved_loader import schema_hash
+from src.app.services.extractor_handoff import restrict_schema
+from src.app.services.schema_backfill import (
+    JsonExtractionStore,
+    SchemaSnapshotStore,
+    diff_schemas,
+    plan_backfill,
+    run_backfill,
+)
+
+OLD = {
+    "type": "object",
+    "properties": {
+        "price": {"type": "number"},
+        "buyer": {"type": "string"},
+        "seller": {"type": "string"},
+        "parcel": {"$ref": "#/$defs/parcel"},
+        "legacy": {"type": "string"},
+    },
+    "required": ["price"],
+    "$defs": {"parcel": {"type": "string"}},
+}
+
+NEW = {
+    "type": "object",
+    "properties": {
+        "price": {"type": "number", "description": "Purchase price"},
+        "buyer": {"type": "string"},
+        "seller": {"type": "string"},
+        "parcel": {"$ref": "#/$defs/parcel"},
+        "closing_date": {"type": "string"},
+    },
+    "required": ["price", "seller"],
+    "$defs": {"parcel": {"type": "object"}},
+}
+
+
+def test_diff_schemas():
+    assert diff_schemas(OLD, NEW) == {
+        "added": ["closing_date"],
+        "removed": ["legacy"],
+        "changed": ["parcel", "price", "seller"],
+    }
+    assert diff_schemas(NEW, NEW) == {"added": [], "removed": [], "changed": []}
+
+
+def test_restrict_schema():
+    sub = restrict_schema(NEW, ["seller", "closing_date", "missing"])
+    assert list(sub["properties"]) == ["seller", "closing_date"]
+    assert sub["required"] == ["seller"]
+    assert sub["$defs"] == NEW["$defs"]
+
+
+def _store_with_records(tmp_path):
+    store = JsonExtractionStore(str(tmp_path))
+    data = {"price": 1, "buyer": "B", "seller": "S", "parcel": "P", "legacy": "x"}
+    for name, h in [("a", schema_hash(OLD)), ("b", schema_hash(OLD)), ("c", schema_hash(NEW))]:
+        store.save(str(tmp_path / f"extraction_psa_{name}.json"),
+                   {"meta": {"slug": "psa", "schema_hash": h}, "data": dict(data)})
+    store.save(str(tmp_path / "extraction_loi_a.json"), {"meta": {"slug": "loi"}, "data": {}})
+    return store
+
+
+def test_plan_only_outdated_records(tmp_path):
+    store = _store_with_records(tmp_path)
+    snapshots = SchemaSnapshotStore(str(tmp_path / "snapshots"))
+    snapshots.save("psa", OLD)
+
+    plan = plan_backfill("psa", NEW, store, snapshots)
+    assert [item.ref.rsplit("_", 1)[1] for item in plan.items] == ["a.json", "b.json"]
+    assert plan.items[0].properties == ["closing_date", "parcel", "price", "seller"]
+    assert plan.items[0].removed == ["legacy"]
+    summary = plan.summary()
+    assert summary["properties_requested"] == 8
+    assert summary["properties_full_rerun"] == 10
+
+
+def test_plan_without_snapshot_reextracts_everything(tmp_path):
+    store = _store_with_records(tmp_path)
+    plan = plan_backfill("psa", NEW, store, SchemaSnapshotStore(str(tmp_path / "none")))
+    assert plan.unknown_hashes == {schema_hash(OLD)}
+    assert plan.items[0].properties == sorted(NEW["properties"])
+
+
+def test_run_backfill_merges_and_checkpoints(tmp_path):
+    store = _store_with_records(tmp_path)
+    snapshots = SchemaSnapshotStore(str(tmp_path / "snapshots"))
+    snapshots.save("psa", OLD)
+    plan = plan_backfill("psa", NEW, store, snapshots)
+    checkpoint = str(tmp_path / "checkpoint.jsonl")
+    calls = []
+
+    def extract(record, properties):
+        calls.append(properties)
+        return {p: f"new-{p}" for p in properties + ["buyer"]}
+
+    stats = asyncio.run(run_backfill(plan, store, extract, concurrency=1, checkpoint_path=checkpoint))
+    assert stats == {"updated": 2, "skipped": 0, "failed": 0}
+    assert len(calls) == 2
+
+    record = store.load(plan.items[0].ref)
+    assert record["meta"]["schema_hash"] == schema_hash(NEW)
+    assert record["meta"]["backfill"]["from_schema_hash"] == schema_hash(OLD)
+    assert record["data"]["buyer"] == "B"
+    assert record["data"]["closing_date"] == "new-closing_date"
+    assert "legacy" not in record["data"]
+
+    # Resuming the same plan only consults the checkpoint
+    stats = asyncio.run(run_backfill(plan, store, extract, checkpoint_path=checkpoint))
+    assert stats["skipped"] == 2
+    assert len(calls) == 2
+    assert plan_backfill("psa", NEW, store, snapshots).items == []
+
+
+def test_run_backfill_failure_is_retried(tmp_path, caplog):
+    store = _store_with_records(tmp_path)
+    snapshots = SchemaSnapshotStore(str(tmp_path / "snapshots"))
+    snapshots.save("psa", OLD)
+    plan = plan_backfill("psa", NEW, store, snapshots)
+
+    def broken(record, properties):
+        raise RuntimeError("LLM down")
+
+    checkpoint = str(tmp_path / "checkpoint.jsonl")
+    stats = asyncio.run(run_backfill(plan, store, broken, checkpoint_path=checkpoint))
+    assert stats["failed"] == 2
+    assert len(plan_backfill("psa", NEW, store, snapshots).items) == 2
+
+    # Each failure is logged with its document and the error
+    failures = [r for r in caplog.records if "re-extraction failed" in r.getMessage()]
+    assert len(failures) == 2
+    for item in plan.items:
+        assert any(item.ref in r.getMessage() for r in failures)
+    assert all("LLM down" in r.exc_text for r in failures)
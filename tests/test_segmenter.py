@@ -0,0 +1,84 @@
+"""
+Tests for the contract structure segmenter
+"""
+from src.app.services.segmenter import section_excerpts, segment_contract
+
+PSA = """PURCHASE AND SALE AGREEMENT
+
+This Agreement is made by Acme Holdings, LLC ("Seller") and Bayview Partners LP ("Buyer").
+
+RECITALS
+A. Seller owns the real property located at 100 Main Street, Oakland, CA.
+
+1. PURCHASE PRICE. The purchase price is $12,500,000.
+
+2. Deposit. Buyer shall deposit $250,000 with Escrow Holder.
+   1. Within three days after the Effective Date.
+
+3. CLOSING
+Closing shall occur on March 1, 2025.
+
+IN WITNESS WHEREOF, the parties have executed this Agreement.
+SELLER: Acme Holdings, LLC  By: Jane Doe
+BUYER: Bayview Partners LP  By: John Roe
+
+EXHIBIT A
+LEGAL DESCRIPTION
+Lot 4, Block 2, Tract 1234.
+1. Parcel One.
+"""
+
+
+def test_section_index_offsets_and_kinds():
+    index = segment_contract(PSA)
+    kinds = [(s.kind, s.number, s.title) for s in index.sections]
+    assert kinds == [
+        ("preamble", None, ""),
+        ("recitals", None, ""),
+        ("article", "1", "PURCHASE PRICE"),
+        ("article", "2", "Deposit"),
+        ("article", "3", "CLOSING"),
+        ("signature", None, ""),
+        ("exhibit", "A", "LEGAL DESCRIPTION"),
+    ]
+    # Sections tile the document
+    assert index.sections[0].start == 0
+    assert index.sections[-1].end == len(PSA)
+    for a, b in zip(index.sections, index.sections[1:]):
+        assert a.end == b.start
+    assert index.section_text(index.sections[2]).startswith("1. PURCHASE PRICE.")
+
+
+def test_sections_route_to_the_agents_that_need_them():
+    routes = {s.title or s.kind: agents for s, agents in segment_contract(PSA).routes.items()}
+    assert routes["signature"] == ["PartyExtractor"]
+    assert routes["PURCHASE PRICE"] == ["FinancialAnalyzer"]
+    assert routes["Deposit"] == ["FinancialAnalyzer"]
+    assert routes["CLOSING"] == []
+    assert routes["LEGAL DESCRIPTION"] == ["PropertyExtractor"]
+
+
+def test_excerpts_follow_routes_and_budget():
+    financial = section_excerpts(PSA, "FinancialAnalyzer", budget=1500)
+    assert len(financial) == 1
+    assert "$12,500,000" in financial[0] and "$250,000" in financial[0]
+    assert "IN WITNESS WHEREOF" not in financial[0]
+
+    parties = section_excerpts(PSA, "PartyExtractor", budget=250)
+    assert len(parties) == 3
+    assert all(len(e) <= 250 for e in parties)
+    assert parties[-1].startswith("[SIGNATURE [chars")
+
+    # Agents make a single call: the first excerpt packs as many sections as fit
+    [single] = section_excerpts(PSA, "PartyExtractor", budget=250, max_excerpts=1)
+    assert single == parties[0]
+
+
+def test_article_headings_and_unstructured_text():
+    text = "Preamble\nARTICLE I - DEFINITIONS\nTerms.\n1. Not a heading\nARTICLE II RENT\nRent is $5,000."
+    index = segment_contract(text)
+    assert [(s.number, s.title) for s in index.sections[1:]] == [("I", "DEFINITIONS"), ("II", "RENT")]
+
+    plain = "Just a short letter without any headings. " * 100
+    assert not segment_contract(plain).structured
+    assert section_excerpts(plain, "PartyExtractor", budget=1500) == [plain[:1500]]
@@ -0,0 +1,31 @@
+import pytest
+
+pytest.importorskip("google.generativeai")
+
+from simple_extraction import parse_natural_language_response
+
+RESPONSE = """Parties:
+Buyer: Coyne Development LLC
+Seller: Bayview Partners LLC
+
+Financial amounts:
+$1,500,000 - purchase price
+$100,000 earnest money deposit
+
+Important dates and deadlines:
+Deposit of $100,000 due January 15, 2024
+Closing within 30 days of acceptance
+"""
+
+
+def test_sections_use_only_their_own_rules():
+    result = parse_natural_language_response(RESPONSE, "")
+    assert [(p["role"], p["name"]) for p in result["parties"]] == [
+        ("Buyer", "Coyne Development LLC"), ("Seller", "Bayview Partners LLC"),
+    ]
+    assert [(t["amount"], t["label"]) for t in result["financial_terms"]] == [
+        (1_500_000.0, "purchase price"), (100_000.0, "earnest money deposit"),
+    ]
+    # An amount in the dates section must not swallow the date after it
+    assert [d["text"] for d in result["dates"]] == ["January 15, 2024", "30 days"]
+    assert result["dates"][0]["context"] == "Deposit of $100,000 due January 15, 2024"
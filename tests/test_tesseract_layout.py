@@ -0,0 +1,59 @@
+from src.app.services.tesseract_layout import layout_from_data
+
+# (level, block, par, line, text, conf) rows as image_to_data reports them
+ROWS = [
+    (1, 0, 0, 0, "", "-1"),
+    (2, 1, 0, 0, "", "-1"),
+    (3, 1, 1, 0, "", "-1"),
+    (4, 1, 1, 1, "", "-1"),
+    (5, 1, 1, 1, "GRANT", "96"),
+    (5, 1, 1, 1, "DEED", "94.5"),
+    (4, 1, 1, 2, "", "-1"),
+    (5, 1, 1, 2, "Recorded", "90"),
+    (5, 1, 1, 2, " ", "-1"),
+    (3, 1, 2, 0, "", "-1"),
+    (4, 1, 2, 1, "", "-1"),
+    (5, 1, 2, 1, "APN", "80"),
+    (5, 1, 2, 1, "123-45", "60"),
+    (2, 2, 0, 0, "", "-1"),
+    (5, 2, 1, 1, "Page", "70"),
+    (5, 2, 1, 1, "1", "0"),
+]
+
+
+def tesseract_dict(rows):
+    data = {key: [] for key in ("level", "block_num", "par_num", "line_num", "text", "conf",
+                                 "left", "top", "width", "height")}
+    for i, (level, block, par, line, text, conf) in enumerate(rows):
+        for key, value in zip(("level", "block_num", "par_num", "line_num", "text", "conf"),
+                              (level, block, par, line, text, conf)):
+            data[key].append(value)
+        data["left"].append(10 * i)
+        data["top"].append(20 * line)
+        data["width"].append(40)
+        data["height"].append(12)
+    return data
+
+
+def test_text_rebuilt_from_block_par_line_numbers():
+    layout = layout_from_data(tesseract_dict(ROWS))
+    assert layout.text == "GRANT DEED\nRecorded\n\nAPN 123-45\n\nPage 1"
+
+
+def test_confidence_averages_positive_confidences():
+    layout = layout_from_data(tesseract_dict(ROWS))
+    assert layout.confidence == (96 + 94 + 90 + 80 + 60 + 70) / 6
+
+
+def test_word_boxes():
+    words = layout_from_data(tesseract_dict(ROWS)).words
+    assert [w.text for w in words] == ["GRANT", "DEED", "Recorded", "APN", "123-45", "Page", "1"]
+    assert words[0].to_dict() == {
+        "text": "GRANT", "confidence": 96.0, "left": 40, "top": 20, "width": 40, "height": 12,
+        "block": 1, "paragraph": 1, "line": 1,
+    }
+
+
+def test_empty_page():
+    layout = layout_from_data({})
+    assert (layout.text, layout.confidence, layout.words) == ("", 0, [])